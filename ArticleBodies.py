@@ -0,0 +1,250 @@
+# --------------------------------
+# BodyStore and LazyArticle Classes
+# --------------------------------
+import json
+import mmap
+import os
+import threading
+import weakref
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from pydantic import PrivateAttr
+
+from Articles import Article, ArticleCollection, open_ndjson
+
+BODY_FIELDS = ("text", "summary", "combined", "metadata")
+INDEX_FILE = "articles.ndjson"
+BODIES_FILE = "bodies.bin"
+
+
+class BodyStore:
+    """
+    Append-only file of article bodies read back through mmap.
+
+    Each body is the JSON encoding of the BODY_FIELDS of one article, addressed
+    by its (offset, length). Appends go through a regular file handle; the
+    read-only map is extended on demand when a read falls past its end. A
+    readonly store never opens the file for writing. File handles and map are
+    released by close(), or once the store is garbage collected.
+    """
+
+    def __init__(self, file_path: str, readonly: bool = False) -> None:
+        self.file_path = file_path
+        self.readonly = readonly
+        self._lock = threading.Lock()
+        self._handles: Dict[str, Any] = {
+            "writer": None if readonly else open(file_path, "ab"),
+            "reader": None,
+            "map": None,
+        }
+        self._mapped = 0
+        self._release = weakref.finalize(self, _release_handles, self._handles)
+
+    @property
+    def closed(self) -> bool:
+        return not self._release.alive
+
+    def append(self, body: Dict[str, Any]) -> Tuple[int, int]:
+        writer = self._handles["writer"]
+        if writer is None:
+            raise ValueError(f"BodyStore {self.file_path} is not writable")
+        data = json.dumps(body).encode("utf-8")
+        with self._lock:
+            offset = writer.tell()
+            writer.write(data)
+        return offset, len(data)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._handles["writer"] is not None:
+                self._handles["writer"].flush()
+
+    def _remap(self) -> None:
+        if self._handles["writer"] is not None:
+            self._handles["writer"].flush()
+        size = os.path.getsize(self.file_path)
+        if size == self._mapped:
+            return
+        if self._handles["map"] is not None:
+            self._handles["map"].close()
+        if self._handles["reader"] is None:
+            self._handles["reader"] = open(self.file_path, "rb")
+        self._handles["map"] = mmap.mmap(
+            self._handles["reader"].fileno(), 0, access=mmap.ACCESS_READ
+        )
+        self._mapped = size
+
+    def read(self, offset: int, length: int) -> Dict[str, Any]:
+        with self._lock:
+            if self.closed:
+                raise ValueError(f"BodyStore {self.file_path} is closed")
+            if offset + length > self._mapped:
+                self._remap()
+            data = self._handles["map"][offset : offset + length]
+        return json.loads(data)
+
+    def close(self) -> None:
+        with self._lock:
+            self._release()
+            self._mapped = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _release_handles(handles: Dict[str, Any]) -> None:
+    # finalizer of BodyStore, must not reference the store itself
+    for name in ("map", "reader", "writer"):
+        if handles[name] is not None:
+            handles[name].close()
+            handles[name] = None
+
+
+class LazyArticle(Article):
+    """
+    Article whose text, summary, combined and metadata stay in a BodyStore until
+    first accessed. Reading any of them loads all four with a single read;
+    serializing, validating, comparing or pickling the article loads them as
+    well. Assigning one of them before it was loaded keeps the assigned value.
+    """
+
+    _body: Optional[Tuple[BodyStore, int, int]] = PrivateAttr(default=None)
+
+    @classmethod
+    def from_reference(
+        cls, data: Dict[str, Any], store: BodyStore, offset: int, length: int
+    ) -> "LazyArticle":
+        article = cls(**data)
+        for field in BODY_FIELDS:
+            article.__dict__.pop(field, None)
+        article.__pydantic_private__["_body"] = (store, offset, length)
+        article.mark_clean()
+        return article
+
+    @property
+    def is_materialized(self) -> bool:
+        return self.__pydantic_private__.get("_body") is None
+
+    def materialize(self) -> "LazyArticle":
+        private = self.__pydantic_private__
+        reference = private.get("_body")
+        if reference is not None:
+            store, offset, length = reference
+            body = store.read(offset, length)
+            for field in BODY_FIELDS:
+                if field not in self.__dict__:
+                    self.__dict__[field] = body.get(field)
+            private["_body"] = None
+        return self
+
+    def __getattr__(self, name):
+        if name in BODY_FIELDS:
+            self.materialize()
+            return self.__dict__[name]
+        return super().__getattr__(name)
+
+    def _before_dump(self):
+        # Called by ArticleCollection before a nested dump
+        self.materialize()
+
+    def model_dump(self, **kwargs):
+        self.materialize()
+        return super().model_dump(**kwargs)
+
+    def model_dump_json(self, **kwargs):
+        self.materialize()
+        return super().model_dump_json(**kwargs)
+
+    def to_dict(self):
+        self.materialize()
+        return super().to_dict()
+
+    def validate(self):
+        self.materialize()
+        return super().validate()
+
+    def __eq__(self, other):
+        self.materialize()
+        if isinstance(other, LazyArticle):
+            other.materialize()
+        return super().__eq__(other)
+
+    def __getstate__(self):
+        # the store holds an mmap, pickled copies carry their body instead
+        self.materialize()
+        return super().__getstate__()
+
+
+def save_archive(
+    articles: Iterable[Article], directory: str, compression=None, append=False
+) -> int:
+    """
+    Writes articles as an archive: light fields in an NDJSON index, bodies in an mmap-able file
+    :param articles: any iterable of Article
+    :param directory: archive directory, created when missing
+    :param compression: compression of the index, see open_ndjson
+    :param append: add to an existing archive instead of replacing it
+    :return: number of articles written
+    """
+    os.makedirs(directory, exist_ok=True)
+    index_path = os.path.join(directory, INDEX_FILE)
+    if compression == "gzip":
+        index_path += ".gz"
+    elif compression == "zstd":
+        index_path += ".zst"
+    bodies_path = os.path.join(directory, BODIES_FILE)
+    if not append and os.path.exists(bodies_path):
+        os.remove(bodies_path)
+    written = 0
+    with BodyStore(bodies_path) as store, open_ndjson(
+        index_path, "a" if append else "w", compression
+    ) as index:
+        for article in articles:
+            record = article.model_dump(mode="json")
+            body = {field: record.pop(field, None) for field in BODY_FIELDS}
+            record["_body"] = store.append(body)
+            index.write(json.dumps(record))
+            index.write("\n")
+            written += 1
+    return written
+
+
+def _index_path(directory: str) -> str:
+    for suffix in ("", ".gz", ".zst"):
+        path = os.path.join(directory, INDEX_FILE + suffix)
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"No article index in {directory}")
+
+
+def iter_archive(
+    directory: str, store: Optional[BodyStore] = None
+) -> Iterator[LazyArticle]:
+    """
+    Lazily reads an archive, yielding LazyArticle objects that only hold their light fields
+    :param directory: archive directory
+    :param store: BodyStore of the archive, closed by the caller; when omitted a
+        readonly store is opened and released with the last article holding it
+    :return: generator of LazyArticle
+    """
+    store = store or BodyStore(os.path.join(directory, BODIES_FILE), readonly=True)
+    with open_ndjson(_index_path(directory), "r") as index:
+        for line in index:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            offset, length = record.pop("_body")
+            yield LazyArticle.from_reference(record, store, offset, length)
+
+
+def load_archive(
+    directory: str, store: Optional[BodyStore] = None
+) -> ArticleCollection:
+    """
+    Loads an archive into an ArticleCollection of LazyArticle, memory grows with the light fields only
+    :param store: see iter_archive
+    """
+    return ArticleCollection(articles=list(iter_archive(directory, store)))
@@ -0,0 +1,262 @@
+# --------------------------------
+# ArticleColumns Class
+# --------------------------------
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import numpy as np
+except ImportError as e:  # optional dependency
+    raise ImportError(
+        "ArticleColumns requires numpy, install the 'columns' extra"
+    ) from e
+
+from Timestamps import parse_timestamp
+
+CATEGORICAL_FIELDS = ("cluster", "language", "category", "source_url")
+NUMERIC_FIELDS = ("doc_id", "cluster_centroid")
+TIME_FIELDS = ("publish_date",)
+NULL_CODE = -1
+NOT_A_TIME = np.datetime64("NaT", "us")
+
+
+def parse_time(value: Any) -> np.datetime64:
+    """
+    Converts anything Timestamps.parse_timestamp accepts into UTC datetime64[us], NaT when it has no time
+    """
+    timestamp = parse_timestamp(value)
+    if timestamp is None:
+        return NOT_A_TIME
+    return np.datetime64(round(timestamp * 1_000_000), "us")
+
+
+def _epoch_times(seconds: np.ndarray) -> np.ndarray:
+    # epoch seconds, NaN for missing, to datetime64[us] with NaT
+    missing = np.isnan(seconds)
+    micros = np.round(np.where(missing, 0.0, seconds) * 1_000_000).astype(np.int64)
+    times = micros.astype("datetime64[us]")
+    times[missing] = NOT_A_TIME
+    return times
+
+
+def _article_time(article: Any, field: str) -> Optional[float]:
+    # Article parses its time fields at ingest, see Article.timestamp
+    if hasattr(article, "timestamp"):
+        return article.timestamp(field)
+    return parse_timestamp(getattr(article, field, None))
+
+
+class ArticleColumns:
+    """
+    Read-only columnar view of the scalar fields of a set of articles.
+
+    String-like fields (cluster, language, category, source_url) are
+    dictionary encoded into int32 codes, -1 standing for None, so predicates
+    and group-bys run on integer arrays. doc_id and cluster_centroid are int64
+    columns with a validity mask and publish_date is UTC datetime64[us] with
+    NaT for missing or unparseable dates, read through Timestamps like the
+    TimeIndex so both agree on every format. Every predicate returns a boolean mask
+    that can be combined with & | ~ and turned back into the Article objects
+    of the selected rows with articles(mask) or collection(mask).
+    """
+
+    def __init__(
+        self,
+        rows: np.ndarray,
+        codes: Dict[str, np.ndarray],
+        categories: Dict[str, List[Any]],
+        numbers: Dict[str, np.ndarray],
+        valid: Dict[str, np.ndarray],
+        times: Dict[str, np.ndarray],
+    ) -> None:
+        self._rows = rows
+        self._codes = codes
+        self._categories = categories
+        self._lookup = {
+            field: {value: code for code, value in enumerate(values)}
+            for field, values in categories.items()
+        }
+        self._numbers = numbers
+        self._valid = valid
+        self._times = times
+
+    @classmethod
+    def from_articles(cls, articles: Iterable[Any]) -> "ArticleColumns":
+        """
+        Builds the columns in a single pass over the articles
+        :param articles: ArticleCollection or any iterable of Article
+        :return: ArticleColumns
+        """
+        rows = list(articles)
+        size = len(rows)
+        lookups = {field: {} for field in CATEGORICAL_FIELDS}
+        codes = {field: np.empty(size, dtype=np.int32) for field in CATEGORICAL_FIELDS}
+        numbers = {field: np.zeros(size, dtype=np.int64) for field in NUMERIC_FIELDS}
+        valid = {field: np.zeros(size, dtype=bool) for field in NUMERIC_FIELDS}
+        seconds = {field: np.full(size, np.nan) for field in TIME_FIELDS}
+        for position, article in enumerate(rows):
+            for field in CATEGORICAL_FIELDS:
+                value = getattr(article, field)
+                if value is None:
+                    codes[field][position] = NULL_CODE
+                else:
+                    lookup = lookups[field]
+                    codes[field][position] = lookup.setdefault(value, len(lookup))
+            for field in NUMERIC_FIELDS:
+                value = getattr(article, field)
+                if value is not None:
+                    numbers[field][position] = value
+                    valid[field][position] = True
+            for field in TIME_FIELDS:
+                timestamp = _article_time(article, field)
+                if timestamp is not None:
+                    seconds[field][position] = timestamp
+        object_rows = np.empty(size, dtype=object)
+        object_rows[:] = rows
+        categories = {field: list(lookup) for field, lookup in lookups.items()}
+        times = {field: _epoch_times(values) for field, values in seconds.items()}
+        return cls(object_rows, codes, categories, numbers, valid, times)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def column(self, field: str) -> np.ndarray:
+        """
+        Returns the raw column: codes, numbers or datetimes
+        """
+        if field in self._codes:
+            return self._codes[field]
+        if field in self._numbers:
+            return self._numbers[field]
+        return self._times[field]
+
+    def categories(self, field: str) -> List[Any]:
+        return self._categories[field]
+
+    def values(self, field: str) -> List[Any]:
+        """
+        Returns the decoded values of a column as python objects
+        """
+        if field in self._codes:
+            categories = self._categories[field]
+            return [
+                categories[code] if code != NULL_CODE else None
+                for code in self._codes[field].tolist()
+            ]
+        if field in self._numbers:
+            return [
+                number if valid else None
+                for number, valid in zip(
+                    self._numbers[field].tolist(), self._valid[field].tolist()
+                )
+            ]
+        return self._times[field].tolist()
+
+    def _code(self, field: str, value: Any) -> Optional[int]:
+        if value is None:
+            return NULL_CODE
+        return self._lookup[field].get(value)
+
+    def equals(self, field: str, value: Any) -> np.ndarray:
+        if field in self._codes:
+            code = self._code(field, value)
+            if code is None:
+                return np.zeros(len(self), dtype=bool)
+            return self._codes[field] == code
+        if field in self._numbers:
+            if value is None:
+                return ~self._valid[field]
+            return self._valid[field] & (self._numbers[field] == value)
+        return self._times[field] == parse_time(value)
+
+    def isin(self, field: str, values: Iterable[Any]) -> np.ndarray:
+        if field in self._codes:
+            codes = [self._code(field, value) for value in values]
+            codes = [code for code in codes if code is not None]
+            return np.isin(self._codes[field], np.asarray(codes, dtype=np.int32))
+        mask = np.zeros(len(self), dtype=bool)
+        for value in values:
+            mask |= self.equals(field, value)
+        return mask
+
+    def between(self, field: str, low: Any = None, high: Any = None) -> np.ndarray:
+        """
+        Selects the rows with low <= value < high on a numeric or time column, missing values never match
+        """
+        if field in self._numbers:
+            column = self._numbers[field]
+            mask = self._valid[field].copy()
+        else:
+            column = self._times[field]
+            mask = ~np.isnat(column)
+            low = parse_time(low) if low is not None else None
+            high = parse_time(high) if high is not None else None
+        if low is not None:
+            mask &= column >= low
+        if high is not None:
+            mask &= column < high
+        return mask
+
+    def is_null(self, field: str) -> np.ndarray:
+        if field in self._codes:
+            return self._codes[field] == NULL_CODE
+        if field in self._numbers:
+            return ~self._valid[field]
+        return np.isnat(self._times[field])
+
+    def value_counts(self, field: str, mask: Optional[np.ndarray] = None) -> Dict:
+        """
+        Counts the rows per value of a categorical column
+        """
+        codes = self._codes[field] if mask is None else self._codes[field][mask]
+        counts = np.bincount(codes + 1, minlength=len(self._categories[field]) + 1)
+        result = {
+            value: int(count)
+            for value, count in zip(self._categories[field], counts[1:].tolist())
+            if count
+        }
+        if counts[0]:
+            result[None] = int(counts[0])
+        return result
+
+    def group_by(self, field: str, mask: Optional[np.ndarray] = None) -> Dict:
+        """
+        Returns the row positions of every value of a categorical column
+        """
+        codes = self._codes[field]
+        positions = np.arange(len(self)) if mask is None else np.flatnonzero(mask)
+        selected = codes[positions]
+        order = np.argsort(selected, kind="stable")
+        selected = selected[order]
+        positions = positions[order]
+        boundaries = np.flatnonzero(np.diff(selected)) + 1
+        groups = {}
+        categories = self._categories[field]
+        for group in np.split(positions, boundaries):
+            if len(group):
+                code = codes[group[0]]
+                groups[categories[code] if code != NULL_CODE else None] = group
+        return groups
+
+    def filter(self, mask: np.ndarray) -> "ArticleColumns":
+        """
+        Returns the view restricted to the selected rows, sharing the category dictionaries
+        """
+        return ArticleColumns(
+            self._rows[mask],
+            {field: codes[mask] for field, codes in self._codes.items()},
+            self._categories,
+            {field: numbers[mask] for field, numbers in self._numbers.items()},
+            {field: valid[mask] for field, valid in self._valid.items()},
+            {field: times[mask] for field, times in self._times.items()},
+        )
+
+    def articles(self, mask: Optional[np.ndarray] = None) -> List[Any]:
+        """
+        Returns the Article objects of the selected rows, or of every row
+        """
+        return (self._rows if mask is None else self._rows[mask]).tolist()
+
+    def collection(self, mask: Optional[np.ndarray] = None):
+        from Articles import ArticleCollection
+
+        return ArticleCollection(articles=self.articles(mask))
@@ -0,0 +1,166 @@
+# --------------------------------
+# ArticleIndex Class
+# --------------------------------
+from typing import Any, Dict, Iterable, List, Optional
+
+PRIMARY_FIELDS = ("id", "uid", "article_url")
+SECONDARY_FIELDS = ("cluster", "category", "source_url", "language")
+
+
+class ArticleIndex:
+    """
+    Hash indexes kept next to the articles list of an ArticleCollection.
+
+    Every indexed field maps a value to an insertion ordered bucket of the
+    articles holding it, keyed by object identity so removal is O(1). Primary
+    fields answer point lookups with the first article of the bucket, secondary
+    fields return the whole bucket. The values an article was indexed under are
+    remembered so it can be unindexed even after its fields have been mutated.
+
+    The index also tracks the position of every article in the list, which
+    lets remove_article find its target without comparing models. Positions
+    after a removal are refreshed lazily the next time they are needed. An
+    instance appended several times is indexed once and counted, so size
+    always matches the length of the list.
+    """
+
+    def __init__(
+        self,
+        primary_fields: Iterable[str] = PRIMARY_FIELDS,
+        secondary_fields: Iterable[str] = SECONDARY_FIELDS,
+    ) -> None:
+        self.primary_fields = tuple(primary_fields)
+        self.secondary_fields = tuple(secondary_fields)
+        self.fields = self.primary_fields + self.secondary_fields
+        self.clear()
+
+    def clear(self) -> None:
+        self._indexes: Dict[str, Dict[Any, Dict[int, Any]]] = {
+            field: {} for field in self.fields
+        }
+        self._keys: Dict[int, tuple] = {}
+        self._counts: Dict[int, int] = {}
+        self._positions: Dict[int, int] = {}
+        self._stale_from = 0
+        self.size = 0
+
+    def rebuild(self, articles: List[Any]) -> None:
+        self.clear()
+        for position, article in enumerate(articles):
+            self.add(article, position)
+
+    def add(self, article: Any, position: Optional[int] = None) -> bool:
+        """
+        Indexes an article, or counts one more occurrence of an indexed one
+        :return: True for the first occurrence
+        """
+        key = id(article)
+        if key in self._keys:
+            self._counts[key] += 1
+            if position is not None:
+                if position == self._stale_from:
+                    self._stale_from += 1
+                if position < self._stale_from:
+                    self._positions.setdefault(key, position)
+            self.size += 1
+            return False
+        values = tuple(getattr(article, field, None) for field in self.fields)
+        for field, value in zip(self.fields, values):
+            if value is None and field in self.primary_fields:
+                continue
+            self._indexes[field].setdefault(value, {})[key] = article
+        self._keys[key] = values
+        self._counts[key] = 1
+        if position is not None:
+            if position == self._stale_from:
+                self._stale_from += 1
+            if position < self._stale_from:
+                self._positions[key] = position
+        self.size += 1
+        return True
+
+    def discard(self, article: Any) -> bool:
+        """
+        Forgets one occurrence of an article, unindexing it with the last one
+        :return: True when the article was indexed
+        """
+        key = id(article)
+        count = self._counts.get(key)
+        if count is None:
+            return False
+        self.size -= 1
+        if count > 1:
+            # the remaining occurrences may sit anywhere, rescan on demand
+            self._counts[key] = count - 1
+            self._positions.pop(key, None)
+            self._stale_from = 0
+            return True
+        del self._counts[key]
+        self._unindex(key, self._keys.pop(key))
+        self._positions.pop(key, None)
+        return True
+
+    def _unindex(self, key: int, values: tuple) -> None:
+        for field, value in zip(self.fields, values):
+            bucket = self._indexes[field].get(value)
+            if bucket is None:
+                continue
+            bucket.pop(key, None)
+            if not bucket:
+                del self._indexes[field][value]
+
+    def refresh(self, article: Any) -> None:
+        """Re-indexes an article after its indexed fields were changed in place."""
+        key = id(article)
+        if key not in self._keys:
+            return
+        self._unindex(key, self._keys[key])
+        values = tuple(getattr(article, field, None) for field in self.fields)
+        for field, value in zip(self.fields, values):
+            if value is None and field in self.primary_fields:
+                continue
+            self._indexes[field].setdefault(value, {})[key] = article
+        self._keys[key] = values
+
+    def get(self, field: str, value: Any) -> Optional[Any]:
+        bucket = self._indexes[field].get(value)
+        if not bucket:
+            return None
+        return next(iter(bucket.values()))
+
+    def lookup(self, field: str, value: Any) -> List[Any]:
+        bucket = self._indexes[field].get(value)
+        return list(bucket.values()) if bucket else []
+
+    def count(self, field: str, value: Any) -> int:
+        return len(self._indexes[field].get(value, ()))
+
+    def values(self, field: str) -> List[Any]:
+        return list(self._indexes[field].keys())
+
+    def groups(self, field: str) -> Dict[Any, List[Any]]:
+        return {
+            value: list(bucket.values())
+            for value, bucket in self._indexes[field].items()
+        }
+
+    def __contains__(self, article: Any) -> bool:
+        return id(article) in self._keys
+
+    def __len__(self) -> int:
+        return self.size
+
+    def position(self, article: Any, articles: List[Any]) -> Optional[int]:
+        key = id(article)
+        if key not in self._keys:
+            return None
+        position = self._positions.get(key)
+        if position is None or position >= self._stale_from:
+            for index in range(self._stale_from, len(articles)):
+                self._positions[id(articles[index])] = index
+            self._stale_from = len(articles)
+            position = self._positions.get(key)
+        return position
+
+    def invalidate_positions(self, start: int) -> None:
+        self._stale_from = min(self._stale_from, start)
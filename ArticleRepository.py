@@ -0,0 +1,297 @@
+# --------------------------------
+# ArticleRepository Class
+# --------------------------------
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from Articles import Article, ArticleCollection, article_loader
+from Timestamps import parse_timestamp
+
+BATCH_SIZE = 500
+CHUNK_SIZE = 1000
+FILTER_COLUMNS = ("cluster", "category", "source_url", "language")
+INDEXED = ("uid",) + FILTER_COLUMNS + ("publish_date",)
+ORDER_COLUMNS = ("rowid", "id", "published_at", "cluster", "source_url")
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS articles ("
+    "id TEXT PRIMARY KEY, uid TEXT, cluster, category TEXT, source_url TEXT, "
+    "language TEXT, publish_date TEXT, published_at REAL, data TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS articles_cluster ON articles (cluster)",
+    "CREATE INDEX IF NOT EXISTS articles_category ON articles (category)",
+    "CREATE INDEX IF NOT EXISTS articles_source_url ON articles (source_url)",
+    "CREATE INDEX IF NOT EXISTS articles_language ON articles (language)",
+    "CREATE INDEX IF NOT EXISTS articles_published_at ON articles (published_at)",
+)
+UPSERT = (
+    "INSERT INTO articles (id, uid, cluster, category, source_url, language, "
+    "publish_date, published_at, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(id) DO UPDATE SET uid = excluded.uid, cluster = excluded.cluster, "
+    "category = excluded.category, source_url = excluded.source_url, "
+    "language = excluded.language, publish_date = excluded.publish_date, "
+    "published_at = excluded.published_at, data = excluded.data"
+)
+
+
+def _row(article: Article) -> Tuple:
+    if article.id is None:
+        raise ValueError("Only articles with an id can be stored")
+    return (
+        article.id,
+        article.uid,
+        article.cluster,
+        article.category,
+        article.source_url,
+        article.language,
+        article.publish_date,
+        parse_timestamp(article.publish_date),
+        article.model_dump_json(),
+    )
+
+
+class ArticleRepository:
+    """
+    Local SQLite store of articles, keyed by Article.id.
+
+    Each article is kept as its JSON record next to indexed cluster,
+    category, source_url, language and publish date columns, so single
+    articles are written and read without touching the rest of the corpus.
+    Writes are batched executemany upserts in WAL mode; queries filter on the
+    indexed columns and stream their results in chunks of rows. The
+    publish date is also stored as epoch seconds (published_at) for range
+    queries. Records are decoded in trusted mode by default, they were
+    written by model_dump_json.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        batch_size: int = BATCH_SIZE,
+        trusted: bool = True,
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self._load = article_loader(trusted)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        for statement in SCHEMA:
+            self._connection.execute(statement)
+        self._connection.commit()
+
+    def upsert(self, articles: Iterable[Article]) -> int:
+        """
+        Inserts or replaces articles, batch_size rows per executemany, in one transaction
+        :return: number of articles written
+        """
+        written = 0
+        with self._lock:
+            try:
+                batch = []
+                for article in articles:
+                    batch.append(_row(article))
+                    if len(batch) >= self.batch_size:
+                        self._connection.executemany(UPSERT, batch)
+                        written += len(batch)
+                        batch = []
+                if batch:
+                    self._connection.executemany(UPSERT, batch)
+                    written += len(batch)
+                self._connection.commit()
+            except Exception:
+                self._connection.rollback()
+                raise
+        return written
+
+    def apply_deltas(self, deltas: Iterable[Dict]) -> int:
+        """
+        Patches stored records in place with Article.delta() dictionaries,
+        rewriting only the changed JSON fields and indexed columns
+        :return: number of records updated
+        """
+        statements: Dict[tuple, List[List]] = {}
+        for delta in deltas:
+            fields = tuple(sorted(key for key in delta if key != "id"))
+            if not fields:
+                continue
+            params = []
+            for field in fields:
+                params.extend((f"$.{field}", json.dumps(delta[field])))
+            params.extend(delta[field] for field in fields if field in INDEXED)
+            if "publish_date" in fields:
+                params.append(parse_timestamp(delta["publish_date"]))
+            params.append(delta["id"])
+            statements.setdefault(fields, []).append(params)
+        updated = 0
+        with self._lock:
+            try:
+                for fields, rows in statements.items():
+                    assignments = [
+                        "data = json_set(data, %s)"
+                        % ", ".join(["?, json(?)"] * len(fields))
+                    ]
+                    assignments += [
+                        f"{field} = ?" for field in fields if field in INDEXED
+                    ]
+                    if "publish_date" in fields:
+                        assignments.append("published_at = ?")
+                    cursor = self._connection.executemany(
+                        f"UPDATE articles SET {', '.join(assignments)} WHERE id = ?",
+                        rows,
+                    )
+                    updated += cursor.rowcount
+                self._connection.commit()
+            except Exception:
+                self._connection.rollback()
+                raise
+        return updated
+
+    def save(self, article: Article) -> None:
+        self.upsert([article])
+
+    def save_collection(self, collection: ArticleCollection) -> int:
+        return self.upsert(collection.articles)
+
+    def delete(self, ids: Iterable[str]) -> int:
+        ids = list(ids)
+        deleted = 0
+        with self._lock:
+            for start in range(0, len(ids), self.batch_size):
+                batch = ids[start : start + self.batch_size]
+                cursor = self._connection.execute(
+                    "DELETE FROM articles WHERE id IN (%s)"
+                    % ",".join("?" * len(batch)),
+                    batch,
+                )
+                deleted += cursor.rowcount
+            self._connection.commit()
+        return deleted
+
+    def get(self, id: str) -> Optional[Article]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data FROM articles WHERE id = ?", (id,)
+            ).fetchone()
+        return self._load(json.loads(row[0])) if row else None
+
+    def get_many(self, ids: Iterable[str]) -> Dict[str, Article]:
+        ids = list(ids)
+        found = {}
+        for start in range(0, len(ids), self.batch_size):
+            batch = ids[start : start + self.batch_size]
+            with self._lock:
+                rows = self._connection.execute(
+                    "SELECT id, data FROM articles WHERE id IN (%s)"
+                    % ",".join("?" * len(batch)),
+                    batch,
+                ).fetchall()
+            for key, data in rows:
+                found[key] = self._load(json.loads(data))
+        return found
+
+    def _where(self, filters: Dict[str, Any]) -> Tuple[str, List]:
+        clauses, params = [], []
+        published_after = filters.pop("published_after", None)
+        published_before = filters.pop("published_before", None)
+        for column, value in filters.items():
+            if column not in FILTER_COLUMNS:
+                raise ValueError(f"Cannot filter articles on '{column}'")
+            if value is None:
+                continue
+            if isinstance(value, (list, tuple, set, frozenset)):
+                value = list(value)
+                clauses.append(f"{column} IN ({','.join('?' * len(value))})")
+                params.extend(value)
+            else:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if published_after is not None:
+            clauses.append("published_at >= ?")
+            params.append(parse_timestamp(published_after))
+        if published_before is not None:
+            clauses.append("published_at < ?")
+            params.append(parse_timestamp(published_before))
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def iter_chunks(
+        self,
+        chunk_size: int = CHUNK_SIZE,
+        order_by: str = "rowid",
+        limit: Optional[int] = None,
+        **filters,
+    ) -> Iterator[List[Article]]:
+        """
+        Streams the matching articles in lists of at most chunk_size
+        :param order_by: one of ORDER_COLUMNS, rowid keeps insertion order
+        :param limit: maximum number of articles
+        :param filters: cluster, category, source_url or language (a value or a list of values),
+            published_after and published_before (any value parse_timestamp accepts)
+        """
+        if order_by not in ORDER_COLUMNS:
+            raise ValueError(f"Cannot order articles by '{order_by}'")
+        where, params = self._where(filters)
+        sql = f"SELECT data FROM articles{where} ORDER BY {order_by}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            cursor = self._connection.execute(sql, params)
+        try:
+            while True:
+                with self._lock:
+                    rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    return
+                yield [self._load(json.loads(data)) for (data,) in rows]
+        finally:
+            cursor.close()
+
+    def query(self, **options) -> Iterator[Article]:
+        """
+        Streams the matching articles one by one, see iter_chunks for the options
+        """
+        for chunk in self.iter_chunks(**options):
+            yield from chunk
+
+    def load_collection(self, **options) -> ArticleCollection:
+        return ArticleCollection(articles=list(self.query(**options)))
+
+    def count(self, **filters) -> int:
+        where, params = self._where(filters)
+        with self._lock:
+            return self._connection.execute(
+                f"SELECT COUNT(*) FROM articles{where}", params
+            ).fetchone()[0]
+
+    def ids(self, **filters) -> List[str]:
+        where, params = self._where(filters)
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT id FROM articles{where} ORDER BY rowid", params
+            ).fetchall()
+        return [key for (key,) in rows]
+
+    def __contains__(self, id: str) -> bool:
+        with self._lock:
+            return (
+                self._connection.execute(
+                    "SELECT 1 FROM articles WHERE id = ?", (id,)
+                ).fetchone()
+                is not None
+            )
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
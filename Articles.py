@@ -1,23 +1,44 @@
 # --------------------------------
 # Article Class
 # --------------------------------
+import functools
+import gzip
 import json
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
-import langdetect
-import newspaper
-
-import uuid
-
-from datetime import datetime
-
-__name__ = "Articles Classes"
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+)
+from pydantic import BaseModel, Field, PrivateAttr, field_serializer, field_validator
 
 from Entities import Entity, EntitiesCollection
+from ArticleIndexes import ArticleIndex
+from SeenArticles import article_id_for_url
+from LanguageDetection import (
+    DEFAULT_LANGUAGE,
+    detect_language,
+    timed_detect_languages,
+)
+from Metrics import METRICS, MetricsRegistry
+from Timestamps import normalize_timestamp, parse_timestamp, split_timestamp, utc_now
+from Pipeline import Pipeline, bounded_futures
+
+if TYPE_CHECKING:  # newspaper is only needed by the crawler, not by the models
+    import newspaper
 
 import Logger
 
-logger = Logger.get_logger(__name__)
+logger = Logger.get_logger("Articles Classes")
+
+
+TIME_FIELDS = ("publish_date", "fetched_on", "last_updated")
 
 
 class Article(BaseModel):
@@ -38,7 +59,7 @@ class Article(BaseModel):
     text: Optional[str] = None
     authors: Optional[List[str]] = None
     summary: Optional[str] = None
-    similars: Optional[List[str]] = []
+    similars: Optional[List[str | Dict]] = []
     related: Optional[List[str]] = []
     topics: Optional[List[str]] = []
     source_url: Optional[str] = None
@@ -47,40 +68,212 @@ class Article(BaseModel):
     metadata: Optional[Dict[str, Any]] = Field(default=None, alias="metadata")
     combined: Optional[str] = None
     cluster_centroid: Optional[int] = None
+    _top_keywords: Optional[List[str]] = PrivateAttr(default=None)
+    _dirty: Optional[frozenset] = PrivateAttr(default=None)
+    _times: Optional[Dict[str, Optional[float]]] = PrivateAttr(default=None)
 
     class Config:
         arbitrary_types_allowed = True
         orm: True
 
+    @field_validator(*TIME_FIELDS, mode="before")
+    @classmethod
+    def time_text(cls, value):
+        # datetimes and epoch numbers are accepted, model_post_init normalizes them
+        if value is None or isinstance(value, str):
+            return value
+        normalized = normalize_timestamp(value)
+        return value if normalized is None else normalized
+
+    def model_post_init(self, __context: Any) -> None:
+        # Parse the time fields once at ingest, see timestamp()
+        self._parse_times()
+
+    def _parse_times(self):
+        # Time fields are stored as ISO 8601 UTC and "None" as None; values
+        # that do not parse are kept as given and have no timestamp
+        values = self.__dict__
+        times = {}
+        for field in TIME_FIELDS:
+            value = values.get(field)
+            if value is None:
+                times[field] = None
+                continue
+            normalized, times[field] = split_timestamp(value)
+            if normalized is not value:
+                values[field] = normalized
+        self.__pydantic_private__["_times"] = times
+
     def __getitem__(self, key):
         return self.__dict__
 
-    def from_dict(self, data: Dict):
-        return self(**data)
+    @classmethod
+    def from_dict(cls, data: Dict):
+        return cls(**data)
+
+    @classmethod
+    def from_trusted(cls, data: Dict):
+        # Build without validation, only for data written by our own serializers.
+        # Like model_construct, with the defaults resolved once per class.
+        fields, defaults, mutable, private = _trusted_template(cls)
+        values = defaults.copy()
+        for name in mutable:
+            values[name] = defaults[name].copy()
+        if fields.issuperset(data):
+            values.update(data)
+            fields_set = set(data)
+        else:
+            fields_set = fields.intersection(data)
+            values.update((name, data[name]) for name in fields_set)
+        article = cls.__new__(cls)
+        object.__setattr__(article, "__dict__", values)
+        object.__setattr__(article, "__pydantic_fields_set__", fields_set)
+        object.__setattr__(article, "__pydantic_extra__", None)
+        object.__setattr__(
+            article,
+            "__pydantic_private__",
+            {name: attr.get_default() for name, attr in private.items()},
+        )
+        return article
+
+    def validate(self):
+        # Deferred validation of a trusted article, fields are replaced in place
+        validated = type(self).model_validate(self.__dict__)
+        self.__dict__.update(validated.__dict__)
+        self._parse_times()
+        self.__pydantic_fields_set__ = validated.__pydantic_fields_set__
+        return self
 
     def to_dict(self):
         article_dict = self.__dict__.copy()
         article_dict["entities"] = [
-            entity.to_dict() for entity in self.entities
+            entity.to_dict() if isinstance(entity, Entity) else entity
+            for entity in self.entities or []
         ]  # Convert EntitiesCollection to list of dictionaries
         return article_dict
 
     def __setitem__(self, key, value):
         self.__dict__[key] = value
+        self._touch(key)
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        self._touch(name)
+
+    def _touch(self, name):
+        # Record a field modified since the last mark_clean(); the set is
+        # replaced rather than mutated so model copies do not share it. Without
+        # a snapshot (None) every field already counts as changed
+        private = self.__pydantic_private__
+        dirty = private["_dirty"]
+        if dirty is not None and name not in dirty and name in self.model_fields:
+            private["_dirty"] = dirty | {name}
+        if name in TIME_FIELDS:
+            times = private["_times"]
+            if times is not None:
+                value = parse_timestamp(self.__dict__.get(name))
+                private["_times"] = {**times, name: value}
+
+    def timestamp(self, field: str = "publish_date") -> Optional[float]:
+        """
+        Epoch seconds of a time field, parsed when the article is built or the field
+        assigned; articles built with from_trusted parse it on first use.
+        """
+        private = self.__pydantic_private__
+        times = private["_times"]
+        if times is None or field not in times:
+            value = parse_timestamp(getattr(self, field))
+            private["_times"] = {**(times or {}), field: value}
+            return value
+        return times[field]
+
+    @property
+    def published_at(self) -> Optional[float]:
+        return self.timestamp("publish_date")
+
+    @property
+    def fetched_at(self) -> Optional[float]:
+        return self.timestamp("fetched_on")
+
+    @property
+    def updated_at(self) -> Optional[float]:
+        return self.timestamp("last_updated")
+
+    def changed_fields(self) -> set:
+        # A new article has no snapshot yet, all of its fields are changes
+        dirty = self.__pydantic_private__["_dirty"]
+        return set(self.model_fields) if dirty is None else set(dirty)
+
+    def is_dirty(self) -> bool:
+        dirty = self.__pydantic_private__["_dirty"]
+        return dirty is None or bool(dirty)
+
+    def mark_clean(self):
+        # Take a snapshot: forget the fields changed so far
+        self.__pydantic_private__["_dirty"] = frozenset()
+
+    def delta(self) -> Dict:
+        """
+        Returns the fields changed since the last snapshot, JSON ready, keyed with the article id.
+        """
+        changed = self.__pydantic_private__["_dirty"]
+        if changed is None:
+            patch = self.model_dump(mode="json")
+        else:
+            patch = (
+                self.model_dump(mode="json", include=set(changed)) if changed else {}
+            )
+        patch["id"] = self.id
+        return patch
+
+    def apply_delta(self, delta: Dict) -> set:
+        """
+        Applies a delta produced by delta(), assigning only the fields whose value differs
+        :return: names of the fields that changed
+        """
+        changed = set()
+        for key, value in delta.items():
+            if key == "id":
+                continue
+            if key not in self.model_fields:
+                raise KeyError(f"Invalid field '{key}' for Article")
+            if self.__dict__.get(key) != value:
+                setattr(self, key, value)
+                changed.add(key)
+        return changed
+
+    @field_serializer("entities")
+    def serialize_entities(self, entities):
+        # Emit entities as a plain list, like to_dict, when dumping natively
+        if isinstance(entities, EntitiesCollection):
+            return entities.entities
+        return entities
+
+    def _before_dump(self):
+        # Subclasses complete their fields here, e.g. LazyArticle loads its body
+        pass
 
     def to_json(self) -> str:
-        return json.dumps(self, cls=ArticleEncoder)
+        return self.model_dump_json()
 
     def set_topics(self, topics):
         self.topics = topics
 
     def update(self, article):
-        _article = article.to_dict()
-        for key, value in _article.items():
-            if hasattr(self, key):
-                setattr(self, key, value)
-            else:
+        # Copy the fields of another article, assigning only those that differ;
+        # getattr lets the source complete its fields, e.g. a LazyArticle body
+        current = self.__dict__
+        for key in type(article).model_fields:
+            if key not in self.model_fields:
                 raise KeyError(f"Invalid field '{key}' for Article")
+            value = getattr(article, key)
+            if current.get(key) != value:
+                if key == "entities":
+                    value = [
+                        entity.to_dict() if isinstance(entity, Entity) else entity
+                        for entity in value or []
+                    ]
+                setattr(self, key, value)
 
     def encode(self):
         return json.dumps(self.__dict__)
@@ -123,18 +316,21 @@ class Article(BaseModel):
 
     def add_related_article(self, article):
         self.related.append(article)
+        self._touch("related")
 
     def get_related_articles(self):
         return self.related
 
     def add_similars_article(self, article):
         self.similars.append(article)
+        self._touch("similars")
 
     def get_similars_articles(self):
         return self.similars
 
     def add_topic(self, topic):
         self.topics.append(topic)
+        self._touch("topics")
 
     def get_category(self):
         return self.category
@@ -143,7 +339,13 @@ class Article(BaseModel):
         return len(self.text.split())
 
     def get_top_keywords(self, num_keywords=3):
-        return sorted(self.keywords, key=lambda x: x[1], reverse=True)[:num_keywords]
+        # Ranked by a KeywordEngine when available, newspaper keywords otherwise
+        if self._top_keywords is not None:
+            return self._top_keywords[:num_keywords]
+        return (self.keywords or [])[:num_keywords]
+
+    def set_top_keywords(self, keywords):
+        self._top_keywords = keywords
 
     def set_sentiment(self, sentiment):
         self.sentiment = sentiment
@@ -160,6 +362,31 @@ class Article(BaseModel):
         return self.category
 
 
+_TRUSTED_TEMPLATES: Dict[type, tuple] = {}
+
+
+def _trusted_template(cls) -> tuple:
+    # field names, resolved defaults, names of the mutable ones and private attributes
+    template = _TRUSTED_TEMPLATES.get(cls)
+    if template is None:
+        defaults = {
+            name: field.get_default(call_default_factory=True)
+            for name, field in cls.model_fields.items()
+        }
+        mutable = tuple(
+            name
+            for name, value in defaults.items()
+            if isinstance(value, (list, dict, set))
+        )
+        template = _TRUSTED_TEMPLATES[cls] = (
+            frozenset(defaults),
+            defaults,
+            mutable,
+            dict(cls.__private_attributes__),
+        )
+    return template
+
+
 class ArticleBuilder(BaseModel):
     id: str = None
     uid: str = None
@@ -193,37 +420,152 @@ class ArticleBuilder(BaseModel):
         orm_mode = True
         arbitrary_types_allowed = True
 
+    def newspaper3KData(
+        self, article: "newspaper.Article", newsPaperBrand: str, fetched_on=None
+    ) -> Dict:
+        """
+        Reads the fields of a parsed newspaper article, leaving language detection to the caller.
+        """
+        article_id = article_id_for_url(article.url)
+        fetched_on = fetched_on or utc_now()
+        meta_data = article.meta_data or {}
+        return {
+            "fetched_on": fetched_on,
+            "id": article_id,
+            "uid": article_id,
+            "title": article.title or "untitled",
+            "text": article.text,
+            "authors": article.authors or [],
+            "publish_date": normalize_timestamp(article.publish_date),
+            "source_url": newsPaperBrand,
+            "article_url": article.url,
+            "keywords": article.keywords,
+            "summary": article.summary,
+            "similars": [],
+            "related": [],
+            "topics": [],
+            "sentiment": "",
+            "factual": "",
+            "last_updated": fetched_on,
+            "metadata": meta_data or None,
+            "category": meta_data.get("category") or None,
+        }
+
     def buildFromNewspaper3K(
-        self, article: newspaper.Article, newsPaperBrand: str
+        self,
+        article: "newspaper.Article",
+        newsPaperBrand: str,
+        metrics: Optional[MetricsRegistry] = None,
     ) -> Article:
+        metrics = metrics or METRICS
         articleData = {}
         try:
-            articleData = {
-                "fetched_on": str(datetime.now()),
-                "id": str(uuid.uuid3(uuid.NAMESPACE_URL, article.url)),
-                "uid": str(uuid.uuid3(uuid.NAMESPACE_URL, article.url)),
-                "title": article.title or "untitled",
-                "text": article.text,
-                "authors": article.authors or [],
-                "publish_date": str(article.publish_date),
-                "source_url": newsPaperBrand,
-                "article_url": article.url,
-                "keywords": article.keywords,
-                "summary": article.summary,
-                "similars": [],
-                "related": [],
-                "topics": [],
-                "sentiment": "",
-                "factual": "",
-                "language": langdetect.detect(article.text) or "en",
-                "last_updated": str(datetime.now()),
-                "metadata": article.meta_data or None,
-                "category": article.meta_data.get("category") or None,
-            }
+            with metrics.stage("extract", outlet=newsPaperBrand):
+                articleData = self.newspaper3KData(article, newsPaperBrand)
+            with metrics.stage("langdetect", outlet=newsPaperBrand):
+                language = detect_language(article.text)
+            articleData["language"] = language or DEFAULT_LANGUAGE
+            metrics.increment("articles_built_total", outlet=newsPaperBrand)
         except ValueError as e:
+            metrics.increment("failures_total", outlet=newsPaperBrand, stage="build")
             logger.error(f"Error fetching article: {e}")
         return Article(**articleData)
 
+    def buildManyFromNewspaper3K(
+        self,
+        articles: Iterable["newspaper.Article"],
+        newsPaperBrand: str,
+        max_workers: Optional[int] = None,
+        ordered: bool = True,
+        chunksize: int = 16,
+        executor: Optional[Executor] = None,
+        on_error: Optional[Callable[[Any, Exception], None]] = None,
+    ) -> Iterator[Article]:
+        """
+        Builds Articles from many parsed newspaper articles, running language
+        detection across a process pool.
+
+        Field extraction happens in the calling process, only the texts are
+        shipped to the workers in chunks, at most two per worker in flight so
+        the input streams through. A failing article is logged, passed to
+        on_error and skipped; the rest of the batch carries on.
+
+        :param articles: parsed newspaper articles
+        :param newsPaperBrand: source url stored on every article
+        :param max_workers: pool size, 1 runs everything in the calling process
+        :param ordered: yield in input order, otherwise as chunks complete
+        :param chunksize: number of articles sent to a worker at once
+        :param executor: existing executor to reuse instead of creating a pool
+        :param on_error: callback receiving the failing article and the error
+        :return: generator of Article
+        """
+
+        def failed(source, error):
+            METRICS.increment("failures_total", outlet=newsPaperBrand, stage="build")
+            logger.error(f"Error building article: {error}")
+            if on_error is not None:
+                on_error(source, error)
+
+        def chunks():
+            fetched_on = utc_now()
+            chunk = []
+            for source in articles:
+                try:
+                    with METRICS.stage("extract", outlet=newsPaperBrand):
+                        data = self.newspaper3KData(source, newsPaperBrand, fetched_on)
+                    chunk.append((source, data))
+                except Exception as e:
+                    failed(source, e)
+                if len(chunk) >= chunksize:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+        def build(chunk, detected):
+            languages, seconds = detected
+            METRICS.observe(
+                "stage_seconds", seconds, outlet=newsPaperBrand, stage="langdetect"
+            )
+            for (source, data), language in zip(chunk, languages):
+                if isinstance(language, Exception):
+                    failed(source, language)
+                    continue
+                try:
+                    data["language"] = language or DEFAULT_LANGUAGE
+                    article = Article(**data)
+                    METRICS.increment("articles_built_total", outlet=newsPaperBrand)
+                    yield article
+                except Exception as e:
+                    failed(source, e)
+
+        def texts(chunk):
+            return [data["text"] for _, data in chunk]
+
+        if executor is None and max_workers == 1:
+            for chunk in chunks():
+                yield from build(chunk, timed_detect_languages(texts(chunk)))
+            return
+
+        pool = executor or ProcessPoolExecutor(max_workers=max_workers)
+        limit = 2 * (max_workers or os.cpu_count() or 1)
+        try:
+            futures = bounded_futures(
+                lambda chunk: pool.submit(timed_detect_languages, texts(chunk)),
+                chunks(),
+                limit,
+                ordered,
+            )
+            for chunk, future in futures:
+                try:
+                    detected = future.result()
+                except Exception as e:
+                    detected = ([e] * len(chunk), 0.0)
+                yield from build(chunk, detected)
+        finally:
+            if executor is None:
+                pool.shutdown(cancel_futures=True)
+
 
 class ArticleEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -240,6 +582,14 @@ class ArticleEncoder(json.JSONEncoder):
 
 class ArticleCollection(BaseModel):
     articles: List[Article] = []
+    _index: ArticleIndex = PrivateAttr(default_factory=ArticleIndex)
+    _listeners: List[Any] = PrivateAttr(default_factory=list)
+    _clusters: Optional[Any] = PrivateAttr(default=None)
+    _keywords: Optional[Any] = PrivateAttr(default=None)
+    _time_indexes: Dict[str, Any] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, __context: Any) -> None:
+        self.reindex()
 
     def __iter__(self):
         return iter(self.articles)
@@ -253,40 +603,96 @@ class ArticleCollection(BaseModel):
     def append(self, article):
         self.add_article(article)
 
-    def add_article(self, article):
-        self.articles.append(article)
-
     def size(self):
         return len(self.articles)
 
-    def remove_article(self, article):
-        self.articles.remove(article)
+    def reindex(self):
+        # Rebuild the hash indexes from the articles list
+        self._index.rebuild(self.articles)
+        for listener in self._listeners:
+            listener.rebuild(self.articles)
+
+    def attach(self, listener, rebuild=True):
+        # Keep a derived index (rebuild/add/discard) in sync with the collection
+        self._ensure_index()
+        if rebuild:
+            listener.rebuild(self.articles)
+        self._listeners.append(listener)
+        return listener
+
+    def detach(self, listener):
+        self._listeners.remove(listener)
+
+    def clusters(self):
+        # ClusterRegistry kept current with the collection, attached on first use
+        if self._clusters is None:
+            from Clusters import ClusterRegistry
+
+            self._clusters = self.attach(ClusterRegistry())
+        return self._clusters
+
+    def keywords(self, **engine):
+        # KeywordEngine kept current with the collection, attached on first use
+        if self._keywords is None:
+            from Keywords import KeywordEngine
+
+            self._keywords = self.attach(KeywordEngine(**engine))
+        return self._keywords
+
+    def time_index(self, field="publish_date"):
+        # TimeIndex over one time field kept current with the collection, attached on first use
+        index = self._time_indexes.get(field)
+        if index is None:
+            from TimeIndex import TimeIndex
+
+            index = self._time_indexes[field] = self.attach(TimeIndex(field))
+        return index
+
+    def articles_between(self, start=None, end=None, field="publish_date"):
+        # Articles with start <= time < end, oldest first, in O(log n + k)
+        return self.time_index(field).between(start, end)
+
+    def recent(self, seconds, now=None, field="publish_date"):
+        # Articles of the last seconds, e.g. recent(86400) for the last day
+        return self.time_index(field).since(seconds, now)
+
+    def iter_windows(self, size, start=None, end=None, field="publish_date"):
+        # (window start, articles) for consecutive windows of size seconds
+        return self.time_index(field).windows(size, start, end)
+
+    def reassign_cluster(self, article, cluster):
+        article.cluster = cluster
+        self.refresh_article(article)
+
+    def _added(self, article):
+        for listener in self._listeners:
+            listener.add(article)
+
+    def _discarded(self, article):
+        for listener in self._listeners:
+            listener.discard(article)
+
+    def refresh_article(self, article):
+        # Re-index an article whose indexed fields were changed in place
+        self._ensure_index()
+        self._index.refresh(article)
+        for listener in self._listeners:
+            # listeners may update in place, e.g. to keep an insertion order
+            refresh = getattr(listener, "refresh_article", None)
+            if refresh is not None:
+                refresh(article)
+            else:
+                listener.discard(article)
+                listener.add(article)
 
-    def filter_articles(self, filter_func):
-        filtered_articles = [
-            article for article in self.articles if filter_func(article)
-        ]
-        filtered_collection = ArticleCollection()
-        filtered_collection.articles = filtered_articles
-        return filtered_collection
+    def _ensure_index(self):
+        # Articles appended to the list directly bypass the index
+        if len(self._index) != len(self.articles):
+            self.reindex()
+        return self._index
 
     def find_article(self, article_id):
-        for article in self.articles:
-            if article.id == article_id:
-                return article
-        return None
-
-    def save_to_json(self, file_path):
-        data = [article.to_dict() for article in self.articles]
-        with open(file_path, "w") as file:
-            json.dump(data, file)
-
-    def load_from_json(self, file_path):
-        with open(file_path, "r") as file:
-            data = json.load(file)
-            for article_data in data:
-                article = Article.from_dict(article_data)
-                self.add_article(article)
+        return self._ensure_index().get("id", article_id)
 
     def __getitem__(self, key):
         if isinstance(key, slice):
@@ -295,42 +701,215 @@ class ArticleCollection(BaseModel):
             return self.articles[key]
 
     def __setitem__(self, key, value):
-        self.articles[key] = value
+        index = self._ensure_index()
+        if isinstance(key, slice):
+            self.articles[key] = value
+            self.reindex()
+            return
+        position = key if key >= 0 else len(self.articles) + key
+        previous = self.articles[position]
+        index.discard(previous)
+        self.articles[position] = value
+        added = index.add(value, position)
+        # listeners see each instance once, however many times it is listed
+        if previous not in index:
+            self._discarded(previous)
+        if added:
+            self._added(value)
 
     def add_article(self, article):
         # Add an article to the collection
+        index = self._ensure_index()
         self.articles.append(article)
+        if index.add(article, len(self.articles) - 1):
+            self._added(article)
 
     def get_article(self, id):
         # get the article in the collection that has the given id
-        for article in self.articles:
-            if article.id == id:
-                return article
+        return self._ensure_index().get("id", id)
+
+    def get_article_by_uid(self, uid):
+        return self._ensure_index().get("uid", uid)
+
+    def get_article_by_url(self, article_url):
+        return self._ensure_index().get("article_url", article_url)
+
+    def get_articles_by_cluster(self, cluster) -> List[Article]:
+        return self._ensure_index().lookup("cluster", cluster)
+
+    def get_articles_by_category(self, category) -> List[Article]:
+        return self._ensure_index().lookup("category", category)
+
+    def get_articles_by_source(self, source_url) -> List[Article]:
+        return self._ensure_index().lookup("source_url", source_url)
+
+    def get_articles_by_language(self, language) -> List[Article]:
+        return self._ensure_index().lookup("language", language)
+
+    def has_article(self, id) -> bool:
+        return self._ensure_index().get("id", id) is not None
 
     def remove_article(self, article):
         # Remove an article from the collection
-        self.articles.remove(article)
+        index = self._ensure_index()
+        if article not in index:
+            # Fall back to the indexed instance of an equal article
+            article = index.get("id", article.id) or article
+        position = index.position(article, self.articles)
+        if position is None:
+            raise ValueError("article not in collection")
+        del self.articles[position]
+        index.discard(article)
+        index.invalidate_positions(position)
+        if article not in index:
+            self._discarded(article)
+
+    def remove_articles(self, articles):
+        # Remove several articles in a single pass over the list
+        index = self._ensure_index()
+        doomed = set()
+        for article in articles:
+            if article not in index:
+                article = index.get("id", article.id) or article
+            doomed.add(id(article))
+        self.articles = [
+            article for article in self.articles if id(article) not in doomed
+        ]
+        self.reindex()
 
     def save_to_json(self, file_path):
-        # Save the collection to a JSON file
-        data = [article.to_json() for article in self.articles]
-        with open(file_path, "w") as file:
-            json.dump(data, file)
+        # Save the collection to a JSON file, encoding one article at a time natively
+        with open(file_path, "w", encoding="utf-8") as file:
+            file.write("[")
+            for position, article in enumerate(self.articles):
+                if position:
+                    file.write(", ")
+                file.write(article.model_dump_json())
+            file.write("]")
+
+    def save_to_ndjson(self, file_path, compression=None) -> int:
+        # Save the collection as one JSON article per line
+        return write_articles_ndjson(self.articles, file_path, compression)
+
+    def save_by_time(
+        self, directory, bucket="day", field="publish_date", compression=None
+    ) -> Dict[str, int]:
+        """
+        Saves one NDJSON file per UTC time bucket, e.g. 2024-03-01.ndjson, undated articles in undated.ndjson
+        :param bucket: "hour", "day", "month" or "year"
+        :param compression: None, "gzip" or "zstd", picks the file suffix
+        :return: file path -> number of articles written
+        """
+        suffix = {None: ".ndjson", "none": ".ndjson", "gzip": ".ndjson.gz"}.get(
+            compression, ".ndjson.zst"
+        )
+        os.makedirs(directory, exist_ok=True)
+        written = {}
+        for name, articles in self.time_index(field).buckets(bucket).items():
+            path = os.path.join(directory, (name or "undated") + suffix)
+            written[path] = write_articles_ndjson(articles, path, compression)
+        return written
+
+    def changed_articles(self):
+        # Articles modified since their last snapshot
+        return [article for article in self.articles if article.is_dirty()]
+
+    def mark_clean(self):
+        for article in self.articles:
+            article.mark_clean()
+
+    def save_changes(self, repository) -> int:
+        # Upsert only the changed articles into an ArticleRepository, then snapshot them
+        changed = self.changed_articles()
+        written = repository.upsert(changed)
+        for article in changed:
+            article.mark_clean()
+        return written
+
+    def export_deltas(self, file_path, compression=None, mode="w") -> int:
+        # Write one delta per changed article as NDJSON, then snapshot them
+        written = 0
+        with open_ndjson(file_path, mode, compression) as file:
+            for article in self.changed_articles():
+                file.write(json.dumps(article.delta()))
+                file.write("\n")
+                article.mark_clean()
+                written += 1
+        return written
+
+    def apply_deltas(self, deltas) -> int:
+        # Apply deltas to the articles with the same id, re-indexing those that changed
+        applied = 0
+        for delta in deltas:
+            article = self.get_article(delta["id"])
+            if article is None:
+                continue
+            if article.apply_delta(delta):
+                self.refresh_article(article)
+            applied += 1
+        return applied
 
     def load_articles_from_json(self, data):
         builder = ArticleBuilder()
         self.articles = [
             builder.from_json(article_data).build() for article_data in data
         ]
+        self.reindex()
 
-    def load_from_json(self, file_path):
-        # Load the collection from a JSON file
-        with open(file_path, "r") as file:
+    def load_from_json(self, file_path, trusted=False, validate_every=None):
+        # Load the collection from a JSON file, see article_loader for trusted
+        load = article_loader(trusted, validate_every)
+        with open(file_path, "r", encoding="utf-8") as file:
             data = json.load(file)
             for article_data in data:
-                article = Article(article_data)
+                article = load(article_data)
                 self.add_article(article)
 
+    def load_from_ndjson(
+        self,
+        file_path,
+        filter_func=None,
+        compression=None,
+        trusted=False,
+        validate_every=None,
+    ):
+        # Stream articles from an NDJSON file into the collection
+        for article in iter_articles_ndjson(
+            file_path, filter_func, compression, trusted, validate_every
+        ):
+            self.add_article(article)
+
+    def validate(self):
+        # Deferred validation of articles loaded in trusted mode
+        for article in self.articles:
+            article.validate()
+        return self
+
+    def to_columns(self):
+        # Columnar numpy view of the scalar fields, see ArticleColumns
+        from ArticleColumns import ArticleColumns
+
+        return ArticleColumns.from_articles(self.articles)
+
+    def _before_dump(self):
+        # Nested articles are dumped with the Article schema, which skips the
+        # overrides of subclasses; let them complete their fields first
+        for article in self.articles:
+            if type(article) is not Article:
+                article._before_dump()
+
+    def model_dump(self, **kwargs):
+        self._before_dump()
+        return super().model_dump(**kwargs)
+
+    def model_dump_json(self, **kwargs):
+        self._before_dump()
+        return super().model_dump_json(**kwargs)
+
+    def to_json(self) -> str:
+        # Encode the whole collection in a single native call
+        return self.model_dump_json()
+
     def to_dict(self):
         # Convert the collection to a Python dictionary
         return {"articles": [article.to_dict() for article in self.articles]}
@@ -350,21 +929,154 @@ class ArticleCollection(BaseModel):
             article for article in self.articles if filter_func(article)
         ]
         # Create a new ArticleCollection object with the filtered articles
-        filtered_collection = ArticleCollection()
-        filtered_collection.articles = filtered_articles
-        return filtered_collection
+        return ArticleCollection(articles=filtered_articles)
+
+
+NDJSON_COMPRESSIONS = {".gz": "gzip", ".gzip": "gzip", ".zst": "zstd", ".zstd": "zstd"}
 
 
-def build_article_collection(documents) -> ArticleCollection:
+def open_ndjson(file_path, mode="r", compression=None):
+    """
+    Opens an NDJSON file in text mode, optionally through gzip or zstd.
+
+    :param file_path: path of the file
+    :param mode: "r", "w" or "a"
+    :param compression: "gzip", "zstd", "none" or None to infer it from the suffix
+    :return: text file object
+    """
+    if compression is None:
+        compression = NDJSON_COMPRESSIONS.get(os.path.splitext(str(file_path))[1])
+    if compression == "gzip":
+        return gzip.open(file_path, mode + "t", encoding="utf-8")
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(
+                "zstd compression requires the 'zstandard' package"
+            ) from e
+        return zstandard.open(file_path, mode + "t", encoding="utf-8")
+    if compression in (None, "none"):
+        return open(file_path, mode, encoding="utf-8")
+    raise ValueError(f"Unsupported compression '{compression}'")
+
+
+def write_articles_ndjson(articles, file_path, compression=None) -> int:
+    """
+    Writes articles one JSON document per line without holding them all in memory.
+
+    :param articles: any iterable of Article, including a generator
+    :param file_path: destination file
+    :param compression: see open_ndjson
+    :return: number of articles written
+    """
+    written = 0
+    with open_ndjson(file_path, "w", compression) as file:
+        for article in articles:
+            file.write(article.model_dump_json())
+            file.write("\n")
+            written += 1
+    return written
+
+
+def iter_articles_ndjson(
+    file_path, filter_func=None, compression=None, trusted=False, validate_every=None
+):
+    """
+    Lazily reads articles from an NDJSON file, one line at a time.
+
+    :param file_path: source file
+    :param filter_func: optional predicate, articles it rejects are skipped
+    :param compression: see open_ndjson
+    :param trusted: skip validation, see article_loader
+    :param validate_every: in trusted mode, still validate one record in N
+    :return: generator of Article
+    """
+    load = article_loader(trusted, validate_every)
+    with open_ndjson(file_path, "r", compression) as file:
+        for line in file:
+            if not line.strip():
+                continue
+            article = load(json.loads(line))
+            if filter_func is None or filter_func(article):
+                yield article
+
+
+class SamplingValidator:
+    """
+    Validates one record in every N against the Article schema, raising
+    pydantic's ValidationError on the first bad one. Catches a corrupted or
+    foreign file early in a trusted load at 1/N of the validation cost.
+    """
+
+    def __init__(self, every: int = 100) -> None:
+        if every < 1:
+            raise ValueError("every must be a positive integer")
+        self.every = every
+        self.seen = 0
+        self.checked = 0
+
+    def __call__(self, data: Dict) -> None:
+        if self.seen % self.every == 0:
+            Article.model_validate(data)
+            self.checked += 1
+        self.seen += 1
+
+
+def article_loader(
+    trusted: bool = False, validate_every: Optional[int] = None
+) -> Callable[[Dict], Article]:
+    """
+    Returns the function turning a stored dictionary into an Article.
+
+    Untrusted data goes through full validation. Trusted data, written by
+    our own serializers, is constructed without validation; validate_every
+    adds a SamplingValidator and Article.validate() can still be called
+    later on any article. Loaded articles start clean, the stored record is
+    their snapshot for changed_fields() and delta().
+
+    :param trusted: skip validation
+    :param validate_every: in trusted mode, validate one record in N
+    :return: callable taking a dictionary
+    """
+    build = Article.from_trusted if trusted else Article.from_dict
+    sample = SamplingValidator(validate_every) if trusted and validate_every else None
+
+    def load(data: Dict) -> Article:
+        if sample is not None:
+            sample(data)
+        article = build(data)
+        article.mark_clean()  # a stored record is its own snapshot
+        return article
+
+    return load
+
+
+def iter_deltas(file_path, compression=None):
+    """
+    Reads the deltas written by ArticleCollection.export_deltas
+    """
+    with open_ndjson(file_path, "r", compression) as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def build_article_collection(
+    documents, trusted=False, validate_every=None
+) -> ArticleCollection:
+    load = article_loader(trusted, validate_every)
     _articles: ArticleCollection = ArticleCollection()
     for article_data in documents:
-        article = Article(vars(article_data))
+        article = load(dict(vars(article_data)))
         article.doc_id = article_data.doc_id
         _articles.append(article)
     return _articles
 
 
 def group_articles_by_cluster(articles) -> dict:
+    if isinstance(articles, ArticleCollection) and articles._clusters is not None:
+        return articles._clusters.groups()
     clusters = {}
     for article in articles:
         cluster_id = article.cluster
@@ -375,6 +1087,8 @@ def group_articles_by_cluster(articles) -> dict:
 
 
 def extract_unique_clusters(articles: ArticleCollection) -> List[int]:
+    if isinstance(articles, ArticleCollection) and articles._clusters is not None:
+        return articles._clusters.cluster_ids()
     cluster_numbers = set()
     for article in articles:
         cluster_numbers.add(article.cluster)
@@ -382,5 +1096,93 @@ def extract_unique_clusters(articles: ArticleCollection) -> List[int]:
     return unique_clusters
 
 
-class ArticleProcessor:
-    pass
+def paper_articles(papers) -> Iterator[tuple]:
+    """
+    Yields (newspaper article, source url) pairs from generated papers, e.g. NewsPaperCrawler.crawl output
+    """
+    for paper in papers:
+        if isinstance(paper, tuple):  # (outlet, paper) from crawl()
+            paper = paper[1]
+        if paper is None:
+            continue
+        for article in paper.articles:
+            yield article, paper.url
+
+
+class ArticleProcessor(Pipeline):
+    """
+    Streaming enrichment pipeline for articles, see Pipeline and Stage.
+
+    Stages are added in order, for instance download, build, keyword
+    scoring, entity extraction, sentiment and dedupe, and the results are
+    written to a collection, an ArticleRepository or an NDJSON file as they
+    come out, so a crawl never has to sit in memory as a whole. Functions of
+    process stages, their items and results must be picklable.
+    """
+
+    def download_stage(self, workers: int = 8, newspaper=None) -> "ArticleProcessor":
+        # (newspaper article, source url) -> downloaded and parsed pair, on threads;
+        # with a NewsPaper, downloads go through it and land in its seen store
+        func = _download_pair
+        if newspaper is not None:
+            func = functools.partial(_download_pair, newspaper=newspaper)
+        return self.add_stage(func, mode="thread", workers=workers, name="download")
+
+    def build_stage(self, mode: str = "inline", workers: int = 1) -> "ArticleProcessor":
+        # (newspaper article, source url) -> Article; on processes the workers'
+        # metrics come back with each article and are merged into METRICS
+        if mode != "process":
+            return self.add_stage(_build_pair, mode=mode, workers=workers, name="build")
+        func = functools.partial(_build_pair_measured, buckets=METRICS.buckets)
+        self.add_stage(func, mode=mode, workers=workers, name="build")
+        return self.add_stage(_merge_metrics, name="build_metrics")
+
+    def into_collection(self, source, collection=None) -> ArticleCollection:
+        collection = ArticleCollection() if collection is None else collection
+        self.process(source, collection.add_article)
+        return collection
+
+    def into_repository(self, source, repository, batch_size: int = 500) -> int:
+        # Upsert results in batches, holding at most batch_size articles
+        written = 0
+        batch = []
+        for article in self.run(source):
+            batch.append(article)
+            if len(batch) >= batch_size:
+                written += repository.upsert(batch)
+                batch = []
+        if batch:
+            written += repository.upsert(batch)
+        return written
+
+    def into_ndjson(self, source, file_path, compression=None) -> int:
+        return write_articles_ndjson(self.run(source), file_path, compression)
+
+
+def _download_pair(pair, newspaper=None):
+    article, source_url = pair
+    if newspaper is None:
+        article.download()
+    elif not newspaper.download_article(article, outlet=source_url):
+        return None  # failed or not modified since the last fetch
+    article.parse()
+    return article, source_url
+
+
+def _build_pair(pair):
+    article, source_url = pair
+    return ArticleBuilder().buildFromNewspaper3K(article, source_url)
+
+
+def _build_pair_measured(pair, buckets=None):
+    # worker side of a process build stage, the parent's METRICS is out of reach
+    article, source_url = pair
+    metrics = MetricsRegistry(enabled=True, buckets=buckets or METRICS.buckets)
+    built = ArticleBuilder().buildFromNewspaper3K(article, source_url, metrics)
+    return built, metrics.export()
+
+
+def _merge_metrics(result):
+    article, exported = result
+    METRICS.merge(exported)
+    return article
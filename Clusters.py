@@ -0,0 +1,217 @@
+# --------------------------------
+# ClusterRegistry Class
+# --------------------------------
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from Timestamps import parse_timestamp
+
+
+def _published(article: Any) -> Optional[float]:
+    # Article caches its parsed publish date
+    if hasattr(article, "timestamp"):
+        return article.timestamp("publish_date")
+    return parse_timestamp(article.publish_date)
+
+
+def oldest_first(article: Any, order: int) -> tuple:
+    """
+    Default representative key: the earliest published article, then the earliest added
+    """
+    published = _published(article)
+    return (published is None, published or 0.0, order)
+
+
+class ClusterStats:
+    """
+    Aggregates of one cluster: members, representative article, time span, sources and languages.
+    """
+
+    def __init__(self, cluster: Any) -> None:
+        self.cluster = cluster
+        self.members: Dict[int, Any] = {}
+        self.representative: Optional[Any] = None
+        self.first_published: Optional[float] = None
+        self.last_published: Optional[float] = None
+        self.sources: Counter = Counter()
+        self.languages: Counter = Counter()
+
+    @property
+    def size(self) -> int:
+        return len(self.members)
+
+    @property
+    def centroid(self) -> Optional[int]:
+        return self.representative.doc_id if self.representative is not None else None
+
+    def articles(self) -> List[Any]:
+        return list(self.members.values())
+
+    def to_dict(self) -> Dict:
+        return {
+            "cluster": self.cluster,
+            "size": self.size,
+            "representative": (
+                self.representative.id if self.representative is not None else None
+            ),
+            "centroid": self.centroid,
+            "first_published": self.first_published,
+            "last_published": self.last_published,
+            "sources": dict(self.sources),
+            "languages": dict(self.languages),
+        }
+
+
+class ClusterRegistry:
+    """
+    Cluster membership and per-cluster stats kept current as articles come and go.
+
+    Attach it to an ArticleCollection (collection.clusters() does it) and every
+    add, remove or reassignment updates only the clusters involved. Adding is
+    O(1); removing the representative or an article at the edge of a time span
+    rescans that one cluster. Clusters touched since the last pop_changes()
+    call are reported so views can be refreshed incrementally.
+
+    The representative of a cluster is the article with the smallest
+    representative_key(article, insertion order), by default the oldest
+    published one, and its doc_id is the cluster centroid.
+    """
+
+    def __init__(
+        self, representative_key: Callable[[Any, int], Any] = oldest_first
+    ) -> None:
+        self.representative_key = representative_key
+        self.clear()
+
+    def clear(self) -> None:
+        self._clusters: Dict[Any, ClusterStats] = {}
+        self._entries: Dict[int, tuple] = {}
+        self._order = 0
+        self._changed: Set[Any] = set()
+
+    def rebuild(self, articles: Iterable[Any]) -> None:
+        changed = set(self._clusters)
+        self.clear()
+        for article in articles:
+            self.add(article)
+        self._changed |= changed
+
+    def add(self, article: Any) -> None:
+        key = id(article)
+        entry = self._entries.get(key)
+        if entry is not None:
+            # a refreshed article keeps its insertion order
+            order = entry[5]
+            self.discard(article)
+        else:
+            order = self._order
+            self._order += 1
+        cluster = article.cluster
+        published = _published(article)
+        rank = self.representative_key(article, order)
+        # the counted source and language are kept, fields may change before discard
+        self._entries[key] = (
+            cluster,
+            published,
+            rank,
+            article.source_url,
+            article.language,
+            order,
+        )
+        stats = self._clusters.get(cluster)
+        if stats is None:
+            stats = self._clusters[cluster] = ClusterStats(cluster)
+        stats.members[key] = article
+        stats.sources[article.source_url] += 1
+        stats.languages[article.language] += 1
+        if published is not None:
+            if stats.first_published is None or published < stats.first_published:
+                stats.first_published = published
+            if stats.last_published is None or published > stats.last_published:
+                stats.last_published = published
+        if (
+            stats.representative is None
+            or rank < self._entries[id(stats.representative)][2]
+        ):
+            stats.representative = article
+        self._changed.add(cluster)
+
+    def refresh_article(self, article: Any) -> None:
+        # ArticleCollection.refresh_article hook, add() keeps the insertion order
+        self.add(article)
+
+    def discard(self, article: Any) -> None:
+        key = id(article)
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        cluster, published, _, source_url, language, _ = entry
+        stats = self._clusters[cluster]
+        del stats.members[key]
+        self._changed.add(cluster)
+        if not stats.members:
+            del self._clusters[cluster]
+            return
+        for counter, value in (
+            (stats.sources, source_url),
+            (stats.languages, language),
+        ):
+            counter[value] -= 1
+            if counter[value] <= 0:
+                del counter[value]
+        if stats.representative is article or published in (
+            stats.first_published,
+            stats.last_published,
+        ):
+            self._rescan(stats)
+
+    def _rescan(self, stats: ClusterStats) -> None:
+        entries = [self._entries[key] for key in stats.members]
+        published = [entry[1] for entry in entries if entry[1] is not None]
+        stats.first_published = min(published, default=None)
+        stats.last_published = max(published, default=None)
+        best = min(stats.members, key=lambda key: self._entries[key][2])
+        stats.representative = stats.members[best]
+
+    def get(self, cluster: Any) -> Optional[ClusterStats]:
+        return self._clusters.get(cluster)
+
+    def cluster_ids(self) -> List[Any]:
+        return list(self._clusters)
+
+    def sizes(self) -> Dict[Any, int]:
+        return {cluster: stats.size for cluster, stats in self._clusters.items()}
+
+    def groups(self) -> Dict[Any, List[Any]]:
+        return {cluster: stats.articles() for cluster, stats in self._clusters.items()}
+
+    def __len__(self) -> int:
+        return len(self._clusters)
+
+    def __iter__(self):
+        return iter(self._clusters.values())
+
+    def pop_changes(self) -> Set[Any]:
+        """
+        Returns the clusters added, modified or emptied since the previous call
+        """
+        changed, self._changed = self._changed, set()
+        return changed
+
+    def write_centroids(self, clusters: Optional[Iterable[Any]] = None) -> int:
+        """
+        Stores the centroid of each cluster in the cluster_centroid of its members
+        :param clusters: clusters to update, all of them when omitted
+        :return: number of articles updated
+        """
+        updated = 0
+        for cluster in self._clusters if clusters is None else clusters:
+            stats = self._clusters.get(cluster)
+            if stats is None:
+                continue
+            centroid = stats.centroid
+            for article in stats.members.values():
+                if article.cluster_centroid != centroid:
+                    article.cluster_centroid = centroid
+                    updated += 1
+        return updated
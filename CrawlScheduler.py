@@ -0,0 +1,315 @@
+# --------------------------------
+# CrawlScheduler Class
+# --------------------------------
+import heapq
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+import Logger
+from Outlets import OutletsHandler, OutletsSource
+
+logger = Logger.get_logger(__name__)
+
+
+class OutletState(BaseModel):
+    """
+    Crawl history of one outlet; rate, latency and error_rate are moving averages
+    """
+
+    key: str
+    interval: float
+    next_due: float = 0.0
+    last_crawled: Optional[float] = None
+    crawls: int = 0
+    errors: int = 0
+    consecutive_errors: int = 0
+    articles: int = 0
+    rate: float = 0.0
+    latency: float = 0.0
+    error_rate: float = 0.0
+
+
+class CrawlScheduler:
+    """
+    Decides which outlets of an OutletsHandler to crawl, and when.
+
+    Every crawl result updates the outlet's moving averages of new articles
+    per second, crawl latency and error rate. The polling interval follows
+    from the rate: the time it takes the outlet to publish target_yield new
+    articles, within [min_interval, max_interval]. An outlet that yields
+    nothing or fails backs off by backoff per crawl, consecutive errors
+    compounding. Outlets wait in a heap ordered by due time; the due ones are
+    ranked by expected new articles per second of crawl and at most budget
+    crawls are started per budget_window seconds. State survives restarts
+    through to_json() and from_json().
+    """
+
+    def __init__(
+        self,
+        outlets: OutletsHandler,
+        budget: Optional[int] = None,
+        budget_window: float = 3600,
+        min_interval: float = 300,
+        max_interval: float = 86400,
+        initial_interval: float = 3600,
+        target_yield: float = 5,
+        backoff: float = 2.0,
+        alpha: float = 0.3,
+    ) -> None:
+        self.outlets = outlets
+        self.budget = budget
+        self.budget_window = budget_window
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = initial_interval
+        self.target_yield = target_yield
+        self.backoff = backoff
+        self.alpha = alpha
+        self.states: Dict[str, OutletState] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._started: deque = deque()
+        self._lock = threading.Lock()
+        self.sync()
+
+    def sync(self) -> None:
+        """
+        Picks up outlets added to or removed from the handler, new ones are due at once
+        """
+        with self._lock:
+            for key in list(self.states):
+                if key not in self.outlets:
+                    del self.states[key]
+            for key in self.outlets.news_outlets:
+                if key not in self.states:
+                    self.states[key] = OutletState(
+                        key=key, interval=self.initial_interval
+                    )
+            self._heap = [(state.next_due, key) for key, state in self.states.items()]
+            heapq.heapify(self._heap)
+
+    def _average(self, current: float, value: float, first: bool) -> float:
+        return value if first else current + self.alpha * (value - current)
+
+    def _clamp(self, interval: float) -> float:
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def record(
+        self,
+        key: str,
+        new_articles: int,
+        latency: float,
+        error: bool = False,
+        now: Optional[float] = None,
+    ) -> Optional[OutletState]:
+        """
+        Updates the history of an outlet after a crawl and schedules its next one
+        :param new_articles: articles not seen before
+        :param latency: seconds the crawl took
+        :param error: the crawl failed
+        :return: the outlet state, None for an outlet no longer registered
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            state = self.states.get(key)
+            if state is None:
+                return None
+            first = state.crawls == 0
+            elapsed = (
+                self.initial_interval
+                if state.last_crawled is None
+                else max(now - state.last_crawled, 1.0)
+            )
+            state.crawls += 1
+            state.last_crawled = now
+            state.latency = self._average(state.latency, latency, first)
+            state.error_rate = self._average(state.error_rate, float(error), first)
+            if error:
+                state.errors += 1
+                state.consecutive_errors += 1
+                # state.interval already holds the earlier backoffs
+                interval = state.interval * self.backoff
+            else:
+                state.consecutive_errors = 0
+                state.articles += new_articles
+                state.rate = self._average(state.rate, new_articles / elapsed, first)
+                if new_articles and state.rate > 0:
+                    interval = self.target_yield / state.rate
+                else:
+                    interval = state.interval * self.backoff
+            state.interval = self._clamp(interval)
+            state.next_due = now + state.interval
+            heapq.heappush(self._heap, (state.next_due, key))
+            return state
+
+    def priority(self, state: OutletState, now: Optional[float] = None) -> float:
+        """
+        Expected new articles per second of crawling, outlets never crawled first
+        """
+        if state.last_crawled is None:
+            return float("inf")
+        now = time.time() if now is None else now
+        expected = state.rate * (now - state.last_crawled) * (1 - state.error_rate)
+        return expected / max(state.latency, 0.1)
+
+    def available(self, now: Optional[float] = None) -> Optional[int]:
+        """
+        Crawls left in the current budget window, None without a budget
+        """
+        if self.budget is None:
+            return None
+        now = time.time() if now is None else now
+        while self._started and self._started[0] <= now - self.budget_window:
+            self._started.popleft()
+        return max(self.budget - len(self._started), 0)
+
+    def due(
+        self, now: Optional[float] = None, limit: Optional[int] = None
+    ) -> List[OutletsSource]:
+        """
+        Takes the outlets due for a crawl, best priority first, within the budget
+        :param limit: maximum number of outlets for this round
+        :return: outlets to crawl; each one is rescheduled by record()
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            ready = []
+            while self._heap and self._heap[0][0] <= now:
+                next_due, key = heapq.heappop(self._heap)
+                state = self.states.get(key)
+                # stale heap entries of rescheduled or removed outlets are skipped
+                if state is not None and state.next_due == next_due:
+                    ready.append(state)
+            ready.sort(key=lambda state: self.priority(state, now), reverse=True)
+            allowed = self.available(now)
+            for bound in (limit, allowed):
+                if bound is not None:
+                    ready, waiting = ready[:bound], ready[bound:]
+                    for state in waiting:
+                        heapq.heappush(self._heap, (state.next_due, state.key))
+            for state in ready:
+                # in flight: out of the heap until record() reschedules it
+                state.next_due = float("inf")
+                if self.budget is not None:
+                    self._started.append(now)
+        return [self.outlets.get_outlet(state.key) for state in ready]
+
+    def wait_time(self, now: Optional[float] = None) -> Optional[float]:
+        """
+        Seconds until an outlet is due and the budget allows a crawl, None when nothing is scheduled
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            while self._heap:
+                next_due, key = self._heap[0]
+                state = self.states.get(key)
+                if state is not None and state.next_due == next_due:
+                    break
+                heapq.heappop(self._heap)
+            if not self._heap:
+                return None
+            wait = max(self._heap[0][0] - now, 0.0)
+            if self.available(now) == 0:
+                wait = max(wait, self._started[0] + self.budget_window - now)
+            return wait
+
+    def crawl(
+        self,
+        crawler,
+        now: Optional[float] = None,
+        limit: Optional[int] = None,
+        mark_seen: bool = False,
+    ) -> Iterator[Tuple[OutletsSource, object]]:
+        """
+        Crawls the due outlets once on the crawler's outlet pool, recording every result
+        :param crawler: NewsPaper or NewsPaperCrawler, its seen store decides what is new
+        :param mark_seen: record the articles handed out in the seen store before
+            they are downloaded, so later rounds skip them even if a download
+            fails; by default the download stage records each article it
+            fetched (ArticleProcessor.download_stage(newspaper=crawler))
+        :return: generator of (outlet, paper) tuples as crawl() of the crawler
+        """
+        seen_store = getattr(crawler, "seen_store", None) if mark_seen else None
+        outlets = self.due(now, limit)
+        if not outlets:
+            return
+
+        def timed_build(outlet):
+            start = time.perf_counter()
+            try:
+                return crawler.build(outlet), time.perf_counter() - start
+            except Exception as e:
+                logger.error(f"Could not crawl {outlet.attributes.url}, reason: {e}")
+                return None, time.perf_counter() - start
+
+        workers = getattr(crawler, "max_outlets", 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(timed_build, outlet): outlet for outlet in outlets}
+            for future in as_completed(futures):
+                outlet = futures[future]
+                paper, latency = future.result()
+                new_articles = len(paper.articles) if paper is not None else 0
+                if seen_store is not None and new_articles:
+                    seen_store.mark_fetched(paper.articles)
+                self.record(
+                    outlet.attributes.name,
+                    new_articles,
+                    latency,
+                    error=paper is None,
+                    now=now,
+                )
+                yield outlet, paper
+
+    def run(
+        self,
+        crawler,
+        rounds: Optional[int] = None,
+        stop: Optional[threading.Event] = None,
+        mark_seen: bool = False,
+    ) -> Iterator[Tuple[OutletsSource, object]]:
+        """
+        Crawls round after round, sleeping until the next outlet is due
+        :param rounds: number of rounds, forever by default
+        :param stop: event ending the loop between rounds
+        :param mark_seen: see crawl
+        """
+        stop = stop or threading.Event()
+        done = 0
+        while not stop.is_set() and (rounds is None or done < rounds):
+            self.sync()
+            wait = self.wait_time()
+            if wait is None:
+                return
+            if wait > 0 and stop.wait(wait):
+                return
+            yield from self.crawl(crawler, mark_seen=mark_seen)
+            done += 1
+
+    def stats(self) -> List[Dict]:
+        return [state.model_dump() for state in self.states.values()]
+
+    def to_json(self) -> str:
+        stats = self.stats()
+        for state in stats:
+            if state["next_due"] == float("inf"):  # in flight, due again on load
+                state["next_due"] = None
+        return json.dumps(stats, allow_nan=False)
+
+    @classmethod
+    def from_json(
+        cls, json_str: str, outlets: OutletsHandler, **options
+    ) -> "CrawlScheduler":
+        scheduler = cls(outlets, **options)
+        for data in json.loads(json_str):
+            if data["key"] in scheduler.states:
+                if data.get("next_due") is None:  # saved while in flight
+                    data["next_due"] = 0.0
+                state = OutletState(**data)
+                scheduler.states[state.key] = state
+        scheduler.sync()
+        return scheduler
@@ -0,0 +1,214 @@
+# --------------------------------
+# DocumentGraph Class
+# --------------------------------
+import gzip
+import json
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List
+
+from BERTDocument import BertDocument
+
+LINK_KINDS = ("similars", "related")
+
+
+class DocumentNode:
+    """
+    View of a document of a DocumentGraph. Fields are read from the stored
+    BertDocument; similars and related are resolved through the graph only
+    when accessed.
+    """
+
+    __slots__ = ("graph", "uid")
+
+    def __init__(self, graph: "DocumentGraph", uid: str) -> None:
+        self.graph = graph
+        self.uid = uid
+
+    @property
+    def document(self) -> BertDocument:
+        return self.graph.documents[self.uid]
+
+    @property
+    def similars(self) -> List["DocumentNode"]:
+        return self.graph.neighbours(self.uid, "similars")
+
+    @property
+    def related(self) -> List["DocumentNode"]:
+        return self.graph.neighbours(self.uid, "related")
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.graph.documents[self.uid], name)
+
+    def __repr__(self) -> str:
+        return f"DocumentNode(uid={self.uid})"
+
+
+class DocumentGraph:
+    """
+    Shared store of BertDocument objects linked by uid.
+
+    Every document is stored once with empty similars/related; its links live
+    in per-kind adjacency lists of uids, with reverse sets so a removal only
+    touches the links of the removed document. Nested documents are flattened
+    into the store when added, cycles included. Neighbours are resolved lazily
+    through DocumentNode views, traversals run over the adjacency lists, and
+    save() writes each document exactly once.
+    """
+
+    def __init__(self) -> None:
+        self.documents: Dict[str, BertDocument] = {}
+        self.links: Dict[str, Dict[str, List[str]]] = {kind: {} for kind in LINK_KINDS}
+        self._incoming: Dict[str, Dict[str, set]] = {kind: {} for kind in LINK_KINDS}
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def __contains__(self, uid: str) -> bool:
+        return uid in self.documents
+
+    def add(self, document: BertDocument) -> DocumentNode:
+        """
+        Adds a document and, recursively, the documents nested in its similars and related
+        :param document: BertDocument, possibly holding nested neighbours
+        :return: node of the document
+        """
+        pending = deque([document])
+        seen = set()
+        while pending:
+            current = pending.popleft()
+            if id(current) in seen:
+                continue
+            seen.add(id(current))
+            self.documents[current.uid] = current.model_copy(
+                update={kind: None for kind in LINK_KINDS}
+            )
+            for kind in LINK_KINDS:
+                neighbours = getattr(current, kind) or []
+                if neighbours:
+                    for neighbour in neighbours:
+                        self.link(current.uid, neighbour.uid, kind)
+                    pending.extend(neighbours)
+        return DocumentNode(self, document.uid)
+
+    def add_many(self, documents: Iterable[BertDocument]) -> None:
+        for document in documents:
+            self.add(document)
+
+    def remove(self, uid: str) -> None:
+        """
+        Removes a document and every link to or from it
+        """
+        self.documents.pop(uid, None)
+        for kind in LINK_KINDS:
+            for other in self.links[kind].pop(uid, ()):
+                self._incoming[kind].get(other, set()).discard(uid)
+            for source in self._incoming[kind].pop(uid, ()):
+                targets = self.links[kind].get(source)
+                if targets and uid in targets:
+                    targets.remove(uid)
+
+    def link(self, uid: str, other: str, kind: str = "related") -> None:
+        targets = self.links[kind].setdefault(uid, [])
+        if other not in targets:
+            targets.append(other)
+            self._incoming[kind].setdefault(other, set()).add(uid)
+
+    def unlink(self, uid: str, other: str, kind: str = "related") -> None:
+        targets = self.links[kind].get(uid)
+        if targets and other in targets:
+            targets.remove(other)
+            self._incoming[kind].get(other, set()).discard(uid)
+
+    def node(self, uid: str) -> DocumentNode:
+        if uid not in self.documents:
+            raise KeyError(uid)
+        return DocumentNode(self, uid)
+
+    def neighbour_uids(self, uid: str, kind: str = "related") -> List[str]:
+        return list(self.links[kind].get(uid, ()))
+
+    def neighbours(self, uid: str, kind: str = "related") -> List[DocumentNode]:
+        return [
+            DocumentNode(self, other)
+            for other in self.links[kind].get(uid, ())
+            if other in self.documents
+        ]
+
+    def k_hop(
+        self, uid: str, k: int = 2, kinds: Iterable[str] = ("related",)
+    ) -> Dict[str, int]:
+        """
+        Breadth-first traversal over the adjacency lists
+        :param uid: start document
+        :param k: maximum number of hops
+        :param kinds: link kinds to follow
+        :return: uid -> hop distance, the start document excluded
+        """
+        kinds = tuple(kinds)
+        distances = {uid: 0}
+        frontier = [uid]
+        for hop in range(1, k + 1):
+            following = []
+            for current in frontier:
+                for kind in kinds:
+                    for other in self.links[kind].get(current, ()):
+                        if other not in distances:
+                            distances[other] = hop
+                            following.append(other)
+            if not following:
+                break
+            frontier = following
+        del distances[uid]
+        return distances
+
+    def nested(self, uid: str, depth: int = 1) -> BertDocument:
+        """
+        Rebuilds the nested BertDocument representation of a document down to depth levels
+        """
+        document = self.documents[uid]
+        if depth <= 0:
+            return document
+        return document.model_copy(
+            update={
+                kind: [
+                    self.nested(other, depth - 1)
+                    for other in self.links[kind].get(uid, ())
+                    if other in self.documents
+                ]
+                for kind in LINK_KINDS
+            }
+        )
+
+    def iter_records(self) -> Iterator[Dict]:
+        for uid, document in self.documents.items():
+            record = document.model_dump(mode="json", exclude=set(LINK_KINDS))
+            for kind in LINK_KINDS:
+                record[kind] = self.links[kind].get(uid, [])
+            yield record
+
+    def save(self, file_path: str) -> None:
+        """
+        Writes one JSON line per document, links given as uid lists (gzip compressed when the path ends with .gz)
+        """
+        opener = gzip.open if str(file_path).endswith(".gz") else open
+        with opener(file_path, "wt", encoding="utf-8") as file:
+            for record in self.iter_records():
+                file.write(json.dumps(record))
+                file.write("\n")
+
+    @classmethod
+    def load(cls, file_path: str) -> "DocumentGraph":
+        graph = cls()
+        opener = gzip.open if str(file_path).endswith(".gz") else open
+        with opener(file_path, "rt", encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                links = {kind: record.pop(kind, None) or [] for kind in LINK_KINDS}
+                document = BertDocument(**record, similars=None, related=None)
+                graph.documents[document.uid] = document
+                for kind, targets in links.items():
+                    for other in targets:
+                        graph.link(document.uid, other, kind)
+        return graph
@@ -0,0 +1,294 @@
+# --------------------------------
+# EmbeddingStore Class
+# --------------------------------
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:  # optional dependency
+    raise ImportError(
+        "EmbeddingStore requires numpy, install the 'similarity' extra"
+    ) from e
+
+VECTORS_FILE = "vectors.npy"
+UIDS_FILE = "uids.json"
+IVF_FILE = "ivf.npz"
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class EmbeddingStore:
+    """
+    CPU-only embedding store for BertDocument, keyed by uid.
+
+    Vectors are L2 normalized on insert and kept in one contiguous float32
+    matrix that grows by doubling, so cosine similarity is a matrix product
+    and a batch of queries is scored at once, in blocks of block_size rows to
+    bound memory. Removing a document moves the last row into its slot.
+
+    build_ivf() switches searches to an approximate inverted-file mode:
+    vectors are clustered with spherical k-means and a query only scores the
+    rows of its nprobe closest lists, gathered from a row index per list.
+    Inserts after that are assigned to their closest list, so the index stays
+    usable without rebuilding; the row index is regrouped on the next search.
+
+    save() writes a directory that load() maps back with numpy mmap.
+    """
+
+    def __init__(self, dim: int, capacity: int = 1024, block_size: int = 65536):
+        self.dim = dim
+        self.block_size = block_size
+        self._vectors = np.empty((capacity, dim), dtype=np.float32)
+        self._uids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._centroids: Optional[np.ndarray] = None
+        self._assign = np.empty(capacity, dtype=np.int32)
+        self._list_rows: Optional[np.ndarray] = None
+        self._list_offsets: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._uids)
+
+    def __contains__(self, uid: str) -> bool:
+        return uid in self._rows
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._vectors[: len(self._uids)]
+
+    @property
+    def uids(self) -> List[str]:
+        return list(self._uids)
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self._vectors)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity = max(capacity * 2, 1)
+        vectors = np.empty((capacity, self.dim), dtype=np.float32)
+        vectors[: len(self._uids)] = self.vectors
+        assign = np.empty(capacity, dtype=np.int32)
+        assign[: len(self._uids)] = self._assign[: len(self._uids)]
+        self._vectors = vectors
+        self._assign = assign
+
+    def add(self, uid: str, vector: Sequence[float]) -> None:
+        self.add_many([uid], np.asarray(vector, dtype=np.float32)[None, :])
+
+    def add_document(self, document, vector: Sequence[float]) -> None:
+        self.add(document.uid, vector)
+
+    def add_many(self, uids: Sequence[str], vectors: np.ndarray) -> None:
+        """
+        Inserts or replaces many vectors at once
+        :param uids: BertDocument uids
+        :param vectors: (len(uids), dim) array
+        """
+        vectors = _normalize(vectors)
+        if vectors.shape != (len(uids), self.dim):
+            raise ValueError(f"Expected vectors of shape ({len(uids)}, {self.dim})")
+        rows = []
+        for uid in uids:
+            row = self._rows.get(uid)
+            if row is None:
+                row = len(self._uids)
+                self._reserve(row + 1)
+                self._rows[uid] = row
+                self._uids.append(uid)
+            rows.append(row)
+        rows = np.asarray(rows, dtype=np.int64)
+        self._vectors[rows] = vectors
+        if self._centroids is not None:
+            self._assign[rows] = self._nearest_lists(vectors, 1)[:, 0]
+            self._list_rows = None
+
+    def get(self, uid: str) -> Optional[np.ndarray]:
+        row = self._rows.get(uid)
+        return None if row is None else self._vectors[row].copy()
+
+    def remove(self, uid: str) -> bool:
+        row = self._rows.pop(uid, None)
+        if row is None:
+            return False
+        last = len(self._uids) - 1
+        if row != last:
+            moved = self._uids[last]
+            self._vectors[row] = self._vectors[last]
+            self._assign[row] = self._assign[last]
+            self._uids[row] = moved
+            self._rows[moved] = row
+        self._uids.pop()
+        self._list_rows = None
+        return True
+
+    def _nearest_lists(self, vectors: np.ndarray, count: int) -> np.ndarray:
+        scores = vectors @ self._centroids.T
+        count = min(count, len(self._centroids))
+        top = np.argpartition(-scores, count - 1, axis=1)[:, :count]
+        order = np.take_along_axis(scores, top, axis=1).argsort(axis=1)[:, ::-1]
+        return np.take_along_axis(top, order, axis=1)
+
+    def build_ivf(
+        self, lists: Optional[int] = None, iterations: int = 10, seed: int = 0
+    ) -> None:
+        """
+        Clusters the stored vectors into inverted lists for approximate search
+        :param lists: number of lists, about sqrt(len) by default
+        :param iterations: spherical k-means iterations
+        """
+        vectors = self.vectors
+        if not len(vectors):
+            raise ValueError("Cannot build an IVF index on an empty store")
+        lists = min(lists or max(1, int(np.sqrt(len(vectors)))), len(vectors))
+        generator = np.random.default_rng(seed)
+        centroids = vectors[generator.choice(len(vectors), lists, replace=False)]
+        for _ in range(iterations):
+            assign = np.empty(len(vectors), dtype=np.int32)
+            for start in range(0, len(vectors), self.block_size):
+                block = vectors[start : start + self.block_size]
+                assign[start : start + len(block)] = (block @ centroids.T).argmax(1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, vectors)
+            empty = np.bincount(assign, minlength=lists) == 0
+            sums[empty] = centroids[empty]
+            centroids = _normalize(sums)
+        self._centroids = centroids
+        self._assign[: len(vectors)] = assign
+        self._group_lists()
+
+    def _group_lists(self) -> None:
+        # rows sorted by list; the rows of list i are rows[offsets[i] : offsets[i + 1]]
+        assign = self._assign[: len(self._uids)]
+        self._list_rows = np.argsort(assign, kind="stable")
+        self._list_offsets = np.zeros(len(self._centroids) + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(assign, minlength=len(self._centroids)),
+            out=self._list_offsets[1:],
+        )
+
+    def drop_ivf(self) -> None:
+        self._centroids = None
+        self._list_rows = self._list_offsets = None
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int = 10,
+        nprobe: Optional[int] = None,
+        exclude: Optional[Iterable[Optional[str]]] = None,
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Cosine top-k search for a batch of query vectors
+        :param queries: (n, dim) or (dim,) array
+        :param k: number of neighbours per query
+        :param nprobe: lists scanned per query in IVF mode, exact search when None or without IVF
+        :param exclude: one uid per query to leave out of its results, e.g. the query document itself
+        :return: (uid, score) lists, best first
+        """
+        queries = _normalize(np.atleast_2d(queries))
+        exclude = list(exclude) if exclude is not None else [None] * len(queries)
+        if nprobe and self._centroids is not None:
+            return self._search_ivf(queries, k, nprobe, exclude)
+        size = len(self._uids)
+        fetch = min(k + 1, size)
+        if not fetch:
+            return [[] for _ in queries]
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        for start in range(0, size, self.block_size):
+            block = self._vectors[start : min(start + self.block_size, size)]
+            scores = queries @ block.T
+            rows = np.broadcast_to(np.arange(start, start + len(block)), scores.shape)
+            scores = np.concatenate([best_scores, scores], axis=1)
+            rows = np.concatenate([best_rows, rows], axis=1)
+            keep = min(fetch, scores.shape[1])
+            top = np.argpartition(-scores, keep - 1, axis=1)[:, :keep]
+            best_scores = np.take_along_axis(scores, top, axis=1)
+            best_rows = np.take_along_axis(rows, top, axis=1)
+        return [
+            self._ranked(rows, scores, k, skip)
+            for rows, scores, skip in zip(best_rows, best_scores, exclude)
+        ]
+
+    def _search_ivf(self, queries, k, nprobe, exclude):
+        probes = self._nearest_lists(queries, nprobe)
+        if self._list_rows is None:
+            self._group_lists()
+        list_rows, offsets = self._list_rows, self._list_offsets
+        results = []
+        for query, lists, skip in zip(queries, probes, exclude):
+            rows = np.concatenate(
+                [list_rows[offsets[i] : offsets[i + 1]] for i in lists]
+            )
+            scores = self._vectors[rows] @ query
+            results.append(self._ranked(rows, scores, k, skip))
+        return results
+
+    def _ranked(self, rows, scores, k, skip) -> List[Tuple[str, float]]:
+        fetch = min(k + 1, len(rows))
+        if not fetch:
+            return []
+        top = np.argpartition(-scores, fetch - 1)[:fetch]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        ranked = [
+            (self._uids[rows[position]], float(scores[position]))
+            for position in top
+            if self._uids[rows[position]] != skip
+        ]
+        return ranked[:k]
+
+    def search_documents(
+        self, uids: Sequence[str], k: int = 10, nprobe: Optional[int] = None
+    ) -> Dict[str, List[Tuple[str, float]]]:
+        """
+        Nearest neighbours of stored documents, leaving each document out of its own results
+        """
+        queries = self._vectors[[self._rows[uid] for uid in uids]]
+        return dict(zip(uids, self.search(queries, k, nprobe, exclude=uids)))
+
+    def save(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, VECTORS_FILE), self.vectors)
+        with open(os.path.join(directory, UIDS_FILE), "w") as file:
+            json.dump(self._uids, file)
+        ivf_path = os.path.join(directory, IVF_FILE)
+        if self._centroids is not None:
+            np.savez(
+                ivf_path,
+                centroids=self._centroids,
+                assign=self._assign[: len(self._uids)],
+            )
+        elif os.path.exists(ivf_path):
+            os.remove(ivf_path)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "EmbeddingStore":
+        """
+        Loads a saved store. With mmap the vectors are mapped copy-on-write:
+        pages are read on demand and changes stay in memory until saved again.
+        """
+        vectors = np.load(
+            os.path.join(directory, VECTORS_FILE), mmap_mode="c" if mmap else None
+        )
+        with open(os.path.join(directory, UIDS_FILE)) as file:
+            uids = json.load(file)
+        store = cls(vectors.shape[1], capacity=0)
+        store._vectors = vectors
+        store._uids = uids
+        store._rows = {uid: row for row, uid in enumerate(uids)}
+        store._assign = np.zeros(len(uids), dtype=np.int32)
+        ivf_path = os.path.join(directory, IVF_FILE)
+        if os.path.exists(ivf_path):
+            with np.load(ivf_path) as ivf:
+                store._centroids = ivf["centroids"]
+                store._assign = ivf["assign"].copy()
+            store._group_lists()
+        return store
@@ -1,14 +1,39 @@
 import json
-from typing import List, Dict, Optional
-from pydantic import BaseModel, Field
-
-__name__ = "Entity Model Class"
+from typing import ClassVar, Iterable, List, Dict, Optional
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class Entity(BaseModel):
     type: Optional[str]
     name: Optional[str]
     links: Optional[List[str]]
+    _key: Optional[tuple] = PrivateAttr(default=None)
+    # bumped on every field assignment, tells collections their keys may be stale
+    _generation: ClassVar[int] = 0
+
+    def key(self) -> tuple:
+        """
+        Returns the identity of the entity, computed once and cached until a field is reassigned.
+        Empty values are equal, like in to_dict: None, "" and [] make the same key.
+        Links mutated in place are not detected, reassign the list instead.
+        """
+        private = self.__pydantic_private__
+        key = private.get("_key")
+        if key is None:
+            key = (self.type or "", self.name or "", tuple(self.links or ()))
+            private["_key"] = key
+        return key
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in self.model_fields:
+            self.__pydantic_private__["_key"] = None
+            Entity._generation += 1
+
+    def __eq__(self, other):
+        if not isinstance(other, Entity):
+            return NotImplemented
+        return self.key() == other.key()
 
     def to_dict(self) -> Dict:
         return {
@@ -36,7 +61,7 @@ class Entity(BaseModel):
             return "{}"
 
     def __hash__(self):
-        return hash((self.type, self.name, tuple(self.links)))
+        return hash(self.key())
 
     def __repr__(self):
         return f"Entity(type={self.type}, name={self.name}, links={self.links})"
@@ -53,6 +78,29 @@ class EntityEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
+class _EntityList(list):
+    # list of an EntitiesCollection, flags any change its key set cannot follow;
+    # appends only grow the length and are picked up from it
+    changed = False
+
+    def _changed(method):
+        def wrapper(self, *args, **kwargs):
+            self.changed = True
+            return method(self, *args, **kwargs)
+
+        return wrapper
+
+    __setitem__ = _changed(list.__setitem__)
+    __delitem__ = _changed(list.__delitem__)
+    __iadd__ = _changed(list.__iadd__)
+    extend = _changed(list.extend)
+    insert = _changed(list.insert)
+    pop = _changed(list.pop)
+    remove = _changed(list.remove)
+    clear = _changed(list.clear)
+    del _changed
+
+
 class EntitiesCollection(BaseModel):
     """
     Author: Julian Delarosa (juliandelarosa@icloud.com)
@@ -76,6 +124,35 @@ class EntitiesCollection(BaseModel):
     """
 
     entities: List[Entity] = Field(default_factory=list)
+    _keys: set = PrivateAttr(default_factory=set)
+    _indexed: int = PrivateAttr(default=0)
+    _generation: int = PrivateAttr(default=-1)
+
+    def model_post_init(self, __context) -> None:
+        self._reindex()
+
+    def _reindex(self) -> None:
+        entities = self.entities
+        if type(entities) is not _EntityList:
+            entities = self.__dict__["entities"] = _EntityList(entities)
+        entities.changed = False
+        self._keys = {entity.key() for entity in entities}
+        self._indexed = len(entities)
+        self._generation = Entity._generation
+
+    def _ensure_keys(self) -> set:
+        # Entities appended to the list directly grow it past _indexed; a list
+        # assigned, changed other than by append, or an entity field reassigned
+        # since the last pass invalidate the keys as a whole
+        entities = self.entities
+        if (
+            self._indexed != len(entities)
+            or type(entities) is not _EntityList
+            or entities.changed
+            or self._generation != Entity._generation
+        ):
+            self._reindex()
+        return self._keys
 
     def add_entity(self, entity: Entity) -> None:
         """
@@ -87,8 +164,53 @@ class EntitiesCollection(BaseModel):
         Returns:
             None
         """
-        if entity not in self.entities:
+        keys = self._ensure_keys()
+        key = entity.key()
+        if key not in keys:
+            keys.add(key)
             self.entities.append(entity)
+            self._indexed += 1
+
+    def add_entities(self, entities: Iterable[Entity | Dict]) -> int:
+        """
+        Adds many entities in one linear pass, skipping the ones already in the
+        collection and keeping the insertion order of the others.
+
+        Parameters:
+            entities (Iterable[Entity | Dict]): Entities or dictionaries representing entities.
+
+        Returns:
+            int: The number of entities added.
+        """
+        keys = self._ensure_keys()
+        append = self.entities.append
+        added = 0
+        for entity in entities:
+            if not isinstance(entity, Entity):
+                entity = Entity(**entity)
+            key = entity.key()
+            if key not in keys:
+                keys.add(key)
+                append(entity)
+                added += 1
+        self._indexed += added
+        return added
+
+    def merge(self, other: "EntitiesCollection") -> "EntitiesCollection":
+        """
+        Adds the entities of another collection that are not in this one yet.
+
+        Parameters:
+            other (EntitiesCollection): The collection to merge in.
+
+        Returns:
+            EntitiesCollection: This collection.
+        """
+        self.add_entities(other)
+        return self
+
+    def __contains__(self, entity: Entity) -> bool:
+        return entity.key() in self._ensure_keys()
 
     def get_entities_by_type(self, entity_type: str) -> List[Entity]:
         """
@@ -121,14 +243,12 @@ class EntitiesCollection(BaseModel):
         seen = set()
         unique_entities = []
         for entity in self.entities:
-            entity_tuple = tuple(
-                (k, v if not isinstance(v, dict) else tuple(v.items()))
-                for k, v in entity.to_dict().items()
-            )
-            if entity_tuple not in seen:
-                seen.add(entity_tuple)
+            key = entity.key()
+            if key not in seen:
+                seen.add(key)
                 unique_entities.append(entity)
         self.entities = unique_entities
+        self._reindex()
 
     def __iter__(self):
         return iter(self.entities)
@@ -148,9 +268,7 @@ class EntitiesCollection(BaseModel):
             EntitiesCollection: An instance of the EntityCollection.
         """
         entity_collection = cls(entities=[])
-        for entity_data in entities_data:
-            entity = Entity(**entity_data)
-            entity_collection.add_entity(entity)
+        entity_collection.add_entities(entities_data)
         return entity_collection
 
     def to_json(self) -> str:
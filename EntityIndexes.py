@@ -0,0 +1,198 @@
+# --------------------------------
+# EntityIndex Class
+# --------------------------------
+import gzip
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+EntityKey = Tuple[str, str]
+
+
+def normalize_entity(entity_type: Optional[str], name: Optional[str]) -> EntityKey:
+    """
+    Returns the index key of an entity: upper case type and case folded name with collapsed whitespace
+    """
+    return (
+        (entity_type or "").strip().upper(),
+        " ".join((name or "").split()).casefold(),
+    )
+
+
+def iter_entities(entities) -> Iterator[Tuple[str, str, List[str]]]:
+    """
+    Yields (type, name, links) for Entity objects and entity dictionaries alike
+    """
+    for entity in entities or []:
+        if isinstance(entity, dict):
+            yield entity.get("type"), entity.get("name"), entity.get("links") or []
+        else:
+            yield entity.type, entity.name, entity.links or []
+
+
+class EntityIndex:
+    """
+    Inverted index from (entity type, normalized name) and from entity link to
+    the ids of the articles mentioning them.
+
+    Build it with rebuild() or attach it to an ArticleCollection with
+    collection.attach(index) so it follows every add and remove. Articles are
+    tracked by object identity, like ArticleIndex, together with the id they
+    were indexed under, so a changed id is unindexed correctly; articles
+    without an id are not indexed. Posting lists count the instances holding
+    an id, so distinct articles sharing one do not unindex each other.
+    Queries return sets of article ids; conjunctions are intersected starting
+    from the shortest posting list. The postings can be saved to and loaded
+    from a JSON file (gzip compressed when the path ends with .gz).
+    """
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        # postings map a term to {article id: number of instances}
+        self._entities: Dict[EntityKey, Dict[str, int]] = {}
+        self._links: Dict[str, Dict[str, int]] = {}
+        self._documents: Dict[int, Tuple[str, Set[EntityKey], Set[str]]] = {}
+        # entries of a loaded index, claimed by id by the first instance seen
+        self._unclaimed: Dict[str, Tuple[Set[EntityKey], Set[str]]] = {}
+
+    def rebuild(self, articles: Iterable[Any]) -> None:
+        self.clear()
+        for article in articles:
+            self.add(article)
+
+    def add(self, article: Any) -> None:
+        self.discard(article)
+        article_id = article.id
+        if article_id is None:
+            return
+        keys = set()
+        links = set()
+        for entity_type, name, entity_links in iter_entities(article.entities):
+            keys.add(normalize_entity(entity_type, name))
+            links.update(entity_links)
+        for postings, terms in ((self._entities, keys), (self._links, links)):
+            for term in terms:
+                ids = postings.setdefault(term, {})
+                ids[article_id] = ids.get(article_id, 0) + 1
+        self._documents[id(article)] = (article_id, keys, links)
+
+    def discard(self, article: Any) -> None:
+        document = self._documents.pop(id(article), None)
+        if document is None:
+            unclaimed = self._unclaimed.pop(article.id, None)
+            if unclaimed is None:
+                return
+            document = (article.id, *unclaimed)
+        article_id, keys, links = document
+        for postings, terms in ((self._entities, keys), (self._links, links)):
+            for term in terms:
+                ids = postings.get(term)
+                if ids is None or article_id not in ids:
+                    continue
+                if ids[article_id] > 1:
+                    ids[article_id] -= 1
+                    continue
+                del ids[article_id]
+                if not ids:
+                    del postings[term]
+
+    def articles_with(
+        self, entity_type: Optional[str], name: Optional[str]
+    ) -> Set[str]:
+        return set(self._entities.get(normalize_entity(entity_type, name), ()))
+
+    def articles_linking(self, link: str) -> Set[str]:
+        return set(self._links.get(link, ()))
+
+    def _postings(self, entities: Iterable[Any]) -> List[Dict[str, int]]:
+        postings = []
+        for entity in entities:
+            if isinstance(entity, tuple):
+                key = normalize_entity(*entity)
+            else:
+                key = normalize_entity(entity.type, entity.name)
+            postings.append(self._entities.get(key, {}))
+        return postings
+
+    def query(
+        self,
+        all_of: Iterable[Any] = (),
+        any_of: Iterable[Any] = (),
+        none_of: Iterable[Any] = (),
+    ) -> Set[str]:
+        """
+        Boolean query over entities given as (type, name) tuples or Entity objects
+        :param all_of: every one of these entities must be mentioned
+        :param any_of: at least one of these entities must be mentioned
+        :param none_of: none of these entities may be mentioned
+        :return: set of article ids
+        """
+        required = self._postings(all_of)
+        optional = self._postings(any_of)
+        if required:
+            required.sort(key=len)
+            result = set(required[0])
+            for postings in required[1:]:
+                if not result:
+                    break
+                result.intersection_update(postings)
+            if optional:
+                result.intersection_update(set().union(*optional))
+        elif optional:
+            result = set().union(*optional)
+        else:
+            result = set()
+        for postings in self._postings(none_of):
+            result.difference_update(postings)
+        return result
+
+    def query_all(self, *entities: Any) -> Set[str]:
+        return self.query(all_of=entities)
+
+    def query_any(self, *entities: Any) -> Set[str]:
+        return self.query(any_of=entities)
+
+    def entity_counts(self) -> Dict[EntityKey, int]:
+        return {key: len(ids) for key, ids in self._entities.items()}
+
+    def __len__(self) -> int:
+        return len(self._documents) + len(self._unclaimed)
+
+    def save(self, file_path: str) -> None:
+        data = {
+            "version": 1,
+            "entities": [
+                [entity_type, name, sorted(ids)]
+                for (entity_type, name), ids in self._entities.items()
+            ],
+            "links": {link: sorted(ids) for link, ids in self._links.items()},
+        }
+        opener = gzip.open if str(file_path).endswith(".gz") else open
+        with opener(file_path, "wt", encoding="utf-8") as file:
+            json.dump(data, file)
+
+    @classmethod
+    def load(cls, file_path: str) -> "EntityIndex":
+        """
+        Loads saved postings and derives the per-article entries from them, so
+        the index can follow a collection it was saved from through
+        collection.attach(index, rebuild=False).
+        """
+        opener = gzip.open if str(file_path).endswith(".gz") else open
+        with opener(file_path, "rt", encoding="utf-8") as file:
+            data = json.load(file)
+        index = cls()
+        index._entities = {
+            (entity_type, name): dict.fromkeys(ids, 1)
+            for entity_type, name, ids in data["entities"]
+        }
+        index._links = {
+            link: dict.fromkeys(ids, 1) for link, ids in data["links"].items()
+        }
+        for postings, slot in ((index._entities, 0), (index._links, 1)):
+            for term, ids in postings.items():
+                for article_id in ids:
+                    document = index._unclaimed.setdefault(article_id, (set(), set()))
+                    document[slot].add(term)
+        return index
@@ -0,0 +1,227 @@
+# --------------------------------
+# KeywordEngine Class
+# --------------------------------
+import re
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:  # optional dependency
+    raise ImportError(
+        "KeywordEngine requires numpy, install the 'similarity' extra"
+    ) from e
+
+TOKEN = re.compile(r"[^\W\d_]{3,}", re.UNICODE)
+STOPWORDS = frozenset("""
+    about above after again against all also and any are because been before
+    being below between both but can could did does doing down during each
+    few for from further had has have having her here hers herself him
+    himself his how into its itself just more most not now off once only
+    other our ours ourselves out over own said same she should some such
+    than that the their theirs them themselves then there these they this
+    those through too under until very was were what when where which while
+    who whom why will with would you your yours yourself yourselves
+    """.split())
+
+
+def count_terms(text: Optional[str], stopwords=STOPWORDS) -> Dict[str, int]:
+    """
+    Counts the lower case word terms of a text, skipping stopwords and terms shorter than three letters
+    """
+    if not text:
+        return {}
+    return dict(
+        Counter(term for term in TOKEN.findall(text.lower()) if term not in stopwords)
+    )
+
+
+def count_terms_many(texts: Sequence[Optional[str]], stopwords=STOPWORDS) -> List:
+    # worker entry point, one chunk of texts per call
+    return [count_terms(text, stopwords) for text in texts]
+
+
+class KeywordEngine:
+    """
+    Corpus-level TF-IDF keywords for articles.
+
+    The engine keeps a sparse term-document matrix, one row of (term id,
+    count) arrays per article id, and document frequencies updated as
+    articles are added or discarded; it follows ArticleCollection listeners.
+    Tokenizing a batch can be spread over a process pool. top_keywords
+    scores a whole batch in one vectorized pass with smoothed idf
+    log((1 + N) / (1 + df)) + 1 and term frequency normalized by document
+    length, and caches the ranked keywords on each article so
+    Article.get_top_keywords returns them without recomputing. Any change to
+    the corpus moves the idf of every term, so adding, discarding or
+    rebuilding drops the keywords cached so far.
+    """
+
+    def __init__(self, stopwords=STOPWORDS, top_k: int = 10) -> None:
+        self.stopwords = frozenset(stopwords)
+        self.top_k = top_k
+        self._cached: Dict[int, Tuple[Any, List[str]]] = {}
+        self.clear()
+
+    def clear(self) -> None:
+        self._invalidate()
+        self.vocabulary: Dict[str, int] = {}
+        self.terms: List[str] = []
+        self._df = np.zeros(1024, dtype=np.int64)
+        self._rows: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def _invalidate(self) -> None:
+        # drop cached rankings still set by this engine, they predate the change
+        for article, ranked in self._cached.values():
+            if article._top_keywords is ranked:
+                article.set_top_keywords(None)
+        self._cached.clear()
+
+    @staticmethod
+    def text_of(article: Any) -> str:
+        return " ".join(part for part in (article.title, article.text) if part)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _term_ids(self, terms: Iterable[str]) -> np.ndarray:
+        ids = []
+        for term in terms:
+            term_id = self.vocabulary.get(term)
+            if term_id is None:
+                term_id = self.vocabulary[term] = len(self.terms)
+                self.terms.append(term)
+            ids.append(term_id)
+        if len(self.terms) > len(self._df):
+            df = np.zeros(max(len(self.terms), len(self._df) * 2), dtype=np.int64)
+            df[: len(self._df)] = self._df
+            self._df = df
+        return np.asarray(ids, dtype=np.int64)
+
+    def _add_counts(self, article: Any, counts: Dict[str, int]) -> None:
+        article_id = article.id
+        if article_id is None:
+            return
+        self._invalidate()
+        if article_id in self._rows:
+            self.discard(article)
+        term_ids = self._term_ids(counts)
+        self._rows[article_id] = (
+            term_ids,
+            np.fromiter(counts.values(), dtype=np.float64, count=len(counts)),
+        )
+        self._df[term_ids] += 1
+
+    def rebuild(self, articles: Iterable[Any]) -> None:
+        self.clear()
+        self.add_many(articles, max_workers=1)
+
+    def add(self, article: Any) -> None:
+        self._add_counts(article, count_terms(self.text_of(article), self.stopwords))
+
+    def discard(self, article: Any) -> None:
+        row = self._rows.pop(article.id, None)
+        if row is not None:
+            self._invalidate()
+            self._df[row[0]] -= 1
+
+    def add_many(
+        self,
+        articles: Iterable[Any],
+        max_workers: Optional[int] = None,
+        chunksize: int = 64,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """
+        Adds a batch of articles, tokenizing their texts across a process pool
+        :param articles: articles to add
+        :param max_workers: pool size, 1 tokenizes in the calling process
+        :param chunksize: texts sent to a worker at once
+        :param executor: existing executor to reuse instead of creating a pool
+        """
+        articles = [article for article in articles if article.id is not None]
+        texts = [self.text_of(article) for article in articles]
+        chunks = [
+            texts[start : start + chunksize]
+            for start in range(0, len(texts), chunksize)
+        ]
+        if executor is None and (max_workers == 1 or len(chunks) <= 1):
+            counted = [count_terms_many(chunk, self.stopwords) for chunk in chunks]
+        else:
+            pool = executor or ProcessPoolExecutor(max_workers=max_workers)
+            try:
+                counted = list(
+                    pool.map(count_terms_many, chunks, [self.stopwords] * len(chunks))
+                )
+            finally:
+                if executor is None:
+                    pool.shutdown()
+        position = 0
+        for chunk in counted:
+            for counts in chunk:
+                self._add_counts(articles[position], counts)
+                position += 1
+
+    def idf(self) -> np.ndarray:
+        documents = len(self._rows)
+        df = self._df[: len(self.terms)]
+        return np.log((1.0 + documents) / (1.0 + df)) + 1.0
+
+    def scores(self, articles: Sequence[Any], k: Optional[int] = None) -> List:
+        """
+        Scores the indexed terms of a batch of articles in one vectorized pass
+        :param articles: indexed articles
+        :param k: keywords kept per article, top_k by default
+        :return: one list of (term, score) per article, best first
+        """
+        k = k or self.top_k
+        rows = [self._rows.get(article.id) for article in articles]
+        present = [row for row in rows if row is not None and len(row[0])]
+        if not present:
+            return [[] for _ in articles]
+        lengths = np.fromiter((len(row[0]) for row in present), dtype=np.int64)
+        term_ids = np.concatenate([row[0] for row in present])
+        counts = np.concatenate([row[1] for row in present])
+        document = np.repeat(np.arange(len(present)), lengths)
+        totals = np.add.reduceat(counts, np.concatenate(([0], np.cumsum(lengths)[:-1])))
+        weights = counts / totals[document] * self.idf()[term_ids]
+        order = np.lexsort((-weights, document))
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        rank = np.arange(len(order)) - np.repeat(starts, lengths)
+        keep = order[rank < k]
+        ranked = [[] for _ in present]
+        for position in keep.tolist():
+            ranked[document[position]].append(
+                (self.terms[term_ids[position]], float(weights[position]))
+            )
+        results = iter(ranked)
+        return [
+            next(results) if row is not None and len(row[0]) else [] for row in rows
+        ]
+
+    def top_keywords(self, articles: Sequence[Any], k: Optional[int] = None) -> List:
+        """
+        Ranks the keywords of a batch of articles and caches them on each article
+        :return: one list of keywords per article, best first
+        """
+        keywords = []
+        for article, scored in zip(articles, self.scores(articles, k)):
+            ranked = [term for term, _ in scored]
+            article.set_top_keywords(ranked)
+            self._cached[id(article)] = (article, ranked)
+            keywords.append(ranked)
+        return keywords
+
+    def refresh(self, articles: Iterable[Any], batch_size: int = 10000) -> None:
+        """
+        Recomputes the cached keywords of many articles, batch by batch
+        """
+        batch = []
+        for article in articles:
+            batch.append(article)
+            if len(batch) >= batch_size:
+                self.top_keywords(batch)
+                batch = []
+        if batch:
+            self.top_keywords(batch)
@@ -0,0 +1,55 @@
+# --------------------------------
+# Language detection helpers
+# --------------------------------
+import time
+from typing import List, Optional, Sequence, Tuple
+
+DEFAULT_LANGUAGE = "en"
+
+
+def detect_language(text: Optional[str]) -> Optional[str]:
+    """
+    Detects the language of a text.
+
+    :param text: text to inspect
+    :return: ISO 639-1 code, or None when the text has no detectable features
+    """
+    if not text:
+        return None
+    # langdetect loads its language profiles on import, keep it off the model import path
+    from langdetect import detect
+    from langdetect.lang_detect_exception import LangDetectException
+
+    try:
+        return detect(text)
+    except LangDetectException:
+        return None
+
+
+def detect_languages(texts: Sequence[Optional[str]]) -> List[object]:
+    """
+    Detects the language of every text of a chunk. Meant to run in a worker
+    process, so a failure on one text is returned in its slot instead of
+    being raised and losing the rest of the chunk.
+
+    :param texts: texts to inspect
+    :return: language code, None or the raised exception for each text
+    """
+    languages = []
+    for text in texts:
+        try:
+            languages.append(detect_language(text))
+        except Exception as e:
+            languages.append(e)
+    return languages
+
+
+def timed_detect_languages(
+    texts: Sequence[Optional[str]],
+) -> Tuple[List[object], float]:
+    """
+    detect_languages returning as well the seconds spent in the worker, for stage metrics
+    """
+    start = time.perf_counter()
+    languages = detect_languages(texts)
+    return languages, time.perf_counter() - start
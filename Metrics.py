@@ -0,0 +1,253 @@
+# --------------------------------
+# MetricsRegistry Class
+# --------------------------------
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Optional, Sequence, Tuple
+
+# seconds, from a cached page parse to a slow outlet download
+DEFAULT_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+NULL_TIMER = nullcontext()
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """
+    Fixed bucket histogram with Prometheus semantics: cumulative bucket counts, count and sum.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def merge(self, other: "Histogram") -> None:
+        if other.bounds != self.bounds:
+            raise ValueError("Cannot merge histograms with different buckets")
+        self.counts = [mine + theirs for mine, theirs in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.sum += other.sum
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            yield bound, total
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": {
+                ("+Inf" if bound == float("inf") else repr(bound)): total
+                for bound, total in self.cumulative()
+            },
+        }
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (
+        (key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in pairs
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+class MetricsRegistry:
+    """
+    In-process counters and histograms for the crawl and build hot paths.
+
+    A disabled registry does no work: timer() hands back a shared null
+    context manager and increment()/observe() return after one attribute
+    check, so instrumented code can stay instrumented. Once enabled, values
+    are kept per metric name and label set and exported as Prometheus text
+    (to_prometheus) or as a JSON snapshot (snapshot/to_json). Values recorded
+    in a worker process travel back with export() and are added to the
+    parent's registry by merge().
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        prefix: str = "inkbytes_",
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.enabled = enabled
+        self.prefix = prefix
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters: Dict[str, Dict[Labels, float]] = {}
+            self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+
+    def increment(self, name: str, value: float = 1, **labels) -> None:
+        if not self.enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        if not self.enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def timer(self, name: str, **labels):
+        """
+        Context manager recording its duration in the name histogram, in seconds
+        """
+        if not self.enabled:
+            return NULL_TIMER
+        return self._timer(name, labels)
+
+    @contextmanager
+    def _timer(self, name: str, labels: Dict):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def stage(self, stage: str, **labels):
+        """
+        Times one pipeline stage into the shared stage_seconds histogram
+        """
+        if not self.enabled:
+            return NULL_TIMER
+        return self._timer("stage_seconds", dict(labels, stage=stage))
+
+    def export(self) -> Dict:
+        """
+        Returns the raw series, picklable, for merge() into another registry
+        """
+        with self._lock:
+            return {
+                "counters": {
+                    name: dict(series) for name, series in self._counters.items()
+                },
+                "histograms": {
+                    name: dict(series) for name, series in self._histograms.items()
+                },
+            }
+
+    def merge(self, exported: Dict) -> None:
+        """
+        Adds the series of another registry's export() to this one
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            for name, series in exported["counters"].items():
+                mine = self._counters.setdefault(name, {})
+                for key, value in series.items():
+                    mine[key] = mine.get(key, 0) + value
+            for name, series in exported["histograms"].items():
+                mine = self._histograms.setdefault(name, {})
+                for key, histogram in series.items():
+                    if key not in mine:
+                        mine[key] = Histogram(self.buckets)
+                    mine[key].merge(histogram)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "counters": {
+                    f"{self.prefix}{name}": [
+                        {"labels": dict(labels), "value": value}
+                        for labels, value in series.items()
+                    ]
+                    for name, series in self._counters.items()
+                },
+                "histograms": {
+                    f"{self.prefix}{name}": [
+                        dict(histogram.to_dict(), labels=dict(labels))
+                        for labels, histogram in series.items()
+                    ]
+                    for name, series in self._histograms.items()
+                },
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot())
+
+    def to_prometheus(self) -> str:
+        """
+        Renders every series in the Prometheus text exposition format
+        """
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                metric = self.prefix + name
+                lines.append(f"# TYPE {metric} counter")
+                for labels, value in series.items():
+                    lines.append(f"{metric}{_format_labels(labels)} {value}")
+            for name, series in sorted(self._histograms.items()):
+                metric = self.prefix + name
+                lines.append(f"# TYPE {metric} histogram")
+                for labels, histogram in series.items():
+                    for bound, total in histogram.cumulative():
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(
+                            f"{metric}_bucket{_format_labels(labels, ('le', le))} {total}"
+                        )
+                    lines.append(
+                        f"{metric}_sum{_format_labels(labels)} {histogram.sum}"
+                    )
+                    lines.append(
+                        f"{metric}_count{_format_labels(labels)} {histogram.count}"
+                    )
+        return "\n".join(lines) + "\n"
+
+
+# shared registry of NewsPaper and ArticleBuilder, disabled until enabled
+METRICS = MetricsRegistry()
@@ -0,0 +1,229 @@
+# --------------------------------
+# NearDuplicateIndex Class
+# --------------------------------
+import re
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:  # optional dependency
+    raise ImportError(
+        "NearDuplicateIndex requires numpy, install the 'similarity' extra"
+    ) from e
+
+from SimilarPill import SimilarPill
+
+PRIME = np.uint64(4294967311)  # smallest prime above 2**32
+TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def optimal_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    Picks the (bands, rows) split of a signature whose LSH threshold (1/bands)**(1/rows) is closest to threshold
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        distance = abs((1.0 / bands) ** (1.0 / rows) - threshold)
+        if best is None or distance < best[0]:
+            best = (distance, bands, rows)
+    return best[1], best[2]
+
+
+def shingles(text: str, size: int = 3) -> Set[int]:
+    """
+    Returns the crc32 hashes of the word shingles of a text
+    """
+    tokens = TOKEN.findall(text.lower())
+    if not tokens:
+        return set()
+    if len(tokens) <= size:
+        return {zlib.crc32(" ".join(tokens).encode("utf-8"))}
+    return {
+        zlib.crc32(" ".join(tokens[start : start + size]).encode("utf-8"))
+        for start in range(len(tokens) - size + 1)
+    }
+
+
+class NearDuplicateIndex:
+    """
+    MinHash signatures with LSH banding over article title and text.
+
+    Each article is reduced to num_perm minimum hashes of its word shingles.
+    The signature is cut into bands and every band is bucketed, so candidates
+    are the articles sharing at least one band bucket: a lookup only touches
+    those buckets, not the corpus. Candidates are then ranked by the share of
+    equal signature positions, an estimate of the Jaccard similarity of their
+    shingle sets, and kept when it reaches the threshold.
+
+    The index follows ArticleCollection listeners (rebuild/add/discard) and
+    tracks articles by id. fill_similars/ingest write SimilarPill-shaped
+    dictionaries into Article.similars.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 128,
+        bands: Optional[int] = None,
+        shingle_size: int = 3,
+        seed: int = 1,
+    ) -> None:
+        self.threshold = threshold
+        self.num_perm = num_perm
+        if bands is None:
+            bands, rows = optimal_bands(num_perm, threshold)
+        elif num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        else:
+            rows = num_perm // bands
+        self.bands = bands
+        self.rows = rows
+        self.shingle_size = shingle_size
+        generator = np.random.default_rng(seed)
+        self._a = generator.integers(1, 2**31, size=num_perm, dtype=np.uint64)
+        self._b = generator.integers(0, 2**32, size=num_perm, dtype=np.uint64)
+        self.clear()
+
+    def clear(self) -> None:
+        self._buckets: List[Dict[bytes, Set[str]]] = [{} for _ in range(self.bands)]
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._articles: Dict[str, Any] = {}
+
+    def signature(self, article: Any) -> Optional[np.ndarray]:
+        text = " ".join(part for part in (article.title, article.text) if part)
+        hashes = shingles(text, self.shingle_size)
+        if not hashes:
+            return None
+        values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+        permuted = (np.outer(values, self._a) + self._b) % PRIME
+        return permuted.min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[band * self.rows : (band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def rebuild(self, articles: Iterable[Any]) -> None:
+        self.clear()
+        for article in articles:
+            self.add(article)
+
+    def add(self, article: Any, signature: Optional[np.ndarray] = None) -> None:
+        article_id = article.id
+        if article_id is None:
+            return
+        if article_id in self._signatures:
+            self.discard(article)
+        signature = self.signature(article) if signature is None else signature
+        if signature is None:
+            return
+        for buckets, key in zip(self._buckets, self._band_keys(signature)):
+            buckets.setdefault(key, set()).add(article_id)
+        self._signatures[article_id] = signature
+        self._articles[article_id] = article
+
+    def discard(self, article: Any) -> None:
+        article_id = article.id
+        signature = self._signatures.pop(article_id, None)
+        if signature is None:
+            return
+        del self._articles[article_id]
+        for buckets, key in zip(self._buckets, self._band_keys(signature)):
+            ids = buckets.get(key)
+            if ids is not None:
+                ids.discard(article_id)
+                if not ids:
+                    del buckets[key]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def candidates(self, signature: np.ndarray) -> Set[str]:
+        found = set()
+        for buckets, key in zip(self._buckets, self._band_keys(signature)):
+            found.update(buckets.get(key, ()))
+        return found
+
+    def query(
+        self,
+        article: Any,
+        threshold: Optional[float] = None,
+        limit: Optional[int] = None,
+        signature: Optional[np.ndarray] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Finds the indexed near-duplicates of an article
+        :param article: article to look up, it is never returned itself
+        :param threshold: minimum estimated Jaccard similarity, the index threshold by default
+        :param limit: maximum number of results
+        :return: (article id, similarity) tuples, most similar first
+        """
+        threshold = self.threshold if threshold is None else threshold
+        signature = self.signature(article) if signature is None else signature
+        if signature is None:
+            return []
+        ids = [key for key in self.candidates(signature) if key != article.id]
+        if not ids:
+            return []
+        matrix = np.stack([self._signatures[key] for key in ids])
+        similarity = (matrix == signature).mean(axis=1)
+        order = np.argsort(-similarity, kind="stable")
+        results = [
+            (ids[position], float(similarity[position]))
+            for position in order
+            if similarity[position] >= threshold
+        ]
+        return results[:limit] if limit is not None else results
+
+    def pill(self, article_id: str, similarity: float) -> Dict:
+        article = self._articles[article_id]
+        return SimilarPill(
+            id=article.id,
+            uid=article.uid,
+            title=article.title,
+            summary=article.summary,
+            similarity=similarity,
+        ).model_dump(exclude_none=True)
+
+    def fill_similars(self, article: Any, **query) -> List[Dict]:
+        """
+        Replaces article.similars with SimilarPill dictionaries of its near-duplicates
+        """
+        article.similars = [
+            self.pill(key, similarity)
+            for key, similarity in self.query(article, **query)
+        ]
+        return article.similars
+
+    def ingest(self, article: Any, symmetric: bool = True, **query) -> List[Dict]:
+        """
+        Links a new article to its near-duplicates, then indexes it
+        :param article: incoming article
+        :param symmetric: also add the article to the similars of its matches
+        :return: the SimilarPill dictionaries stored in article.similars
+        """
+        signature = self.signature(article)
+        if signature is None:
+            article.similars = []
+            return article.similars
+        matches = self.query(article, signature=signature, **query)
+        article.similars = [self.pill(key, similarity) for key, similarity in matches]
+        self.add(article, signature)
+        if symmetric and article.id in self._articles:
+            for key, similarity in matches:
+                other = self._articles[key]
+                other.similars = [
+                    pill
+                    for pill in other.similars or []
+                    if not _points_to(pill, article.id)
+                ] + [self.pill(article.id, similarity)]
+        return article.similars
+
+
+def _points_to(pill: Any, article_id: str) -> bool:
+    return isinstance(pill, dict) and pill.get("id") == article_id
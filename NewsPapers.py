@@ -1,28 +1,63 @@
+import functools
 import logging
-
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit
 
 __name__ = "NewsPaper"
 
 import Logger
 
-from Outlets import OutletsSource
+from Metrics import METRICS
+from Outlets import OutletsHandler, OutletsSource
 
 logger = logging.getLogger(__name__)
 
-import newspaper
+import requests
+from requests.adapters import HTTPAdapter
 
 logger = Logger.get_logger(__name__)
 
 
+def _encoded_size(page: Optional[str]) -> int:
+    # pages are decoded text, their utf-8 encoding measures bytes rather than characters
+    return len(page.encode("utf-8")) if page else 0
+
+
+def outlet_url(outlet) -> str:
+    """
+    Returns the url of an outlet, OutletsHandler stores either OutletsSource or its Attributes
+    """
+    return getattr(outlet, "attributes", outlet).url
+
+
 class NewsPaper:
-    def __init__(self, agent="", headers="") -> None:
+    def __init__(self, agent="", headers="", seen_store=None, metrics=None) -> None:
         super().__init__()
         self.agent = agent
         self.headers = headers
+        self.seen_store = seen_store
+        self.metrics = metrics or METRICS
         self.paper = None
-        self.newspaper = newspaper
+        self._newspaper = None
         self.config = {}
 
+    @property
+    def newspaper(self):
+        # newspaper4k pulls in nltk and lxml, import it on the first build only
+        if self._newspaper is None:
+            import newspaper
+
+            self._newspaper = newspaper
+        return self._newspaper
+
+    @newspaper.setter
+    def newspaper(self, module) -> None:
+        self._newspaper = module
+
     def __iter__(self):
         super().__iter__()
 
@@ -31,39 +66,399 @@ class NewsPaper:
         Generates the newspaper object
         :return: paper object
         """
+        metrics, outlet = self.metrics, paper.url
+        stage = "download"
         try:
-            paper.download()
-            paper.parse()
-            paper.set_categories()
-            paper.download_categories()  # mthread
-            paper.parse_categories()
-            paper.generate_articles()
+            with metrics.stage(stage, outlet=outlet):
+                paper.download()
+            stage = "parse"
+            with metrics.stage(stage, outlet=outlet):
+                paper.parse()
+                paper.set_categories()
+            stage = "download_categories"
+            with metrics.stage(stage, outlet=outlet):
+                paper.download_categories()  # mthread
+            stage = "parse_categories"
+            with metrics.stage(stage, outlet=outlet):
+                paper.parse_categories()
+            stage = "set_feeds"
+            with metrics.stage(stage, outlet=outlet):
+                paper.set_feeds()
+            stage = "download_feeds"
+            with metrics.stage(stage, outlet=outlet):
+                paper.download_feeds()  # mthread
+            stage = "generate_articles"
+            with metrics.stage(stage, outlet=outlet):
+                paper.generate_articles()
+            self.skip_seen_articles(paper)
+            self.record_paper(paper)
             self.paper = paper
             return self.paper
         except ValueError as e:
+            metrics.increment("failures_total", outlet=outlet, stage=stage)
             logger.error(f"Could not build Paper , reason: Error: {e}")
 
+    def record_paper(self, paper) -> None:
+        """
+        Counts the bytes of the pages and feeds and the articles found for the outlet of a generated paper
+        """
+        if not self.metrics.enabled:
+            return
+        pages = [paper.html]
+        pages.extend(category.html for category in paper.categories)
+        pages.extend(feed.rss for feed in getattr(paper, "feeds", []))
+        self.record_bytes(paper.url, sum(_encoded_size(page) for page in pages))
+        self.metrics.increment(
+            "articles_found_total", len(paper.articles), outlet=paper.url
+        )
+
+    def record_bytes(self, outlet: str, size: int) -> None:
+        if size:
+            self.metrics.increment("bytes_downloaded_total", size, outlet=outlet)
+
     def build(self, outlet: OutletsSource) -> object:
         """
         Builds the newspaper object
         :param outlet:
         :return: generated object
         """
-        self.config = {
+        self.config = self.build_config()
+        try:
+            # dry build, generate_paper runs the download, parse and feed stages once
+            paper = self.newspaper.build(outlet_url(outlet), dry=True, **self.config)
+            return self.generate_paper(paper)
+        except ValueError as e:
+            print(e)
+            return None
+
+    def skip_seen_articles(self, paper) -> None:
+        """
+        Drops the articles the seen store holds as fresh, before they are downloaded
+        :param paper:
+        """
+        if self.seen_store is not None:
+            paper.articles = self.seen_store.filter_new(paper.articles)
+
+    def download_article(self, article, outlet: Optional[str] = None) -> bool:
+        """
+        Downloads a newspaper article and records it in the seen store
+        :param article: newspaper.Article
+        :param outlet: outlet label of the download, the article's source url by default
+        :return: True when its html was downloaded
+        """
+        article.download()
+        if not article.html:
+            return False
+        if self.metrics.enabled:
+            self.record_bytes(
+                outlet or article.source_url or article.url,
+                _encoded_size(article.html),
+            )
+        self.mark_fetched(article)
+        return True
+
+    def mark_fetched(self, article, response=None) -> None:
+        """
+        Records a downloaded article in the seen store, with the validators of its response
+        """
+        if self.seen_store is None:
+            return
+        headers = response.headers if response is not None else {}
+        self.seen_store.mark_fetched(
+            [article],
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+        )
+
+    def build_config(self) -> dict:
+        return {
             "memoize_articles": False,
+            # newspaper4k name of the option, its url cache is the seen store's job
+            "memorize_articles": False,
             "concurrent": True,
             "follow_meta_refresh": True,
             "http_success_only": False,
             "headers": self.headers,
             "agent": self.agent,
         }
+
+
+class HostLimiter:
+    """
+    Per-host connection and rate limits shared by the crawler threads.
+
+    connections caps the number of simultaneous requests to one host, rate
+    caps the number of requests started per second on one host.
+    """
+
+    def __init__(self, connections: int = 2, rate: Optional[float] = None) -> None:
+        self.connections = connections
+        self.interval = 1.0 / rate if rate else 0.0
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_slot: Dict[str, float] = {}
+
+    @contextmanager
+    def limit(self, host: str):
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.connections)
+                self._semaphores[host] = semaphore
+        with semaphore:
+            if self.interval:
+                with self._lock:
+                    now = time.monotonic()
+                    slot = max(now, self._next_slot.get(host, now))
+                    self._next_slot[host] = slot + self.interval
+                if slot > now:
+                    time.sleep(slot - now)
+            yield
+
+
+class NewsPaperCrawler(NewsPaper):
+    """
+    Crawls many outlets concurrently.
+
+    Outlets are built on a thread pool of max_outlets workers. Every http
+    request of the source and category stages goes through one pooled
+    requests.Session carrying the configured agent and headers, and is
+    subject to the per-host limits of a HostLimiter and to a global cap of
+    max_connections requests in flight. Category pages are fetched on a
+    shared pool of the same size.
+    """
+
+    def __init__(
+        self,
+        agent="",
+        headers="",
+        max_outlets: int = 8,
+        max_connections: int = 32,
+        per_host_connections: int = 2,
+        per_host_rate: Optional[float] = None,
+        timeout: float = 7,
+        seen_store=None,
+        metrics=None,
+    ) -> None:
+        super().__init__(agent, headers, seen_store, metrics)
+        self.max_outlets = max_outlets
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.limiter = HostLimiter(per_host_connections, per_host_rate)
+        self._connections = threading.BoundedSemaphore(max_connections)
+        self._fetch_pool = ThreadPoolExecutor(max_workers=max_connections)
+        self.config = self.build_config()
+        self.session = self.build_session()
+
+    def build_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.max_connections, pool_maxsize=self.max_connections
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        if isinstance(self.headers, dict):
+            session.headers.update(self.headers)
+        if self.agent:
+            session.headers["User-Agent"] = self.agent
+        return session
+
+    def fetch(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        outlet: Optional[str] = None,
+    ) -> Optional[requests.Response]:
+        """
+        Downloads an url through the shared session within the crawl limits,
+        counting the response body in bytes_downloaded_total
+        :param url:
+        :param headers: extra request headers, e.g. conditional ones
+        :param outlet: outlet label of the download, the url's origin by default
+        :return: response, None when the request failed
+        """
+        split = urlsplit(url)
+        try:
+            with self.limiter.limit(split.netloc):
+                with self._connections:
+                    response = self.session.get(
+                        url, timeout=self.timeout, headers=headers
+                    )
+        except requests.RequestException as e:
+            logger.error(f"Could not download {url}, reason: Error: {e}")
+            return None
+        if self.metrics.enabled:
+            outlet = outlet or urlunsplit((split.scheme, split.netloc, "", "", ""))
+            self.record_bytes(outlet, len(response.content))
+        return response
+
+    def record_paper(self, paper) -> None:
+        # the bytes were counted response by response in fetch
+        self.metrics.increment(
+            "articles_found_total", len(paper.articles), outlet=paper.url
+        )
+
+    def generate_paper(self, paper) -> object:
+        """
+        Runs the generate_paper stages with downloads going through the shared session
+        :return: paper object
+        """
+        from newspaper import network
+
+        metrics, outlet = self.metrics, paper.url
+        stage = "download"
+        try:
+            with metrics.stage(stage, outlet=outlet):
+                response = self.fetch(paper.url, outlet=outlet)
+            if response is None:
+                metrics.increment("failures_total", outlet=outlet, stage=stage)
+                return None
+            paper.html = network.get_html(paper.url, paper.config, response=response)
+            stage = "parse"
+            with metrics.stage(stage, outlet=outlet):
+                paper.parse()
+                paper.set_categories()
+            stage = "download_categories"
+            with metrics.stage(stage, outlet=outlet):
+                responses = self._fetch_pool.map(
+                    functools.partial(self.fetch, outlet=outlet),
+                    paper.category_urls(),
+                )
+                for response, category in zip(responses, paper.categories):
+                    if response is not None and response.status_code < 400:
+                        category.html = network.get_html(
+                            category.url, response=response
+                        )
+            paper.categories = [c for c in paper.categories if c.html]
+            stage = "parse_categories"
+            with metrics.stage(stage, outlet=outlet):
+                paper.parse_categories()
+            stage = "set_feeds"
+            with metrics.stage(stage, outlet=outlet):
+                self.set_feeds(paper)
+            stage = "download_feeds"
+            with metrics.stage(stage, outlet=outlet):
+                self.download_feeds(paper)
+            stage = "generate_articles"
+            with metrics.stage(stage, outlet=outlet):
+                paper.generate_articles()
+            self.skip_seen_articles(paper)
+            self.record_paper(paper)
+            return paper
+        except ValueError as e:
+            metrics.increment("failures_total", outlet=outlet, stage=stage)
+            logger.error(f"Could not build Paper , reason: Error: {e}")
+
+    def download_article(self, article, outlet: Optional[str] = None) -> bool:
+        """
+        Downloads a newspaper article through the shared session, as a
+        conditional request when the seen store knows its validators
+        :param article: newspaper.Article
+        :param outlet: outlet label of the download, see fetch
+        :return: True when its html was downloaded, False when it failed or was not modified
+        """
+        from newspaper import network
+
+        headers = (
+            self.seen_store.validators(article.url)
+            if self.seen_store is not None
+            else None
+        )
+        response = self.fetch(
+            article.url, headers or None, outlet=outlet or article.source_url or None
+        )
+        if response is None:
+            return False
+        if response.status_code == 304:
+            self.mark_fetched(article, response)
+            return False
+        if response.status_code >= 400:
+            return False
+        html = network.get_html(article.url, article.config, response=response)
+        if not html:
+            return False
+        article.download(input_html=html)
+        self.mark_fetched(article, response)
+        return True
+
+    def set_feeds(self, paper) -> None:
+        """
+        Source.set_feeds with the common feed pages fetched through the shared session
+        """
+        from newspaper import network, parsers
+        from newspaper.source import Category, Feed
+
+        split = urlsplit(paper.url)
+        candidates = [urljoin(paper.url, path) for path in ("/feed", "/feeds", "/rss")]
+        if split.netloc in ("medium.com", "www.medium.com") and split.path.startswith(
+            "/@"
+        ):
+            path = "/feed/" + split.path.split("/")[1]
+            candidates.append(urlunsplit((split.scheme, split.netloc, path, "", "")))
+        pages = []
+        fetch = functools.partial(self.fetch, outlet=paper.url)
+        for url, response in zip(candidates, self._fetch_pool.map(fetch, candidates)):
+            if response is not None and response.status_code < 400:
+                page = Category(url=url)
+                page.html = network.get_html(url, response=response)
+                page.doc = parsers.fromstring(page.html) if page.html else None
+                if page.doc is not None:
+                    pages.append(page)
+        urls = paper.extractor.get_feed_urls(paper.url, paper.categories + pages)
+        paper.feeds = [Feed(url=url) for url in urls]
+
+    def download_feeds(self, paper) -> None:
+        """
+        Source.download_feeds through the shared session
+        """
+        from newspaper import network
+
+        fetch = functools.partial(self.fetch, outlet=paper.url)
+        responses = self._fetch_pool.map(fetch, paper.feed_urls())
+        for response, feed in zip(responses, paper.feeds):
+            if response is not None and response.status_code < 400:
+                feed.rss = network.get_html(feed.url, response=response)
+        paper.feeds = [feed for feed in paper.feeds if feed.rss]
+
+    def build(self, outlet: OutletsSource) -> object:
+        """
+        Builds the newspaper object of one outlet
+        :param outlet:
+        :return: generated object
+        """
         try:
-            paper = self.newspaper.build(outlet.url, **self.config)
+            paper = self.newspaper.build(outlet_url(outlet), dry=True, **self.config)
             return self.generate_paper(paper)
         except ValueError as e:
-            print(e)
+            logger.error(f"Could not build Paper , reason: Error: {e}")
             return None
 
+    def crawl(
+        self, outlets: OutletsHandler | Iterable[OutletsSource]
+    ) -> Iterator[Tuple[OutletsSource, object]]:
+        """
+        Crawls outlets concurrently, yielding each one as soon as its paper is built
+        :param outlets: OutletsHandler or iterable of outlets
+        :return: generator of (outlet, paper) tuples, paper is None when the build failed
+        """
+        if isinstance(outlets, OutletsHandler):
+            outlets = outlets.get_all_outlets()
+        with ThreadPoolExecutor(max_workers=self.max_outlets) as pool:
+            futures = {pool.submit(self.build, outlet): outlet for outlet in outlets}
+            for future in as_completed(futures):
+                outlet = futures[future]
+                try:
+                    yield outlet, future.result()
+                except Exception as e:
+                    logger.error(
+                        f"Could not crawl {outlet_url(outlet)}, reason: Error: {e}"
+                    )
+                    yield outlet, None
+
+    def close(self) -> None:
+        self._fetch_pool.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
 
 class NewsPaperBuilder:
     pass
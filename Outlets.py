@@ -3,9 +3,10 @@
 # --------------------------------
 import json
 import logging
-from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field, field_validator
 
-__name__ = "Data Source Model"
 logger = logging.getLogger(__name__)
 
 
@@ -22,19 +23,54 @@ class OutletsSource(BaseModel):
 
 
 class OutletsHandler(BaseModel):
-    news_outlets: list[OutletsSource] = []
+    """
+    Registry of outlets keyed by name.
+
+    Outlets serialized as a list by earlier versions are still accepted and
+    keyed on load.
+    """
+
+    news_outlets: Dict[str, OutletsSource] = {}
+
+    @field_validator("news_outlets", mode="before")
+    @classmethod
+    def key_outlets(cls, value):
+        if not isinstance(value, (list, tuple)):
+            return value
+        keyed = {}
+        for item in value:
+            if isinstance(item, dict):
+                item = (
+                    OutletsSource(**item)
+                    if "attributes" in item
+                    else Attributes(**item)
+                )
+            if isinstance(item, Attributes):
+                item = OutletsSource(attributes=item)
+            keyed[item.attributes.name] = item
+        return keyed
 
     def add(self, outlet: OutletsSource):
-        self.news_outlets.append(outlet.attributes)
+        self.news_outlets[outlet.attributes.name] = outlet
 
     def remove_outlet(self, key: str):
-        self.news_outlets.pop(key, None)
+        return self.news_outlets.pop(key, None)
 
-    def get_outlet_url(self, key: str):
+    def get_outlet(self, key: str) -> Optional[OutletsSource]:
         return self.news_outlets.get(key)
 
-    def get_all_outlets(self):
-        return self.news_outlets
+    def get_outlet_url(self, key: str) -> Optional[str]:
+        outlet = self.news_outlets.get(key)
+        return outlet.attributes.url if outlet is not None else None
+
+    def get_all_outlets(self) -> List[OutletsSource]:
+        return list(self.news_outlets.values())
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.news_outlets
+
+    def __len__(self) -> int:
+        return len(self.news_outlets)
 
     def to_json(self) -> str:
         return json.dumps(self.dict())
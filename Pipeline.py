@@ -0,0 +1,356 @@
+# --------------------------------
+# Pipeline Class
+# --------------------------------
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import Logger
+
+logger = Logger.get_logger(__name__)
+
+MODES = ("inline", "thread", "process")
+POLL = 0.1
+_END = object()
+
+
+class _Failure:
+    # carries an error that stopped a stage down to the consumer
+    def __init__(self, stage: str, error: BaseException) -> None:
+        self.stage = stage
+        self.error = error
+
+
+def bounded_futures(
+    submit: Callable[[Any], Future],
+    items: Iterable,
+    limit: int,
+    ordered: bool = True,
+) -> Iterator[Tuple[Any, Future]]:
+    """
+    Submits the items one by one with at most limit futures in flight, so the
+    items are only read as fast as the pool gets through them
+    :param submit: submits one item, e.g. lambda task: pool.submit(func, task)
+    :param ordered: yield in input order, otherwise as futures complete
+    :return: generator of (item, future) tuples, the futures of an ordered run may still be running
+    """
+    limit = max(limit, 1)
+    if ordered:
+        window = deque()
+        for item in items:
+            if len(window) >= limit:
+                yield window.popleft()
+            window.append((item, submit(item)))
+        while window:
+            yield window.popleft()
+        return
+    pending: Dict[Future, Any] = {}
+    for item in items:
+        if len(pending) >= limit:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                yield pending.pop(future), future
+        pending[submit(item)] = item
+    for future in as_completed(list(pending)):
+        yield pending.pop(future), future
+
+
+def run_chunk(func: Callable, flat: bool, items: List) -> tuple:
+    """
+    Applies a stage function to a chunk of items; worker entry point of thread and process stages
+    :return: (per item ("ok", results) or ("error", exception), seconds spent)
+    """
+    start = time.perf_counter()
+    outcomes = []
+    for item in items:
+        try:
+            result = func(item)
+            if flat:
+                results = list(result) if result is not None else []
+            else:
+                results = [] if result is None else [result]
+            outcomes.append(("ok", results))
+        except Exception as e:
+            outcomes.append(("error", e))
+    return outcomes, time.perf_counter() - start
+
+
+class Stage:
+    """
+    One step of a Pipeline.
+
+    func maps an item to a result, None drops the item. With flat=True it
+    returns an iterable and every element is passed on, e.g. a paper to its
+    articles. mode picks where func runs: in the stage thread ("inline"), on
+    a pool of workers threads for I/O bound work ("thread"), or on a process
+    pool for CPU bound work ("process", func and items must be picklable),
+    items being sent chunksize at a time. At most 2 * workers chunks are in
+    flight and results keep the input order. An item whose func raises is
+    logged, handed to on_error and skipped.
+    """
+
+    def __init__(
+        self,
+        func: Callable,
+        mode: str = "inline",
+        workers: int = 1,
+        name: Optional[str] = None,
+        flat: bool = False,
+        chunksize: Optional[int] = None,
+        on_error: Optional[Callable[[Any, Exception], None]] = None,
+    ) -> None:
+        if mode not in MODES:
+            raise ValueError(f"Unknown stage mode '{mode}', expected one of {MODES}")
+        self.func = func
+        self.mode = mode
+        self.workers = workers
+        self.name = name or getattr(func, "__name__", type(func).__name__)
+        self.flat = flat
+        self.chunksize = chunksize or (16 if mode == "process" else 1)
+        self.on_error = on_error
+        self.reset()
+
+    def reset(self) -> None:
+        self.received = 0
+        self.emitted = 0
+        self.errors = 0
+        self.busy = 0.0
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def throughput(self) -> float:
+        elapsed = self.elapsed
+        return self.received / elapsed if elapsed else 0.0
+
+    def stats(self) -> Dict:
+        return {
+            "stage": self.name,
+            "mode": self.mode,
+            "received": self.received,
+            "emitted": self.emitted,
+            "errors": self.errors,
+            "busy_seconds": self.busy,
+            "elapsed_seconds": self.elapsed,
+            "items_per_second": self.throughput,
+        }
+
+    def _executor(self):
+        if self.mode == "thread":
+            return ThreadPoolExecutor(max_workers=self.workers)
+        return ProcessPoolExecutor(max_workers=self.workers)
+
+    def _outcomes(self, chunk: List, outcomes: tuple, emit: Callable) -> None:
+        outcomes, seconds = outcomes
+        self.busy += seconds
+        for item, (status, value) in zip(chunk, outcomes):
+            if status == "error":
+                self.errors += 1
+                logger.error(f"Stage {self.name} failed on an item: {value}")
+                if self.on_error is not None:
+                    self.on_error(item, value)
+                continue
+            for result in value:
+                self.emitted += 1
+                emit(result)
+
+    def run(self, items: Iterable, emit: Callable) -> None:
+        """
+        Processes items, passing every result to emit
+        """
+        if self.mode == "inline":
+            for item in items:
+                self._count(item)
+                self._outcomes([item], run_chunk(self.func, self.flat, [item]), emit)
+            return
+        window = deque()
+        executor = self._executor()
+        try:
+            chunk = []
+            for item in items:
+                self._count(item)
+                chunk.append(item)
+                if len(chunk) >= self.chunksize:
+                    window.append(
+                        (chunk, executor.submit(run_chunk, self.func, self.flat, chunk))
+                    )
+                    chunk = []
+                while len(window) >= 2 * self.workers:
+                    done, future = window.popleft()
+                    self._outcomes(done, future.result(), emit)
+            if chunk:
+                window.append(
+                    (chunk, executor.submit(run_chunk, self.func, self.flat, chunk))
+                )
+            while window:
+                done, future = window.popleft()
+                self._outcomes(done, future.result(), emit)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _count(self, item: Any) -> None:
+        if self.started is None:
+            self.started = time.perf_counter()
+        self.received += 1
+
+
+class Pipeline:
+    """
+    Streaming chain of stages connected by bounded queues.
+
+    Every stage runs in its own thread, reading from the queue of the stage
+    before it and writing to the next one. Queues hold at most queue_size
+    items, so a slow stage blocks the stages upstream (backpressure) and only
+    a bounded number of items is in memory whatever the size of the source.
+    run() yields the results as they come out of the last stage; an error
+    raised outside the per-item handling stops the pipeline and is re-raised
+    by run(). Per-stage counts and throughput are available from stats().
+    """
+
+    def __init__(self, stages: Iterable[Stage] = (), queue_size: int = 64) -> None:
+        self.stages: List[Stage] = list(stages)
+        self.queue_size = queue_size
+
+    def add_stage(self, func: Callable, **options) -> "Pipeline":
+        self.stages.append(func if isinstance(func, Stage) else Stage(func, **options))
+        return self
+
+    def run(self, source: Iterable) -> Iterator:
+        """
+        Streams the items of source through the stages
+        :param source: any iterable, consumed lazily on a feeder thread
+        :return: generator of the results of the last stage
+        """
+        for stage in self.stages:
+            stage.reset()
+        stop = threading.Event()
+        queues = [queue.Queue(self.queue_size) for _ in range(len(self.stages) + 1)]
+        threads = [
+            threading.Thread(
+                target=self._feed, args=(source, queues[0], stop), daemon=True
+            )
+        ]
+        for position, stage in enumerate(self.stages):
+            threads.append(
+                threading.Thread(
+                    target=self._work,
+                    args=(stage, queues[position], queues[position + 1], stop),
+                    name=f"pipeline-{stage.name}",
+                    daemon=True,
+                )
+            )
+        for thread in threads:
+            thread.start()
+        try:
+            for item in _drain(queues[-1], stop):
+                if isinstance(item, _Failure):
+                    raise item.error
+                yield item
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join(timeout=POLL * 10)
+
+    def process(self, source: Iterable, sink: Optional[Callable] = None) -> int:
+        """
+        Runs the pipeline to the end, passing every result to sink
+        :return: number of results
+        """
+        count = 0
+        for item in self.run(source):
+            if sink is not None:
+                sink(item)
+            count += 1
+        return count
+
+    def stats(self) -> List[Dict]:
+        return [stage.stats() for stage in self.stages]
+
+    def report(self) -> str:
+        return "\n".join(
+            f"{stats['stage']:<24} {stats['mode']:<8} {stats['received']:>9} in "
+            f"{stats['emitted']:>9} out {stats['errors']:>6} errors "
+            f"{stats['items_per_second']:>10.1f} items/s"
+            for stats in self.stats()
+        )
+
+    @staticmethod
+    def _feed(source: Iterable, outbox: queue.Queue, stop: threading.Event) -> None:
+        try:
+            for item in source:
+                if not _put(outbox, item, stop):
+                    return
+        except Exception as e:
+            _put(outbox, _Failure("source", e), stop)
+        _put(outbox, _END, stop)
+
+    @staticmethod
+    def _work(
+        stage: Stage, inbox: queue.Queue, outbox: queue.Queue, stop: threading.Event
+    ) -> None:
+        failures = []
+
+        def items():
+            for item in _drain(inbox, stop):
+                if isinstance(item, _Failure):
+                    failures.append(item)
+                    return
+                yield item
+
+        def emit(result):
+            if not _put(outbox, result, stop):
+                raise _Stopped()
+
+        try:
+            stage.run(items(), emit)
+        except _Stopped:
+            return
+        except Exception as e:
+            failures.append(_Failure(stage.name, e))
+        finally:
+            stage.finished = time.perf_counter()
+        for failure in failures:
+            _put(outbox, failure, stop)
+        _put(outbox, _END, stop)
+
+
+class _Stopped(Exception):
+    # the consumer went away, unwind the stage
+    pass
+
+
+def _put(outbox: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            outbox.put(item, timeout=POLL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _drain(inbox: queue.Queue, stop: threading.Event) -> Iterator:
+    while not stop.is_set():
+        try:
+            item = inbox.get(timeout=POLL)
+        except queue.Empty:
+            continue
+        if item is _END:
+            return
+        yield item
@@ -0,0 +1,173 @@
+# --------------------------------
+# SeenArticleStore Class
+# --------------------------------
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional
+
+BATCH_SIZE = 500
+
+
+def article_id_for_url(url: str) -> str:
+    """
+    Returns the stable id ArticleBuilder gives to the article at url
+    """
+    return str(uuid.uuid3(uuid.NAMESPACE_URL, url))
+
+
+def _url_of(article) -> str:
+    # newspaper.Article exposes url, Article exposes article_url
+    return getattr(article, "url", None) or article.article_url
+
+
+class SeenArticleStore:
+    """
+    On-disk record of the articles already fetched, keyed by the uuid3 id of their url.
+
+    Every entry carries the epoch time it was last fetched. An article counts
+    as fresh while that time is within the freshness window (in seconds); with
+    no window an article is never fetched twice. The ETag and Last-Modified
+    headers of the fetch are kept for conditional requests. The store is a
+    SQLite file in WAL mode, safe to share between crawler threads.
+    """
+
+    def __init__(self, path: str = ":memory:", freshness: Optional[float] = None):
+        self.path = path
+        self.freshness = freshness
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS seen_articles ("
+            "id TEXT PRIMARY KEY, url TEXT, fetched_at REAL NOT NULL, "
+            "etag TEXT, last_modified TEXT)"
+        )
+        columns = {
+            row[1]
+            for row in self._connection.execute("PRAGMA table_info(seen_articles)")
+        }
+        for column in ("etag", "last_modified"):
+            if column not in columns:  # stores created before validators were kept
+                self._connection.execute(
+                    f"ALTER TABLE seen_articles ADD COLUMN {column} TEXT"
+                )
+        self._connection.commit()
+
+    def last_fetched(self, ids: Iterable[str]) -> Dict[str, float]:
+        """
+        Returns the last fetch time of every known id
+        """
+        ids = list(ids)
+        found = {}
+        with self._lock:
+            for start in range(0, len(ids), BATCH_SIZE):
+                batch = ids[start : start + BATCH_SIZE]
+                rows = self._connection.execute(
+                    "SELECT id, fetched_at FROM seen_articles WHERE id IN (%s)"
+                    % ",".join("?" * len(batch)),
+                    batch,
+                )
+                found.update(rows)
+        return found
+
+    def is_fresh(self, url: str, now: Optional[float] = None) -> bool:
+        return bool(self.fresh_ids([article_id_for_url(url)], now))
+
+    def fresh_ids(self, ids: Iterable[str], now: Optional[float] = None) -> set:
+        """
+        Returns the ids that were fetched within the freshness window
+        """
+        fetched = self.last_fetched(ids)
+        if self.freshness is None:
+            return set(fetched)
+        oldest = (now or time.time()) - self.freshness
+        return {key for key, fetched_at in fetched.items() if fetched_at >= oldest}
+
+    def filter_new(self, articles: Iterable, now: Optional[float] = None) -> List:
+        """
+        Drops the articles that are still fresh, keeping the order of the rest
+        :param articles: newspaper.Article or Article objects
+        :return: articles that need to be fetched
+        """
+        articles = list(articles)
+        ids = [article_id_for_url(_url_of(article)) for article in articles]
+        fresh = self.fresh_ids(ids, now)
+        return [article for article, key in zip(articles, ids) if key not in fresh]
+
+    def validators(self, url: str) -> Dict[str, str]:
+        """
+        Returns the conditional request headers of the last fetch of url, empty when unknown
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT etag, last_modified FROM seen_articles WHERE id = ?",
+                (article_id_for_url(url),),
+            ).fetchone()
+        headers = {}
+        if row is not None and row[0]:
+            headers["If-None-Match"] = row[0]
+        if row is not None and row[1]:
+            headers["If-Modified-Since"] = row[1]
+        return headers
+
+    def mark_fetched(
+        self,
+        articles: Iterable,
+        fetched_at: Optional[float] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        """
+        Records articles as fetched, in a single batched upsert
+        :param articles: newspaper.Article, Article objects or urls
+        :param fetched_at: epoch time, defaults to now
+        :param etag: ETag header of the response, kept for conditional requests;
+            None keeps the known one
+        :param last_modified: Last-Modified header of the response
+        """
+        fetched_at = fetched_at or time.time()
+        rows = []
+        for article in articles:
+            url = article if isinstance(article, str) else _url_of(article)
+            rows.append((article_id_for_url(url), url, fetched_at, etag, last_modified))
+        with self._lock:
+            self._connection.executemany(
+                "INSERT INTO seen_articles (id, url, fetched_at, etag, last_modified) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET fetched_at = excluded.fetched_at, "
+                "etag = COALESCE(excluded.etag, etag), "
+                "last_modified = COALESCE(excluded.last_modified, last_modified)",
+                rows,
+            )
+            self._connection.commit()
+        return len(rows)
+
+    def purge(self, older_than: float) -> int:
+        """
+        Forgets the entries last fetched before the given epoch time
+        """
+        with self._lock:
+            cursor = self._connection.execute(
+                "DELETE FROM seen_articles WHERE fetched_at < ?", (older_than,)
+            )
+            self._connection.commit()
+        return cursor.rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM seen_articles"
+            ).fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
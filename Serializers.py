@@ -0,0 +1,131 @@
+# --------------------------------
+# BulkSerializer Class
+# --------------------------------
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Type
+
+from pydantic import BaseModel, TypeAdapter
+
+from ArticleBodies import LazyArticle
+from Articles import Article, ArticleCollection
+from Entities import Entity, EntitiesCollection
+
+try:
+    import orjson
+except ImportError:  # optional backend
+    orjson = None
+
+BACKENDS = ("pydantic", "orjson")
+
+
+def _orjson_default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+
+def _common_model(objs: List[BaseModel]) -> Type[BaseModel]:
+    # the most derived model class every item is an instance of
+    types = {type(obj) for obj in objs}
+    for model in type(objs[0]).__mro__:
+        if all(issubclass(kind, model) for kind in types):
+            return model
+    return BaseModel
+
+
+class BulkSerializer:
+    """
+    Encodes Article, Entity, EntitiesCollection, SimilarPill and their collections
+    to JSON bytes without going through ArticleEncoder/to_dict.
+
+    The "pydantic" backend hands the whole object graph to pydantic-core, so a
+    collection is encoded by a single native call through a cached
+    TypeAdapter(List[Model]). The "orjson" backend dumps the models to plain
+    python structures with pydantic-core and encodes them with orjson; it is
+    only available when orjson is installed. "auto" picks orjson when present.
+
+    Entities are always emitted as a list of {type, name, links} objects, as
+    with to_dict, but missing entity values are kept as null.
+    """
+
+    def __init__(self, backend: str = "pydantic") -> None:
+        if backend == "auto":
+            backend = "orjson" if orjson is not None else "pydantic"
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown serializer backend '{backend}'")
+        if backend == "orjson" and orjson is None:
+            raise ImportError("The orjson backend requires the 'orjson' package")
+        self.backend = backend
+        self._adapters: Dict[type, TypeAdapter] = {}
+
+    def _adapter(self, model: Type[BaseModel]) -> TypeAdapter:
+        adapter = self._adapters.get(model)
+        if adapter is None:
+            adapter = self._adapters[model] = TypeAdapter(List[model])
+        return adapter
+
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Encodes a single model, a collection model or a list of models.
+
+        :param obj: Article, Entity, SimilarPill, ArticleCollection, EntitiesCollection or list
+        :return: JSON bytes
+        """
+        if isinstance(obj, ArticleCollection):
+            return self.dumps_many(obj.articles, Article)
+        if isinstance(obj, EntitiesCollection):
+            return self.dumps_many(obj.entities, Entity)
+        if isinstance(obj, (list, tuple)):
+            return self.dumps_many(obj)
+        if isinstance(obj, LazyArticle):
+            obj.materialize()
+        if self.backend == "pydantic":
+            return obj.__pydantic_serializer__.to_json(obj)
+        return orjson.dumps(obj.model_dump(), default=_orjson_default)
+
+    def dumps_many(
+        self, objs: Iterable[BaseModel], model: Optional[Type[BaseModel]] = None
+    ) -> bytes:
+        """
+        Encodes a sequence of models of a common type as one JSON array in one call.
+
+        :param objs: models to encode
+        :param model: model type, the most derived class shared by all items when omitted
+        :return: JSON bytes
+        """
+        objs = objs if isinstance(objs, list) else list(objs)
+        if model is None:
+            model = _common_model(objs) if objs else Article
+        if issubclass(model, Article):
+            # bodies of lazily loaded articles are not in __dict__ yet
+            for obj in objs:
+                if isinstance(obj, LazyArticle):
+                    obj.materialize()
+        adapter = self._adapter(model)
+        if self.backend == "pydantic":
+            return adapter.dump_json(objs)
+        return orjson.dumps(adapter.dump_python(objs), default=_orjson_default)
+
+    def iter_ndjson(self, objs: Iterable[BaseModel]) -> Iterator[bytes]:
+        """
+        Yields one encoded line, newline included, per model.
+
+        :param objs: models to encode, may be a generator
+        :return: generator of JSON bytes lines
+        """
+        for obj in objs:
+            yield self.dumps(obj) + b"\n"
+
+
+_default_serializer = BulkSerializer()
+
+
+def dumps(obj: Any) -> bytes:
+    return _default_serializer.dumps(obj)
+
+
+def dumps_many(
+    objs: Iterable[BaseModel], model: Optional[Type[BaseModel]] = None
+) -> bytes:
+    return _default_serializer.dumps_many(objs, model)
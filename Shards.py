@@ -0,0 +1,361 @@
+# --------------------------------
+# ShardedCorpus Class
+# --------------------------------
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlparse
+
+from Articles import Article, ArticleCollection, article_loader, open_ndjson
+from Pipeline import bounded_futures
+from Timestamps import bucket_key, parse_timestamp
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 2
+SUFFIXES = {
+    None: ".ndjson",
+    "none": ".ndjson",
+    "gzip": ".ndjson.gz",
+    "zstd": ".ndjson.zst",
+}
+UNDATED = "undated"
+FLUSH_SIZE = 5000
+TASK_BYTES = 4 << 20
+
+
+def source_slug(source_url: Optional[str]) -> str:
+    """
+    Directory name of a source: its host, or the url reduced to safe characters
+    """
+    if not source_url:
+        return "unknown"
+    host = urlparse(source_url).netloc or source_url
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", host).strip("_") or "unknown"
+
+
+def _checksum(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _decompress(raw: bytes, compression: Optional[str]) -> bytes:
+    if compression == "gzip":
+        return gzip.decompress(raw)
+    if compression == "zstd":
+        import zstandard
+
+        reader = zstandard.ZstdDecompressor().stream_reader(
+            io.BytesIO(raw), read_across_frames=True
+        )
+        return reader.read()
+    return raw
+
+
+def read_shard(
+    path: str,
+    compression: Optional[str] = None,
+    checksum: Optional[str] = None,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    trusted: bool = False,
+) -> List[Dict]:
+    """
+    Reads one shard; worker entry point of the parallel loader.
+
+    The file is read in one go, checked against checksum when given,
+    decompressed and decoded; records outside [start, end) are dropped and
+    the rest validated unless trusted. Validated field dictionaries are
+    returned, ready for Article.from_trusted in the calling process.
+    """
+    with open(path, "rb") as file:
+        raw = file.read()
+    if checksum is not None and hashlib.sha256(raw).hexdigest() != checksum:
+        raise ValueError(f"Checksum mismatch for shard {path}")
+    records = []
+    for line in _decompress(raw, compression).splitlines():
+        if not line.strip():
+            continue
+        data = json.loads(line)
+        if start is not None or end is not None:
+            published = parse_timestamp(data.get("publish_date"))
+            if published is None:
+                continue
+            if (start is not None and published < start) or (
+                end is not None and published >= end
+            ):
+                continue
+        records.append(data if trusted else dict(Article.model_validate(data)))
+    return records
+
+
+def read_shards(tasks: List[tuple]) -> List[Dict]:
+    """
+    Reads several small shards in one worker call, see read_shard
+    """
+    records = []
+    for task in tasks:
+        records.extend(read_shard(*task))
+    return records
+
+
+class ShardedCorpus:
+    """
+    Article corpus split in NDJSON shards by source and time bucket.
+
+    Shards live in <directory>/<source host>/<bucket>.ndjson[.gz|.zst], one
+    per source host and UTC day (or hour, month, year) of publication, with a
+    manifest.json listing for every shard the source urls it holds, its
+    bucket, row count, publication time range and sha256. Loads first prune
+    shards on the manifest (sources, time range, any predicate on the
+    entry), then read, decompress, decode and validate the remaining ones on
+    a process pool, merging the results into a stream or an ArticleCollection.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self._manifest: Optional[Dict] = None
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.directory, MANIFEST_FILE)
+
+    @property
+    def manifest(self) -> Dict:
+        if self._manifest is None:
+            if os.path.exists(self.manifest_path):
+                with open(self.manifest_path) as file:
+                    self._manifest = json.load(file)
+                if self._manifest.get("version", 1) < MANIFEST_VERSION:
+                    # version 1 kept the first source url of a shard only
+                    for entry in self._manifest["shards"].values():
+                        if "source_urls" not in entry:
+                            entry["source_urls"] = [entry.pop("source_url")]
+                    self._manifest["version"] = MANIFEST_VERSION
+            else:
+                self._manifest = {"version": MANIFEST_VERSION, "shards": {}}
+        return self._manifest
+
+    def _save_manifest(self) -> None:
+        temporary = self.manifest_path + ".tmp"
+        with open(temporary, "w") as file:
+            json.dump(self.manifest, file, indent=1, sort_keys=True)
+        os.replace(temporary, self.manifest_path)
+
+    def write(
+        self,
+        articles: Iterable[Article],
+        bucket: str = "day",
+        compression: Optional[str] = "gzip",
+        append: bool = False,
+    ) -> Dict:
+        """
+        Writes articles into shards and updates the manifest
+        :param articles: any iterable of Article, buffered FLUSH_SIZE at a time per shard
+        :param bucket: "hour", "day", "month" or "year"
+        :param compression: None, "gzip" or "zstd"
+        :param append: add to the existing shards instead of replacing the corpus
+        :return: the manifest
+        """
+        manifest = self.manifest
+        if not append:
+            for name in manifest["shards"]:
+                path = os.path.join(self.directory, name)
+                if os.path.exists(path):
+                    os.remove(path)
+            manifest = self._manifest = {"version": MANIFEST_VERSION, "shards": {}}
+        elif manifest["shards"] and (
+            manifest.get("bucket") != bucket
+            or manifest.get("compression") != compression
+        ):
+            raise ValueError(
+                "Appending requires the bucket and compression of the corpus"
+            )
+        manifest.update(bucket=bucket, compression=compression)
+        suffix = SUFFIXES[compression]
+        buffers: Dict[str, List[Article]] = {}
+        touched = set()
+
+        def flush(name: str) -> None:
+            batch = buffers.pop(name)
+            entry = manifest["shards"][name]
+            path = os.path.join(self.directory, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open_ndjson(path, "a", compression) as file:
+                for article in batch:
+                    file.write(article.model_dump_json())
+                    file.write("\n")
+            entry["rows"] += len(batch)
+            touched.add(name)
+
+        for article in articles:
+            published = article.published_at
+            period = bucket_key(published, bucket) or UNDATED
+            name = f"{source_slug(article.source_url)}/{period}{suffix}"
+            entry = manifest["shards"].get(name)
+            if entry is None:
+                entry = manifest["shards"][name] = {
+                    "source_urls": [],
+                    "bucket": period,
+                    "rows": 0,
+                    "first_published": None,
+                    "last_published": None,
+                }
+            if article.source_url not in entry["source_urls"]:
+                entry["source_urls"].append(article.source_url)
+            if published is not None:
+                if (
+                    entry["first_published"] is None
+                    or published < entry["first_published"]
+                ):
+                    entry["first_published"] = published
+                if (
+                    entry["last_published"] is None
+                    or published > entry["last_published"]
+                ):
+                    entry["last_published"] = published
+            buffer = buffers.setdefault(name, [])
+            buffer.append(article)
+            if len(buffer) >= FLUSH_SIZE:
+                flush(name)
+        for name in list(buffers):
+            flush(name)
+        for name in touched:
+            path = os.path.join(self.directory, name)
+            manifest["shards"][name].update(
+                sha256=_checksum(path), bytes=os.path.getsize(path)
+            )
+        os.makedirs(self.directory, exist_ok=True)
+        self._save_manifest()
+        return manifest
+
+    def shards(
+        self,
+        sources: Optional[Iterable[str]] = None,
+        start: Any = None,
+        end: Any = None,
+        predicate: Optional[Callable[[Dict], bool]] = None,
+    ) -> List[str]:
+        """
+        Prunes the shards on the manifest alone
+        :param sources: source urls to keep
+        :param start: keep shards publishing at or after start (anything parse_timestamp accepts)
+        :param end: keep shards publishing before end
+        :param predicate: extra test on a manifest entry
+        :return: names of the shards that may hold matching articles
+        """
+        sources = set(sources) if sources is not None else None
+        start, end = parse_timestamp(start), parse_timestamp(end)
+        selected = []
+        for name, entry in self.manifest["shards"].items():
+            if sources is not None and sources.isdisjoint(entry["source_urls"]):
+                continue
+            if start is not None or end is not None:
+                if entry["first_published"] is None:
+                    continue
+                if start is not None and entry["last_published"] < start:
+                    continue
+                if end is not None and entry["first_published"] >= end:
+                    continue
+            if predicate is not None and not predicate(entry):
+                continue
+            selected.append(name)
+        return sorted(selected)
+
+    def iter_articles(
+        self,
+        sources: Optional[Iterable[str]] = None,
+        start: Any = None,
+        end: Any = None,
+        predicate: Optional[Callable[[Dict], bool]] = None,
+        max_workers: Optional[int] = None,
+        trusted: bool = False,
+        verify: bool = False,
+        ordered: bool = False,
+        executor: Optional[Executor] = None,
+    ) -> Iterator[Article]:
+        """
+        Streams the articles of the selected shards, decoded across a process pool
+        :param max_workers: pool size, 1 reads the shards in the calling process
+        :param trusted: skip validation, see article_loader
+        :param verify: check every shard against its manifest checksum
+        :param ordered: yield shards in name order rather than as they complete
+        :param executor: existing executor to reuse instead of creating a pool
+        """
+        names = self.shards(sources, start, end, predicate)
+        start, end = parse_timestamp(start), parse_timestamp(end)
+        compression = self.manifest.get("compression")
+        wanted = set(sources) if sources is not None else None
+        build = article_loader(trusted=True)
+
+        def tasks():
+            # small shards are grouped up to TASK_BYTES per worker call
+            group, size = [], 0
+            for name in names:
+                entry = self.manifest["shards"][name]
+                group.append(
+                    (
+                        os.path.join(self.directory, name),
+                        compression,
+                        entry.get("sha256") if verify else None,
+                        start,
+                        end,
+                        trusted,
+                    )
+                )
+                size += entry.get("bytes", 0)
+                if size >= TASK_BYTES:
+                    yield group
+                    group, size = [], 0
+            if group:
+                yield group
+
+        def articles(records):
+            for data in records:
+                # a host directory may hold several source urls
+                if wanted is None or data.get("source_url") in wanted:
+                    yield build(data)
+
+        if executor is None and max_workers == 1:
+            for task in tasks():
+                yield from articles(read_shards(task))
+            return
+        pool = executor or ProcessPoolExecutor(max_workers=max_workers)
+        # at most two tasks per worker in flight, decoded shards wait for the consumer
+        limit = 2 * (max_workers or os.cpu_count() or 1)
+        try:
+            futures = bounded_futures(
+                lambda task: pool.submit(read_shards, task), tasks(), limit, ordered
+            )
+            for _, future in futures:
+                yield from articles(future.result())
+        finally:
+            if executor is None:
+                pool.shutdown(cancel_futures=True)
+
+    def load(self, **options) -> ArticleCollection:
+        """
+        Loads the selected shards into one ArticleCollection, see iter_articles for the options
+        """
+        return ArticleCollection(articles=list(self.iter_articles(**options)))
+
+    def verify(self) -> List[str]:
+        """
+        Returns the shards whose file is missing or does not match its manifest checksum
+        """
+        failed = []
+        for name, entry in self.manifest["shards"].items():
+            path = os.path.join(self.directory, name)
+            if not os.path.exists(path) or _checksum(path) != entry.get("sha256"):
+                failed.append(name)
+        return failed
+
+    def __len__(self) -> int:
+        return sum(entry["rows"] for entry in self.manifest["shards"].values())
@@ -12,7 +12,11 @@ class SimilarPill(BaseModel):
     summary: Optional[str] = None
     related: Optional[list] = None
     similars: Optional[list] = None
+    similarity: Optional[float] = None
 
     def to_dict(self):
         article_dict = self.__dict__.copy()
         return article_dict
+
+    def to_json(self) -> str:
+        return self.model_dump_json()
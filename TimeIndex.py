@@ -0,0 +1,242 @@
+# --------------------------------
+# TimeIndex Class
+# --------------------------------
+import bisect
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from Timestamps import bucket_key, parse_timestamp
+
+# keys per block of the sorted list, blocks split at twice the size
+BLOCK_SIZE = 512
+
+Key = Tuple[float, int]
+
+
+def _bound(value: Any) -> Optional[float]:
+    # range bounds accept anything parse_timestamp does
+    return None if value is None else parse_timestamp(value)
+
+
+class TimeIndex:
+    """
+    Articles sorted by one time field, for recency and range queries.
+
+    The index keeps (epoch seconds, object id) keys in a blocked sorted list:
+    blocks of at most 2 * BLOCK_SIZE keys with the articles in parallel
+    blocks and the last key of every block in a separate list. A range is
+    located with two bisections on the block maxima and two inside blocks and
+    returned in O(log n + k); an insert or removal only shifts one block.
+    Epoch values come from Article.timestamp(), parsed when the article is
+    built. Articles without a usable time are kept apart as undated. It
+    follows ArticleCollection listeners (rebuild/add/discard);
+    collection.time_index() attaches one.
+    """
+
+    def __init__(self, field: str = "publish_date") -> None:
+        self.field = field
+        self.clear()
+
+    def clear(self) -> None:
+        self._blocks: List[List[Key]] = []
+        self._block_articles: List[List[Any]] = []
+        self._maxes: List[Key] = []
+        self._times: Dict[int, Optional[float]] = {}
+        self._undated: Dict[int, Any] = {}
+
+    def _time(self, article: Any) -> Optional[float]:
+        if hasattr(article, "timestamp"):
+            return article.timestamp(self.field)
+        return parse_timestamp(getattr(article, self.field, None))
+
+    def rebuild(self, articles: Iterable[Any]) -> None:
+        self.clear()
+        dated = []
+        for article in articles:
+            key = id(article)
+            if key in self._times:
+                continue
+            time = self._time(article)
+            self._times[key] = time
+            if time is None:
+                self._undated[key] = article
+            else:
+                dated.append(((time, key), article))
+        dated.sort(key=lambda entry: entry[0])
+        for start in range(0, len(dated), BLOCK_SIZE):
+            chunk = dated[start : start + BLOCK_SIZE]
+            self._blocks.append([key for key, _ in chunk])
+            self._block_articles.append([article for _, article in chunk])
+            self._maxes.append(chunk[-1][0])
+
+    def add(self, article: Any) -> None:
+        key = id(article)
+        if key in self._times:
+            self.discard(article)
+        time = self._time(article)
+        self._times[key] = time
+        if time is None:
+            self._undated[key] = article
+            return
+        entry = (time, key)
+        if not self._blocks:
+            self._blocks.append([entry])
+            self._block_articles.append([article])
+            self._maxes.append(entry)
+            return
+        number = min(bisect.bisect_left(self._maxes, entry), len(self._blocks) - 1)
+        block = self._blocks[number]
+        position = bisect.bisect_right(block, entry)
+        block.insert(position, entry)
+        self._block_articles[number].insert(position, article)
+        self._maxes[number] = block[-1]
+        if len(block) > 2 * BLOCK_SIZE:
+            articles = self._block_articles[number]
+            self._blocks[number : number + 1] = [
+                block[:BLOCK_SIZE],
+                block[BLOCK_SIZE:],
+            ]
+            self._block_articles[number : number + 1] = [
+                articles[:BLOCK_SIZE],
+                articles[BLOCK_SIZE:],
+            ]
+            self._maxes[number : number + 1] = [block[BLOCK_SIZE - 1], block[-1]]
+
+    def discard(self, article: Any) -> None:
+        key = id(article)
+        if key not in self._times:
+            return
+        time = self._times.pop(key)
+        if time is None:
+            self._undated.pop(key, None)
+            return
+        entry = (time, key)
+        number = bisect.bisect_left(self._maxes, entry)
+        if number == len(self._blocks):
+            return
+        block = self._blocks[number]
+        position = bisect.bisect_left(block, entry)
+        if position == len(block) or block[position] != entry:
+            return
+        del block[position]
+        del self._block_articles[number][position]
+        if block:
+            self._maxes[number] = block[-1]
+        else:
+            del self._blocks[number]
+            del self._block_articles[number]
+            del self._maxes[number]
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    def _locate(self, time: Optional[float], end: bool = False) -> Tuple[int, int]:
+        # (block, offset) of the first key at or after time; None is the start or the end
+        if time is None:
+            return (len(self._blocks), 0) if end else (0, 0)
+        bound = (time,)
+        number = bisect.bisect_left(self._maxes, bound)
+        if number == len(self._blocks):
+            return number, 0
+        return number, bisect.bisect_left(self._blocks[number], bound)
+
+    def _entries(self, start: Any = None, end: Any = None) -> Iterator[Tuple[Key, Any]]:
+        # (key, article) pairs with start <= time < end, oldest first
+        start, end = _bound(start), _bound(end)
+        number, offset = self._locate(start)
+        stop_number, stop_offset = self._locate(end, end=True)
+        while number < stop_number or (number == stop_number and offset < stop_offset):
+            last = stop_offset if number == stop_number else None
+            yield from zip(
+                self._blocks[number][offset:last],
+                self._block_articles[number][offset:last],
+            )
+            number, offset = number + 1, 0
+
+    def between(self, start: Any = None, end: Any = None) -> List[Any]:
+        """
+        Articles with start <= time < end, oldest first; an omitted bound is open
+        """
+        return [article for _, article in self._entries(start, end)]
+
+    def count(self, start: Any = None, end: Any = None) -> int:
+        start, end = _bound(start), _bound(end)
+        number, offset = self._locate(start)
+        stop_number, stop_offset = self._locate(end, end=True)
+        if (stop_number, stop_offset) <= (number, offset):
+            return 0
+        if number == stop_number:
+            return stop_offset - offset
+        inner = sum(len(block) for block in self._blocks[number + 1 : stop_number])
+        return len(self._blocks[number]) - offset + inner + stop_offset
+
+    def since(self, seconds: float, now: Any = None) -> List[Any]:
+        """
+        Articles of the last seconds, up to now (the newest indexed time by default)
+        """
+        now = _bound(now)
+        if now is None:
+            if not self._blocks:
+                return []
+            now = self.last_time()
+            return self.between(now - seconds)
+        return self.between(now - seconds, now)
+
+    def latest(self, count: int = 10) -> List[Any]:
+        latest = []
+        for articles in reversed(self._block_articles):
+            if len(latest) >= count:
+                break
+            latest.extend(reversed(articles[-(count - len(latest)) :]))
+        return latest
+
+    def undated(self) -> List[Any]:
+        return list(self._undated.values())
+
+    def first_time(self) -> Optional[float]:
+        return self._blocks[0][0][0] if self._blocks else None
+
+    def last_time(self) -> Optional[float]:
+        return self._maxes[-1][0] if self._maxes else None
+
+    def windows(
+        self, size: float, start: Any = None, end: Any = None
+    ) -> Iterator[Tuple[float, List[Any]]]:
+        """
+        Walks fixed windows of size seconds from start (the oldest time by default) to end
+        :return: generator of (window start, articles) tuples, empty windows included
+        """
+        start, end = _bound(start), _bound(end)
+        if start is None:
+            start = self.first_time()
+        if end is None:
+            last = self.last_time()
+            end = None if last is None else last + 1e-6
+        if start is None or end is None:
+            return
+        entries = self._entries(start, end)
+        pending = next(entries, None)
+        window = start
+        while window < end:
+            limit = min(window + size, end)
+            members = []
+            while pending is not None and pending[0][0] < limit:
+                members.append(pending[1])
+                pending = next(entries, None)
+            yield window, members
+            window += size
+
+    def buckets(self, bucket: str = "day") -> Dict[Optional[str], List[Any]]:
+        """
+        Partitions the articles by UTC hour, day, month or year, see Timestamps.bucket_key; undated ones go under None
+        """
+        groups: Dict[Optional[str], List[Any]] = {}
+        current, members = None, None
+        for (time, _), article in self._entries():
+            name = bucket_key(time, bucket)
+            if name != current:
+                current = name
+                members = groups.setdefault(name, [])
+            members.append(article)
+        if self._undated:
+            groups[None] = self.undated()
+        return groups
@@ -0,0 +1,95 @@
+# --------------------------------
+# Timestamp helpers
+# --------------------------------
+from datetime import datetime, timezone
+from typing import Any, Optional, Tuple
+
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+
+
+def parse_timestamp(value: Any) -> Optional[float]:
+    """
+    Converts a datetime, an epoch number or an ISO 8601 string to epoch seconds.
+    Naive values are taken as UTC. Returns None for None, "None", empty or unparseable values.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = value.strip()
+        if not value or value == "None":
+            return None
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return None
+
+
+def normalize_timestamp(value: Any) -> Optional[str]:
+    """
+    Returns the ISO 8601 UTC form of any value parse_timestamp accepts, None when it has no time.
+    """
+    timestamp = parse_timestamp(value)
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+def split_timestamp(value: Any) -> Tuple[Any, Optional[float]]:
+    """
+    Normalizes and parses a time in one pass: returns its ISO 8601 UTC form and
+    epoch seconds, (None, None) for no time and the value itself with None when
+    it does not parse. Strings already in normalized form are returned as is.
+    """
+    if value is None:
+        return None, None
+    if isinstance(value, str):
+        text = value.strip()
+        if not text or text == "None":
+            return None, None
+        try:
+            moment = datetime.fromisoformat(text)
+        except ValueError:
+            return value, None
+        if moment.tzinfo is None:
+            timestamp = (moment - _NAIVE_EPOCH).total_seconds()
+            if len(text) == 19 and text[10] in " T":  # the common "%Y-%m-%d %H:%M:%S"
+                return f"{text[:10]}T{text[11:]}+00:00", timestamp
+            return moment.isoformat() + "+00:00", timestamp
+        timestamp = moment.timestamp()
+        if text.endswith("+00:00") and "T" in text:
+            return text, timestamp
+        return datetime.fromtimestamp(timestamp, timezone.utc).isoformat(), timestamp
+    timestamp = parse_timestamp(value)
+    if timestamp is None:
+        return value, None
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat(), timestamp
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+BUCKET_FORMATS = {
+    "hour": "%Y-%m-%dT%H",
+    "day": "%Y-%m-%d",
+    "month": "%Y-%m",
+    "year": "%Y",
+}
+
+
+def bucket_key(timestamp: Optional[float], bucket: str = "day") -> Optional[str]:
+    """
+    Names the UTC hour, day, month or year holding an epoch time, e.g. "2024-03-01" for a day
+    """
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime(
+        BUCKET_FORMATS[bucket]
+    )
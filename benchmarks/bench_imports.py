@@ -0,0 +1,86 @@
+"""
+Cold-start cost of the data model modules.
+
+Every module is imported in a fresh interpreter, best of repeat, and the
+run fails when an import drags in a crawler or NLP package or takes longer
+than the budget. Run from the repository root:
+    python -m benchmarks.bench_imports [--repeat 5] [--budget-ms 1000]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+MODEL_MODULES = (
+    "Articles",
+    "Entities",
+    "SimilarPill",
+    "BERTDocument",
+    "Outlets",
+    "NewsPapers",
+)
+HEAVY_MODULES = ("newspaper", "langdetect", "nltk", "lxml")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "loaded": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def probe(module: str) -> Dict:
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-W",
+            "ignore",
+            "-c",
+            PROBE.format(module=module, heavy=HEAVY_MODULES),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure(module: str, repeat: int) -> Dict:
+    runs = [probe(module) for _ in range(repeat)]
+    return {
+        "seconds": min(run["seconds"] for run in runs),
+        "loaded": sorted({name for run in runs for name in run["loaded"]}),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1000.0)
+    parser.add_argument("modules", nargs="*", default=MODEL_MODULES)
+    args = parser.parse_args(argv)
+
+    failures = []
+    for module in args.modules:
+        result = measure(module, args.repeat)
+        milliseconds = result["seconds"] * 1000
+        print(
+            f"{module:<14} {milliseconds:9.1f} ms"
+            + (f"  loads {', '.join(result['loaded'])}" if result["loaded"] else "")
+        )
+        if result["loaded"] or milliseconds > args.budget_ms:
+            failures.append(module)
+    if failures:
+        print("import regressions: " + ", ".join(failures))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
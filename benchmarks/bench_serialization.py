@@ -0,0 +1,57 @@
+"""
+Compares the legacy ArticleEncoder/to_dict path with the BulkSerializer backends.
+
+The same cases run in the full suite (python -m benchmarks); this module
+keeps the side by side comparison. Run from the repository root:
+    python -m benchmarks.bench_serialization [article_count]
+"""
+
+import json
+import sys
+import timeit
+
+from Articles import ArticleCollection, ArticleEncoder
+from Serializers import BulkSerializer, orjson
+
+from benchmarks.synthetic import SyntheticCorpus
+
+
+def make_collection(count: int) -> ArticleCollection:
+    return SyntheticCorpus().collection(count)
+
+
+def best_of(func, repeat: int = 5) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main(count: int = 2000) -> None:
+    collection = make_collection(count)
+    cases = {
+        "ArticleEncoder per article": lambda: [
+            json.dumps(article, cls=ArticleEncoder) for article in collection
+        ],
+        "ArticleEncoder whole collection": lambda: json.dumps(
+            collection.articles, cls=ArticleEncoder
+        ),
+    }
+    backends = ["pydantic"] + (["orjson"] if orjson is not None else [])
+    for backend in backends:
+        serializer = BulkSerializer(backend)
+        cases[f"{backend} per article"] = lambda s=serializer: [
+            s.dumps(article) for article in collection
+        ]
+        cases[f"{backend} whole collection"] = lambda s=serializer: s.dumps(collection)
+
+    baseline = None
+    print(f"{count} articles")
+    for name, func in cases.items():
+        elapsed = best_of(func)
+        baseline = baseline or elapsed
+        print(
+            f"{name:<34} {elapsed * 1000:9.2f} ms "
+            f"{count / elapsed:12.0f} articles/s  x{baseline / elapsed:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,339 @@
+"""
+Benchmark suite over the synthetic corpus.
+
+Every case is timed best-of-repeat with perf_counter, then run once more
+under tracemalloc for its peak memory, so tracing does not skew timings.
+Results can be saved as a named baseline and compared on a later commit.
+
+Run from the repository root:
+    python -m benchmarks [--scale 1k|10k|100k|1M] [--case NAME ...]
+                         [--save LABEL] [--compare LABEL] [--tolerance 0.1]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterable, List, Optional
+
+from Articles import Article, ArticleBuilder, ArticleCollection, ArticleEncoder
+from Entities import EntitiesCollection, Entity
+from Serializers import BulkSerializer, orjson
+
+from benchmarks.synthetic import SCALES, SyntheticCorpus
+
+BASELINES = os.path.join(os.path.dirname(__file__), "baselines")
+CASES: Dict[str, Callable] = {}
+
+
+def case(name: str):
+    """
+    Registers a case: a function of the run Fixtures returning the callable to time, or None to skip it
+    """
+
+    def register(func):
+        CASES[name] = func
+        return func
+
+    return register
+
+
+class Fixtures:
+    """
+    Inputs shared by the cases of one run, generated on first use
+    """
+
+    def __init__(self, corpus: SyntheticCorpus, count: int, workdir: str) -> None:
+        self.corpus = corpus
+        self.count = count
+        self.workdir = workdir
+        self._cache = {}
+
+    def _get(self, name, build):
+        if name not in self._cache:
+            self._cache[name] = build()
+        return self._cache[name]
+
+    @property
+    def dicts(self) -> List[Dict]:
+        return self._get("dicts", lambda: list(self.corpus.article_dicts(self.count)))
+
+    @property
+    def collection(self) -> ArticleCollection:
+        return self._get(
+            "collection",
+            lambda: ArticleCollection(
+                articles=[Article(**data) for data in self.dicts]
+            ),
+        )
+
+    @property
+    def stubs(self) -> List:
+        return self._get(
+            "stubs", lambda: list(self.corpus.newspaper_articles(self.count))
+        )
+
+    @property
+    def entity_dicts(self) -> List[Dict]:
+        return self._get(
+            "entity_dicts",
+            lambda: [entity for data in self.dicts for entity in data["entities"]],
+        )
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.workdir, name)
+
+
+@case("Article construction")
+def article_construction(fixtures: Fixtures):
+    dicts = fixtures.dicts
+    return lambda: [Article(**data) for data in dicts]
+
+
+@case("Article.to_dict")
+def article_to_dict(fixtures: Fixtures):
+    articles = fixtures.collection.articles
+    return lambda: [article.to_dict() for article in articles]
+
+
+@case("Article.to_json")
+def article_to_json(fixtures: Fixtures):
+    articles = fixtures.collection.articles
+    return lambda: [article.to_json() for article in articles]
+
+
+@case("ArticleEncoder collection")
+def article_encoder(fixtures: Fixtures):
+    articles = fixtures.collection.articles
+    return lambda: json.dumps(articles, cls=ArticleEncoder)
+
+
+@case("BulkSerializer pydantic")
+def bulk_pydantic(fixtures: Fixtures):
+    collection = fixtures.collection
+    serializer = BulkSerializer("pydantic")
+    return lambda: serializer.dumps(collection)
+
+
+@case("BulkSerializer orjson")
+def bulk_orjson(fixtures: Fixtures):
+    if orjson is None:
+        return None
+    collection = fixtures.collection
+    serializer = BulkSerializer("orjson")
+    return lambda: serializer.dumps(collection)
+
+
+@case("ArticleCollection.save_to_json")
+def save_to_json(fixtures: Fixtures):
+    collection = fixtures.collection
+    path = fixtures.path("save.json")
+    return lambda: collection.save_to_json(path)
+
+
+@case("ArticleCollection.load_from_json")
+def load_from_json(fixtures: Fixtures):
+    path = fixtures.path("load.json")
+    fixtures.collection.save_to_json(path)
+    return lambda: ArticleCollection().load_from_json(path)
+
+
+@case("ArticleCollection.load_from_json trusted")
+def load_from_json_trusted(fixtures: Fixtures):
+    path = fixtures.path("load.json")
+    if not os.path.exists(path):
+        fixtures.collection.save_to_json(path)
+    return lambda: ArticleCollection().load_from_json(path, trusted=True)
+
+
+@case("Article.from_trusted")
+def article_from_trusted(fixtures: Fixtures):
+    dicts = fixtures.dicts
+    return lambda: [Article.from_trusted(data) for data in dicts]
+
+
+@case("EntitiesCollection.from_list")
+def entities_from_list(fixtures: Fixtures):
+    entities = fixtures.entity_dicts
+    return lambda: EntitiesCollection.from_list(entities)
+
+
+@case("EntitiesCollection.remove_duplicates")
+def entities_remove_duplicates(fixtures: Fixtures):
+    entities = [Entity(**data) for data in fixtures.entity_dicts]
+
+    def run():
+        collection = EntitiesCollection.model_construct(entities=list(entities))
+        collection.remove_duplicates()
+
+    return run
+
+
+@case("ArticleBuilder.buildFromNewspaper3K")
+def build_from_newspaper(fixtures: Fixtures):
+    stubs = fixtures.stubs
+    builder = ArticleBuilder()
+    return lambda: [
+        builder.buildFromNewspaper3K(stub, stub.url.rsplit("/", 2)[0]) for stub in stubs
+    ]
+
+
+@case("ArticleBuilder.buildManyFromNewspaper3K")
+def build_many_from_newspaper(fixtures: Fixtures):
+    stubs = fixtures.stubs
+    builder = ArticleBuilder()
+    return lambda: list(
+        builder.buildManyFromNewspaper3K(stubs, "https://news.example.com")
+    )
+
+
+def measure(func: Callable, repeat: int) -> Dict:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": min(timings), "peak_bytes": peak}
+
+
+def run(
+    scale: str = "1k",
+    cases: Optional[Iterable[str]] = None,
+    repeat: int = 3,
+    seed: int = 0,
+) -> Dict[str, Dict]:
+    """
+    Runs the selected cases at one scale
+    :return: case name -> count, seconds, per_second and peak_bytes
+    """
+    count = SCALES[scale]
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        fixtures = Fixtures(SyntheticCorpus(seed), count, workdir)
+        for name in cases or CASES:
+            func = CASES[name](fixtures)
+            if func is None:
+                continue
+            result = measure(func, repeat)
+            result["count"] = count
+            result["per_second"] = count / result["seconds"]
+            results[name] = result
+            print(format_result(name, result), flush=True)
+    return results
+
+
+def format_result(name: str, result: Dict, baseline: Optional[Dict] = None) -> str:
+    line = (
+        f"{name:<42} {result['seconds'] * 1000:11.2f} ms "
+        f"{result['per_second']:12.0f} items/s "
+        f"{result['peak_bytes'] / 2**20:9.1f} MiB peak"
+    )
+    if baseline is not None:
+        line += (
+            f"  time x{result['seconds'] / baseline['seconds']:.2f}"
+            f"  memory x{result['peak_bytes'] / max(baseline['peak_bytes'], 1):.2f}"
+        )
+    return line
+
+
+def commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def baseline_path(label: str) -> str:
+    return os.path.join(BASELINES, f"{label}.json")
+
+
+def save_baseline(label: str, scale: str, results: Dict[str, Dict]) -> str:
+    """
+    Stores the results of one scale under a label, keeping the other scales already saved
+    """
+    path = baseline_path(label)
+    data = load_baseline(label) or {"scales": {}}
+    data.update(
+        commit=commit(), python=platform.python_version(), machine=platform.machine()
+    )
+    data["scales"][scale] = results
+    os.makedirs(BASELINES, exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(data, file, indent=2)
+    return path
+
+
+def load_baseline(label: str) -> Optional[Dict]:
+    path = baseline_path(label)
+    if not os.path.exists(path):
+        return None
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare(
+    results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float = 0.1
+) -> List[str]:
+    """
+    Prints every case against its baseline
+    :return: names of the cases slower than the baseline by more than tolerance
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        print(format_result(name, result, reference))
+        if reference and result["seconds"] > reference["seconds"] * (1 + tolerance):
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", choices=SCALES, default="1k")
+    parser.add_argument("--case", action="append", choices=CASES, dest="cases")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", metavar="LABEL")
+    parser.add_argument("--compare", metavar="LABEL")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    print(f"{SCALES[args.scale]} items, best of {args.repeat}")
+    results = run(args.scale, args.cases, args.repeat, args.seed)
+    if args.save:
+        print(f"saved {save_baseline(args.save, args.scale, results)}")
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        scale = (baseline or {}).get("scales", {}).get(args.scale)
+        if scale is None:
+            print(f"no {args.scale} baseline saved as {args.compare}")
+            return 1
+        print(f"against {args.compare} ({baseline.get('commit')})")
+        regressions = compare(results, scale, args.tolerance)
+        if regressions:
+            print("regressions: " + ", ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+Deterministic synthetic corpus for the benchmarks.
+
+The same seed always yields the same articles, entities and newspaper
+article stand-ins, so timings taken on different commits are comparable.
+Everything is generated lazily; materialize only what a case needs.
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+
+from Articles import Article, ArticleCollection
+
+SCALES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1M": 1_000_000}
+
+WORDS = (
+    "government election minister market economy growth police court league "
+    "season player coach company shares investors climate energy health "
+    "hospital school students city council budget report study research "
+    "science technology software security border trade agreement talks "
+    "president parliament vote campaign protest weather storm festival film "
+    "music album concert price inflation bank rates housing transport"
+).split()
+FILLER = "the of and to in a that for on with as was by at from its".split()
+FIRST_NAMES = "Ana Luis Maria Jose Carmen Pedro Sofia Diego Elena Pablo".split()
+LAST_NAMES = "Garcia Lopez Martinez Perez Gomez Diaz Torres Ruiz Vargas Castro".split()
+PLACES = (
+    "Madrid Bogota Lima Quito Santiago Caracas Mexico Panama Havana Montevideo".split()
+)
+ORGANIZATIONS = "UN IMF WHO FIFA NATO OPEC Congress Senate Reuters Interpol".split()
+SOURCES = [f"https://news{number}.example.com" for number in range(40)]
+CATEGORIES = "politics economy sports world science culture health technology".split()
+LANGUAGES = ["en"] * 6 + ["es"] * 3 + ["pt"]
+START = datetime(2023, 1, 1)
+
+
+class NewspaperArticleStub:
+    """
+    Stand-in for a parsed newspaper.Article, carrying only what ArticleBuilder reads.
+    """
+
+    __slots__ = (
+        "url",
+        "title",
+        "text",
+        "authors",
+        "publish_date",
+        "keywords",
+        "summary",
+        "meta_data",
+    )
+
+    def __init__(self, **fields) -> None:
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+
+class SyntheticCorpus:
+    """
+    Seeded generator of article dictionaries, Article objects, entities and newspaper stand-ins
+    :param seed: random seed, equal seeds give equal corpora
+    :param words: approximate number of words of an article text
+    :param entities: entities per article, a few of them repeated to exercise deduplication
+    """
+
+    def __init__(self, seed: int = 0, words: int = 180, entities: int = 12) -> None:
+        self.seed = seed
+        self.words = words
+        self.entities = entities
+
+    def _random(self, number: int) -> random.Random:
+        # one generator per article keeps any slice of the corpus reproducible
+        return random.Random(self.seed * 1_000_003 + number)
+
+    def _sentence(self, rng: random.Random, length: int) -> str:
+        words = [
+            rng.choice(WORDS) if rng.random() < 0.6 else rng.choice(FILLER)
+            for _ in range(length)
+        ]
+        return " ".join(words).capitalize() + "."
+
+    def _text(self, rng: random.Random) -> str:
+        sentences = []
+        remaining = self.words
+        while remaining > 0:
+            length = rng.randint(8, 24)
+            sentences.append(self._sentence(rng, length))
+            remaining -= length
+        return " ".join(sentences)
+
+    def entity_dicts(self, rng: random.Random) -> List[Dict]:
+        entities = []
+        for _ in range(self.entities):
+            kind = rng.choice(("PERSON", "LOCATION", "ORGANIZATION"))
+            if kind == "PERSON":
+                name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            elif kind == "LOCATION":
+                name = rng.choice(PLACES)
+            else:
+                name = rng.choice(ORGANIZATIONS)
+            entities.append(
+                {
+                    "type": kind,
+                    "name": name,
+                    "links": [f"https://wiki.example.org/{name.replace(' ', '_')}"],
+                }
+            )
+        return entities
+
+    def article_dict(self, number: int) -> Dict:
+        rng = self._random(number)
+        source = rng.choice(SOURCES)
+        category = rng.choice(CATEGORIES)
+        published = START + timedelta(minutes=rng.randint(0, 525_600))
+        article_id = f"article-{self.seed}-{number}"
+        text = self._text(rng)
+        return {
+            "id": article_id,
+            "uid": article_id,
+            "doc_id": number,
+            "publish_date": str(published),
+            "fetched_on": str(published + timedelta(hours=1)),
+            "last_updated": str(published + timedelta(hours=1)),
+            "category": category,
+            "cluster": rng.randint(0, max(1, number // 8)),
+            "entities": self.entity_dicts(rng),
+            "article_url": f"{source}/{category}/{number}",
+            "title": self._sentence(rng, rng.randint(6, 12))[:-1],
+            "text": text,
+            "authors": [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"],
+            "summary": text[:300],
+            "keywords": rng.sample(WORDS, 5),
+            "source_url": source,
+            "language": rng.choice(LANGUAGES),
+            "metadata": {"category": category, "section": category.title()},
+        }
+
+    def article_dicts(self, count: int) -> Iterator[Dict]:
+        for number in range(count):
+            yield self.article_dict(number)
+
+    def articles(self, count: int) -> Iterator[Article]:
+        for data in self.article_dicts(count):
+            yield Article(**data)
+
+    def collection(self, count: int) -> ArticleCollection:
+        return ArticleCollection(articles=list(self.articles(count)))
+
+    def newspaper_articles(self, count: int) -> Iterator[NewspaperArticleStub]:
+        for data in self.article_dicts(count):
+            yield NewspaperArticleStub(
+                url=data["article_url"],
+                title=data["title"],
+                text=data["text"],
+                authors=data["authors"],
+                publish_date=data["publish_date"],
+                keywords=data["keywords"],
+                summary=data["summary"],
+                meta_data=data["metadata"],
+            )
@@ -0,0 +1,53 @@
+import gc
+import json
+import weakref
+
+from Articles import Article
+from ArticleBodies import BODY_FIELDS, iter_archive, load_archive, save_archive
+from benchmarks.synthetic import SyntheticCorpus
+
+
+def _archive(tmp_path, count=4):
+    articles = list(SyntheticCorpus(seed=3).articles(count))
+    save_archive(articles, str(tmp_path))
+    return articles
+
+
+def test_nested_dump_keeps_bodies(tmp_path):
+    articles = _archive(tmp_path)
+    dumped = json.loads(load_archive(str(tmp_path)).to_json())["articles"]
+    for original, record in zip(articles, dumped):
+        for field in BODY_FIELDS:
+            assert record[field] == getattr(original, field)
+
+
+def test_validate_keeps_body(tmp_path):
+    articles = _archive(tmp_path)
+    article = load_archive(str(tmp_path)).articles[0]
+    assert not article.is_materialized
+    article.validate()
+    assert article.text == articles[0].text
+
+
+def test_default_store_is_readonly_and_released(tmp_path):
+    _archive(tmp_path)
+    articles = list(iter_archive(str(tmp_path)))
+    store = articles[0].__pydantic_private__["_body"][0]
+    assert store.readonly
+    handles, store = store._handles, weakref.ref(store)
+    articles[0].text
+    del articles
+    gc.collect()
+    assert store() is None
+    assert all(handle is None for handle in handles.values())
+
+
+def test_update_from_lazy_article(tmp_path):
+    articles = _archive(tmp_path, count=6)
+    for position, source in enumerate(load_archive(str(tmp_path)).articles):
+        target = Article(id="target", text="old")
+        target.update(source)
+        assert target.text == articles[position].text
+        for field in BODY_FIELDS:
+            assert getattr(target, field) == getattr(articles[position], field)
+        assert target.title == articles[position].title
@@ -0,0 +1,56 @@
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from Articles import ArticleBuilder
+from benchmarks.synthetic import SyntheticCorpus
+
+
+def _stubs(count):
+    return list(SyntheticCorpus(seed=8).newspaper_articles(count))
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_batch_build_streams_its_input(ordered):
+    stubs = _stubs(200)
+    consumed = itertools.count()
+
+    def source():
+        for stub in stubs:
+            next(consumed)
+            yield stub
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        built = ArticleBuilder().buildManyFromNewspaper3K(
+            source(),
+            "https://news.example.com",
+            max_workers=2,
+            chunksize=4,
+            executor=pool,
+            ordered=ordered,
+        )
+        first = next(built)
+        # two chunks per worker in flight, plus the chunk being filled
+        assert next(consumed) <= 4 * 4 + 4 + 1
+        rest = list(built)
+    urls = [article.article_url for article in [first] + rest]
+    if ordered:
+        assert urls == [stub.url for stub in stubs]
+    else:
+        assert sorted(urls) == sorted(stub.url for stub in stubs)
+
+
+def test_batch_build_reports_failures():
+    stubs = _stubs(6)
+    stubs[2].url = None
+    failed = []
+    built = list(
+        ArticleBuilder().buildManyFromNewspaper3K(
+            stubs,
+            "https://news.example.com",
+            max_workers=1,
+            on_error=lambda source, error: failed.append(source),
+        )
+    )
+    assert len(built) == 5 and failed == [stubs[2]]
@@ -0,0 +1,36 @@
+import json
+
+from ArticleRepository import ArticleRepository
+from Articles import Article, ArticleCollection
+from benchmarks.synthetic import SyntheticCorpus
+
+
+def test_new_articles_are_saved_and_exported(tmp_path):
+    stored = list(SyntheticCorpus(seed=6).articles(2))
+    with ArticleRepository() as repository:
+        repository.upsert(stored)
+        collection = repository.load_collection()
+        assert collection.changed_articles() == []
+
+        added = Article(id="new-article", title="Fresh", source_url="https://a.example")
+        collection.add_article(added)
+        assert collection.changed_articles() == [added]
+        assert added.changed_fields() == set(Article.model_fields)
+        assert collection.save_changes(repository) == 1
+        assert repository.get("new-article").title == "Fresh"
+        assert collection.changed_articles() == []
+
+        other = Article(id="other-article", title="Later")
+        collection.add_article(other)
+        path = tmp_path / "deltas.ndjson"
+        assert collection.export_deltas(str(path)) == 1
+        delta = json.loads(path.read_text())
+        assert delta["id"] == "other-article" and delta["title"] == "Later"
+        assert not other.is_dirty()
+
+
+def test_only_changed_fields_after_snapshot():
+    article = Article(id="a", title="Before")
+    article.mark_clean()
+    article.title = "After"
+    assert article.delta() == {"id": "a", "title": "After"}
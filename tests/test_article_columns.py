@@ -0,0 +1,73 @@
+import numpy as np
+
+from ArticleColumns import ArticleColumns, parse_time
+from Articles import Article
+from TimeIndex import TimeIndex
+from Timestamps import parse_timestamp
+
+DATES = [
+    "2024-03-01 23:30:00",
+    "2024-03-02T01:30:00+02:00",
+    "2024-03-02T00:30:00Z",
+    "None",
+    "garbage",
+    "2024-03-03",
+]
+
+
+def _articles():
+    return [
+        Article(
+            id=f"a{number}",
+            publish_date=date,
+            cluster=str(number % 2),
+            language=None if number == 4 else "en",
+            doc_id=number if number % 3 else None,
+        )
+        for number, date in enumerate(DATES)
+    ]
+
+
+def test_time_column_agrees_with_timestamps():
+    articles = _articles()
+    columns = ArticleColumns.from_articles(articles)
+    expected = [parse_timestamp(article.publish_date) for article in articles]
+    column = columns.column("publish_date")
+    for value, seconds in zip(column, expected):
+        if seconds is None:
+            assert np.isnat(value)
+        else:
+            assert value == np.datetime64(round(seconds * 1_000_000), "us")
+    assert parse_time("2024-03-02T01:30:00+02:00") == np.datetime64(
+        "2024-03-01T23:30:00", "us"
+    )
+
+    start, end = "2024-03-02T00:30:00+01:00", "2024-03-02T01:00:00+00:00"
+    mask = columns.between("publish_date", start, end)
+    index = TimeIndex()
+    index.rebuild(articles)
+    selected = [article.id for article in columns.articles(mask)]
+    assert sorted(selected) == sorted(
+        article.id for article in index.between(start, end)
+    )
+    assert sorted(selected) == ["a0", "a1", "a2"]
+    assert columns.is_null("publish_date").sum() == 2
+
+
+def test_filters_counts_and_groups():
+    articles = _articles()
+    columns = ArticleColumns.from_articles(articles)
+    assert columns.value_counts("language") == {"en": 5, None: 1}
+    assert columns.articles(columns.equals("cluster", "1")) == articles[1::2]
+    assert columns.articles(columns.between("doc_id", 2, 5)) == [
+        articles[2],
+        articles[4],
+    ]
+    groups = columns.group_by("cluster", columns.equals("language", "en"))
+    assert {key: list(rows) for key, rows in groups.items()} == {
+        "0": [0, 2],
+        "1": [1, 3, 5],
+    }
+    subset = columns.filter(columns.isin("cluster", ["0"]))
+    assert len(subset) == 3
+    assert subset.collection().get_article("a4") is articles[4]
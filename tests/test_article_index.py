@@ -0,0 +1,41 @@
+from Articles import Article, ArticleCollection
+
+
+class Recorder:
+    def __init__(self):
+        self.rebuilds = 0
+        self.added = []
+        self.discarded = []
+
+    def rebuild(self, articles):
+        self.rebuilds += 1
+
+    def add(self, article):
+        self.added.append(article)
+
+    def discard(self, article):
+        self.discarded.append(article)
+
+
+def test_duplicate_instance_keeps_the_fast_path():
+    article, other = Article(id="a"), Article(id="b")
+    collection = ArticleCollection()
+    listener = collection.attach(Recorder())
+    collection.add_article(article)
+    collection.add_article(other)
+    collection.add_article(article)
+    assert len(collection._index) == len(collection.articles) == 3
+    for _ in range(3):
+        assert collection.get_article("a") is article
+    assert listener.rebuilds == 1  # the attach only
+    assert listener.added == [article, other]
+
+    collection.remove_article(article)
+    assert collection.articles == [other, article]
+    assert collection.get_article("a") is article
+    assert listener.discarded == []
+    collection.remove_article(article)
+    assert collection.articles == [other]
+    assert collection.get_article("a") is None
+    assert listener.discarded == [article]
+    assert listener.rebuilds == 1
@@ -0,0 +1,26 @@
+import pickle
+
+from Articles import Article, ArticleProcessor
+from benchmarks.synthetic import SyntheticCorpus
+
+
+def test_article_pickles():
+    article = next(SyntheticCorpus(seed=1).articles(1))
+    restored = pickle.loads(pickle.dumps(article))
+    assert isinstance(restored, Article)
+    assert restored.model_dump() == article.model_dump()
+
+
+def test_build_stage_runs_on_processes():
+    pairs = [
+        (stub, "https://news.example.com")
+        for stub in SyntheticCorpus(seed=2).newspaper_articles(6)
+    ]
+    processor = ArticleProcessor().build_stage(mode="process", workers=2)
+    collection = processor.into_collection(pairs)
+    assert len(collection.articles) == 6
+    assert all(isinstance(article, Article) for article in collection.articles)
+    assert {article.article_url for article in collection.articles} == {
+        stub.url for stub, _ in pairs
+    }
+    assert processor.stats()[0]["errors"] == 0
@@ -0,0 +1,70 @@
+import pytest
+
+from ArticleRepository import ArticleRepository
+from Articles import Article
+from benchmarks.synthetic import SyntheticCorpus
+
+
+def _articles(count=12):
+    return list(SyntheticCorpus(seed=8).articles(count))
+
+
+def test_upsert_replaces_by_id(tmp_path):
+    articles = _articles()
+    with ArticleRepository(str(tmp_path / "articles.db"), batch_size=5) as repository:
+        assert repository.upsert(articles) == 12
+        changed = articles[3].model_copy(update={"title": "Replaced"})
+        assert repository.upsert([changed]) == 1
+        assert len(repository) == 12
+        assert repository.get(articles[3].id).title == "Replaced"
+        assert repository.ids() == [article.id for article in articles]
+        assert repository.delete([articles[0].id, "missing"]) == 1
+        assert articles[0].id not in repository
+    with ArticleRepository(str(tmp_path / "articles.db")) as repository:
+        assert len(repository) == 11
+
+
+def test_upsert_rolls_back_a_failed_batch():
+    with ArticleRepository() as repository:
+        with pytest.raises(ValueError):
+            repository.upsert(_articles(3) + [Article(title="no id")])
+        assert len(repository) == 0
+
+
+def test_apply_deltas_patches_records_and_columns():
+    articles = _articles()
+    with ArticleRepository() as repository:
+        repository.upsert(articles)
+        article = repository.get(articles[0].id)
+        article.category = "moved"
+        article.title = "Patched"
+        assert (
+            repository.apply_deltas([article.delta(), {"id": "missing", "cluster": 1}])
+            == 1
+        )
+        stored = repository.get(article.id)
+        assert (stored.category, stored.title) == ("moved", "Patched")
+        assert stored.text == articles[0].text
+        assert repository.ids(category="moved") == [article.id]
+
+
+def test_filters_and_published_ranges():
+    articles = _articles()
+    dates = sorted(article.timestamp() for article in articles)
+    middle = dates[6]
+    with ArticleRepository() as repository:
+        repository.upsert(articles)
+        after = list(repository.query(published_after=middle, order_by="published_at"))
+        assert [a.timestamp() for a in after] == dates[6:]
+        assert repository.count(published_before=middle) == 6
+        category = articles[0].category
+        expected = [a.id for a in articles if a.category == category]
+        assert repository.ids(category=category) == expected
+        sources = {articles[0].source_url, articles[1].source_url}
+        assert repository.count(source_url=sources) == sum(
+            a.source_url in sources for a in articles
+        )
+        chunks = list(repository.iter_chunks(chunk_size=5))
+        assert [len(chunk) for chunk in chunks] == [5, 5, 2]
+        with pytest.raises(ValueError):
+            repository.count(title="x")
@@ -0,0 +1,35 @@
+from benchmarks import suite
+from benchmarks.synthetic import SyntheticCorpus
+
+
+def test_equal_seeds_give_equal_corpora():
+    first = list(SyntheticCorpus(seed=4).article_dicts(10))
+    assert first == list(SyntheticCorpus(seed=4).article_dicts(10))
+    assert first != list(SyntheticCorpus(seed=5).article_dicts(10))
+    # every article has its own generator, so a slice does not depend on the count
+    assert SyntheticCorpus(seed=4).article_dict(7) == first[7]
+
+
+def test_stubs_carry_the_article_fields():
+    corpus = SyntheticCorpus(seed=4)
+    data = corpus.article_dict(0)
+    stub = next(corpus.newspaper_articles(1))
+    assert stub.url == data["article_url"]
+    assert stub.text == data["text"]
+
+
+def test_run_and_compare(monkeypatch, tmp_path):
+    monkeypatch.setitem(suite.SCALES, "test", 20)
+    monkeypatch.setattr(suite, "BASELINES", str(tmp_path))
+    cases = ["Article construction", "ArticleCollection.save_to_json"]
+    results = suite.run("test", cases, repeat=1)
+    assert sorted(results) == sorted(cases)
+    assert all(result["count"] == 20 for result in results.values())
+    suite.save_baseline("base", "test", results)
+    baseline = suite.load_baseline("base")["scales"]["test"]
+    slower = {
+        name: dict(result, seconds=result["seconds"] * 2)
+        for name, result in results.items()
+    }
+    assert suite.compare(results, baseline) == []
+    assert sorted(suite.compare(slower, baseline)) == sorted(cases)
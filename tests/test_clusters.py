@@ -0,0 +1,27 @@
+from Articles import ArticleCollection
+from benchmarks.synthetic import SyntheticCorpus
+
+
+def _collection(count=3):
+    articles = list(SyntheticCorpus(seed=5).articles(count))
+    for article in articles:
+        article.cluster, article.language, article.publish_date = 1, "en", None
+    return ArticleCollection(articles=articles), articles
+
+
+def test_stats_follow_refreshed_fields():
+    collection, articles = _collection()
+    registry = collection.clusters()
+    articles[0].language = "fr"
+    collection.refresh_article(articles[0])
+    articles[1].language = "de"  # changed, not refreshed before removal
+    collection.remove_article(articles[1])
+    assert dict(registry.get(1).languages) == {"fr": 1, "en": 1}
+    assert registry.get(1).size == 2
+
+
+def test_refresh_keeps_the_representative():
+    collection, articles = _collection()
+    registry = collection.clusters()
+    collection.refresh_article(articles[0])
+    assert registry.get(1).representative is articles[0]
@@ -0,0 +1,74 @@
+import json
+
+from CrawlScheduler import CrawlScheduler
+from Outlets import Attributes, OutletsHandler, OutletsSource
+
+
+def _outlets(*names):
+    outlets = OutletsHandler()
+    for name in names:
+        outlets.add(
+            OutletsSource(
+                attributes=Attributes(name=name, url=f"https://{name}.example")
+            )
+        )
+    return outlets
+
+
+def _keys(outlets):
+    return [outlet.attributes.name for outlet in outlets]
+
+
+def test_new_outlets_are_due_and_rescheduled():
+    scheduler = CrawlScheduler(_outlets("a", "b"), min_interval=10, max_interval=1000)
+    assert sorted(_keys(scheduler.due(now=0))) == ["a", "b"]
+    assert scheduler.due(now=0) == []
+    scheduler.record("a", new_articles=10, latency=1, now=0)
+    assert scheduler.states["a"].interval == 1000  # rate from initial_interval
+    assert scheduler.wait_time(now=0) == 1000
+    assert _keys(scheduler.due(now=1000)) == ["a"]
+
+
+def test_productive_outlets_come_first():
+    scheduler = CrawlScheduler(_outlets("slow", "busy"), min_interval=1)
+    scheduler.due(now=0)
+    scheduler.record("slow", new_articles=1, latency=1, now=0)
+    scheduler.record("busy", new_articles=50, latency=1, now=0)
+    assert _keys(scheduler.due(now=100000)) == ["busy", "slow"]
+
+
+def test_error_backoff_doubles_per_failure():
+    scheduler = CrawlScheduler(
+        _outlets("a"), initial_interval=100, min_interval=1, max_interval=10**6
+    )
+    intervals = []
+    for crawl in range(4):
+        scheduler.record("a", 0, latency=1, error=True, now=crawl)
+        intervals.append(scheduler.states["a"].interval)
+    assert intervals == [200, 400, 800, 1600]
+    assert scheduler.states["a"].consecutive_errors == 4
+    scheduler.record("a", 0, latency=1, now=10)
+    assert scheduler.states["a"].consecutive_errors == 0
+
+
+def test_budget_limits_started_crawls():
+    scheduler = CrawlScheduler(_outlets("a", "b", "c"), budget=2, budget_window=60)
+    assert len(scheduler.due(now=0)) == 2
+    assert scheduler.available(now=0) == 0
+    assert scheduler.wait_time(now=0) == 60
+    assert len(scheduler.due(now=60)) == 1
+
+
+def test_state_round_trip_through_json():
+    outlets = _outlets("a", "b")
+    scheduler = CrawlScheduler(outlets)
+    scheduler.due(now=0)
+    scheduler.record("a", new_articles=3, latency=2, now=0)
+    dumped = scheduler.to_json()
+    assert "Infinity" not in dumped
+    assert json.loads(dumped)  # standard JSON
+    restored = CrawlScheduler.from_json(dumped, outlets)
+    assert restored.states["a"] == scheduler.states["a"]
+    # "b" was in flight when saved and is due again at once
+    assert restored.states["b"].next_due == 0.0
+    assert _keys(restored.due(now=1)) == ["b"]
@@ -0,0 +1,66 @@
+from BERTDocument import BertDocument
+from DocumentGraph import DocumentGraph
+
+FIELDS = ("category", "entries", "summary", "tags", "keywords", "metadata")
+
+
+def _document(uid, similars=None, related=None):
+    return BertDocument(
+        uid=uid,
+        title=f"title {uid}",
+        similars=similars,
+        related=related,
+        **{field: None for field in FIELDS},
+    )
+
+
+def _chain():
+    # a -> b -> c over related, with c pointing back to a as a similar
+    c = _document("c")
+    b = _document("b", related=[c])
+    a = _document("a", related=[b])
+    c.similars = [a]
+    return a
+
+
+def test_nested_documents_are_stored_once_by_uid():
+    graph = DocumentGraph()
+    node = graph.add(_chain())
+    assert len(graph) == 3
+    assert all(not document.related for document in graph.documents.values())
+    assert graph.neighbour_uids("a") == ["b"]
+    assert graph.neighbour_uids("c", "similars") == ["a"]
+    assert [other.uid for other in node.related] == ["b"]
+    assert node.related[0].related[0].title == "title c"
+
+
+def test_k_hop_and_nested_follow_the_links():
+    graph = DocumentGraph()
+    graph.add(_chain())
+    assert graph.k_hop("a", k=1) == {"b": 1}
+    assert graph.k_hop("a", k=3) == {"b": 1, "c": 2}
+    assert graph.k_hop("c", k=3, kinds=("related", "similars")) == {"a": 1, "b": 2}
+    nested = graph.nested("a", depth=2)
+    assert nested.related[0].uid == "b"
+    assert nested.related[0].related[0].uid == "c"
+    # below the requested depth documents come back without their links
+    assert nested.related[0].related[0].related is None
+
+
+def test_remove_drops_links_both_ways():
+    graph = DocumentGraph()
+    graph.add(_chain())
+    graph.remove("b")
+    assert "b" not in graph
+    assert graph.neighbour_uids("a") == []
+    assert graph.k_hop("a", k=3) == {}
+
+
+def test_save_and_load_round_trip(tmp_path):
+    graph = DocumentGraph()
+    graph.add(_chain())
+    path = str(tmp_path / "graph.jsonl.gz")
+    graph.save(path)
+    loaded = DocumentGraph.load(path)
+    assert list(loaded.iter_records()) == list(graph.iter_records())
+    assert loaded.node("c").similars[0].title == "title a"
@@ -0,0 +1,31 @@
+import numpy as np
+
+from Embeddings import EmbeddingStore
+
+
+def _scanned(store, query, nprobe):
+    lists = store._nearest_lists(query[None, :], nprobe)[0]
+    assign = store._assign[: len(store)]
+    return set(np.flatnonzero(np.isin(assign, lists)))
+
+
+def test_ivf_search_gathers_probed_lists(tmp_path):
+    generator = np.random.default_rng(1)
+    store = EmbeddingStore(dim=16, capacity=4)
+    store.add_many([f"doc{i}" for i in range(400)], generator.random((400, 16)))
+    store.build_ivf(lists=12)
+    store.add_many([f"new{i}" for i in range(50)], generator.random((50, 16)))
+    for i in range(0, 100, 3):
+        store.remove(f"doc{i}")
+
+    store.save(str(tmp_path))
+    queries = generator.random((20, 16)).astype(np.float32)
+    for loaded in (store, EmbeddingStore.load(str(tmp_path))):
+        results = loaded.search(queries, k=5, nprobe=3)
+        normalized = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+        for query, hits in zip(normalized, results):
+            rows = _scanned(loaded, query, 3)
+            expected = sorted(
+                (float(loaded.vectors[row] @ query), loaded.uids[row]) for row in rows
+            )[::-1][:5]
+            assert [uid for uid, _ in hits] == [uid for _, uid in expected]
@@ -0,0 +1,36 @@
+from Entities import EntitiesCollection, Entity
+
+
+def test_empty_values_are_duplicates():
+    collection = EntitiesCollection.from_list(
+        [
+            {"type": "ORG", "name": "Acme", "links": None},
+            {"type": "ORG", "name": "Acme", "links": []},
+            {"type": None, "name": "", "links": None},
+            {"type": "", "name": None, "links": []},
+        ]
+    )
+    assert len(collection) == 2
+    collection.entities.append(Entity(type="ORG", name="Acme", links=None))
+    collection.remove_duplicates()
+    assert len(collection) == 2
+
+
+def test_keys_follow_in_place_changes():
+    acme = Entity(type="ORG", name="Acme", links=[])
+    collection = EntitiesCollection(entities=[acme])
+    other = Entity(type="ORG", name="Other", links=[])
+
+    collection.entities[0] = other
+    assert other in collection and acme not in collection
+    assert collection.add_entities([acme]) == 1
+
+    other.name = "Renamed"
+    assert Entity(type="ORG", name="Renamed", links=None) in collection
+    assert collection.add_entities([{"type": "ORG", "name": "Other", "links": []}]) == 1
+
+    collection.entities = [acme]
+    assert other not in collection
+    del collection.entities[0]
+    assert collection.add_entities([acme]) == 1
+    assert len(collection) == 1
@@ -0,0 +1,63 @@
+from Articles import Article, ArticleCollection
+from EntityIndexes import EntityIndex
+
+
+def _article(article_id, *names):
+    entities = [
+        {"type": "PERSON", "name": name, "links": [f"https://wiki/{name}"]}
+        for name in names
+    ]
+    return Article(id=article_id, title=article_id, entities=entities)
+
+
+def test_queries_follow_the_collection():
+    first, second = _article("a", "Ada Lovelace", "Alan Turing"), _article(
+        "b", "Ada Lovelace"
+    )
+    collection = ArticleCollection(articles=[first, second])
+    index = collection.attach(EntityIndex())
+    assert index.articles_with("person", " ada  LOVELACE") == {"a", "b"}
+    assert index.query(
+        all_of=[("PERSON", "Ada Lovelace"), ("PERSON", "Alan Turing")]
+    ) == {"a"}
+    assert index.query(
+        any_of=[("PERSON", "Alan Turing")], none_of=[("PERSON", "Nobody")]
+    ) == {"a"}
+    collection.remove_article(first)
+    assert index.articles_linking("https://wiki/Alan Turing") == set()
+    assert index.articles_with("PERSON", "Ada Lovelace") == {"b"}
+
+
+def test_changed_id_is_unindexed():
+    article = _article("old", "Grace Hopper")
+    collection = ArticleCollection(articles=[article])
+    index = collection.attach(EntityIndex())
+    article.id = "new"
+    collection.refresh_article(article)
+    assert index.articles_with("PERSON", "Grace Hopper") == {"new"}
+    collection.remove_article(article)
+    assert index.articles_with("PERSON", "Grace Hopper") == set()
+    assert len(index) == 0
+
+
+def test_instances_sharing_an_id_keep_their_postings():
+    first, second = _article("same", "Grace Hopper"), _article("same", "Grace Hopper")
+    index = EntityIndex()
+    index.rebuild([first, second])
+    index.discard(first)
+    assert index.articles_with("PERSON", "Grace Hopper") == {"same"}
+    index.discard(second)
+    assert index.articles_with("PERSON", "Grace Hopper") == set()
+
+
+def test_saved_index_follows_its_collection(tmp_path):
+    articles = [_article("a", "Ada Lovelace"), _article("b", "Ada Lovelace")]
+    collection = ArticleCollection(articles=articles)
+    path = str(tmp_path / "entities.json.gz")
+    collection.attach(EntityIndex()).save(path)
+
+    restored = collection.attach(EntityIndex.load(path), rebuild=False)
+    assert restored.articles_with("PERSON", "Ada Lovelace") == {"a", "b"}
+    collection.remove_article(articles[0])
+    assert restored.articles_with("PERSON", "Ada Lovelace") == {"b"}
+    assert len(restored) == 1
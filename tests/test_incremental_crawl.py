@@ -0,0 +1,147 @@
+import http.server
+import threading
+
+import pytest
+
+from Articles import ArticleProcessor, paper_articles
+from CrawlScheduler import CrawlScheduler
+from Metrics import MetricsRegistry
+from NewsPapers import NewsPaperCrawler
+from Outlets import Attributes, OutletsHandler, OutletsSource
+from SeenArticles import SeenArticleStore
+
+ARTICLE_PATHS = [f"/news/2024/03/story-number-{i}-about-things.html" for i in range(3)]
+ARTICLE_HTML = (
+    "<html><head><title>Story</title></head><body><article>"
+    + "<p>Local news paragraph with enough words to count as text.</p>" * 20
+    + "</article></body></html>"
+)
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    requests = []
+    sent = []
+
+    def do_GET(self):
+        Handler.requests.append(self.path)
+        if self.path == "/":
+            links = "".join(
+                f'<a href="{path}">Story about things</a>' for path in ARTICLE_PATHS
+            )
+            self._send(200, f"<html><body>{links}</body></html>")
+        elif self.path in ARTICLE_PATHS:
+            etag = f'"{self.path}"'
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, "", {"ETag": etag})
+            else:
+                self._send(200, ARTICLE_HTML, {"ETag": etag})
+        else:
+            self._send(404, "")
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        Handler.sent.append(len(body.encode()))
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def outlet():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield OutletsSource(attributes=Attributes(name="local", url=url))
+    server.shutdown()
+
+
+def _article_urls(paper):
+    return sorted(article.url for article in paper.articles if "/news/" in article.url)
+
+
+def test_second_crawl_skips_fetched_articles(outlet):
+    crawler = NewsPaperCrawler(headers={}, seen_store=SeenArticleStore())
+    try:
+        paper = crawler.build(outlet)
+        assert len(_article_urls(paper)) == len(ARTICLE_PATHS)
+        processor = ArticleProcessor().download_stage(workers=2, newspaper=crawler)
+        downloaded = list(processor.run(paper_articles([paper])))
+        assert len(downloaded) == len(paper.articles)
+        for path in ARTICLE_PATHS:
+            assert crawler.seen_store.is_fresh(outlet.attributes.url + path)
+            assert crawler.seen_store.validators(outlet.attributes.url + path) == {
+                "If-None-Match": f'"{path}"'
+            }
+
+        Handler.requests.clear()
+        assert _article_urls(crawler.build(outlet)) == []
+        assert not set(ARTICLE_PATHS) & set(Handler.requests)
+    finally:
+        crawler.close()
+
+
+def test_refetch_is_conditional(outlet):
+    crawler = NewsPaperCrawler(headers={}, seen_store=SeenArticleStore())
+    try:
+        article = next(
+            article
+            for article in crawler.build(outlet).articles
+            if "/news/" in article.url
+        )
+        assert crawler.download_article(article)
+        assert not crawler.download_article(article)  # answered 304
+    finally:
+        crawler.close()
+
+
+def _scheduled_rounds(outlet, mark_seen=None, download=False):
+    outlets = OutletsHandler()
+    outlets.add(outlet)
+    crawler = NewsPaperCrawler(headers={}, seen_store=SeenArticleStore())
+    scheduler = CrawlScheduler(outlets)
+    options = {} if mark_seen is None else {"mark_seen": mark_seen}
+    try:
+        rounds = []
+        for now in (0, scheduler.max_interval):
+            ((_, paper),) = scheduler.crawl(crawler, now=now, **options)
+            rounds.append(_article_urls(paper))
+            if download:
+                processor = ArticleProcessor().download_stage(newspaper=crawler)
+                list(processor.run(paper_articles([paper])))
+        return rounds
+    finally:
+        crawler.close()
+
+
+def test_scheduler_leaves_marking_to_downloads(outlet):
+    first, second = _scheduled_rounds(outlet)
+    assert first and second == first  # nothing downloaded, offered again
+    first, second = _scheduled_rounds(outlet, download=True)
+    assert first and second == []
+
+
+def test_scheduler_can_mark_handed_out_articles(outlet):
+    first, second = _scheduled_rounds(outlet, mark_seen=True)
+    assert first and second == []
+
+
+def test_crawl_counts_every_downloaded_byte(outlet):
+    metrics = MetricsRegistry(enabled=True)
+    crawler = NewsPaperCrawler(headers={}, metrics=metrics)
+    Handler.sent.clear()
+    try:
+        paper = crawler.build(outlet)
+        processor = ArticleProcessor().download_stage(workers=2, newspaper=crawler)
+        list(processor.run(paper_articles([paper])))
+    finally:
+        crawler.close()
+    (series,) = metrics.snapshot()["counters"]["inkbytes_bytes_downloaded_total"]
+    assert series["labels"] == {"outlet": paper.url}
+    assert series["value"] == sum(Handler.sent)
+    assert sum(Handler.sent) > len(ARTICLE_HTML) * len(ARTICLE_PATHS)
@@ -0,0 +1,38 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from Articles import Article, ArticleCollection
+
+
+def _article(id, text):
+    return Article(id=id, title="", text=text)
+
+
+def test_rare_terms_rank_first():
+    collection = ArticleCollection()
+    collection.add_article(_article("a", "market election budget"))
+    collection.add_article(_article("b", "market budget weather"))
+    collection.add_article(_article("c", "market weather storm"))
+    engine = collection.keywords()
+    scored = dict(engine.scores([collection.get_article("a")])[0])
+    # election appears in one document only, market in all of them
+    assert max(scored, key=scored.get) == "election"
+    assert scored["budget"] < scored["election"]
+    assert scored["market"] < scored["election"]
+
+
+def test_corpus_changes_drop_cached_keywords():
+    collection = ArticleCollection()
+    article = _article("a", "storm storm harbor")
+    collection.add_article(article)
+    engine = collection.keywords()
+    engine.top_keywords([article])
+    assert article.get_top_keywords(1) == ["storm"]
+    for number in range(4):
+        collection.add_article(_article(f"s{number}", "storm flood"))
+    assert article._top_keywords is None
+    engine.top_keywords([article])
+    assert article.get_top_keywords(1) == ["harbor"]
+    collection.remove_article(collection.get_article("s0"))
+    assert article._top_keywords is None
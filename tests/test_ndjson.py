@@ -0,0 +1,48 @@
+import gzip
+import json
+
+import pytest
+
+from Articles import ArticleCollection, iter_articles_ndjson, write_articles_ndjson
+from benchmarks.synthetic import SyntheticCorpus
+
+
+def _records(articles):
+    return [json.loads(article.model_dump_json()) for article in articles]
+
+
+@pytest.mark.parametrize("name", ["articles.ndjson", "articles.ndjson.gz"])
+def test_round_trip(tmp_path, name):
+    collection = SyntheticCorpus(seed=7).collection(20)
+    path = tmp_path / name
+    assert collection.save_to_ndjson(str(path)) == 20
+    loaded = ArticleCollection()
+    loaded.load_from_ndjson(str(path))
+    assert _records(loaded.articles) == _records(collection.articles)
+
+
+def test_gzip_is_inferred_from_the_suffix(tmp_path):
+    path = tmp_path / "articles.ndjson.gz"
+    written = write_articles_ndjson(SyntheticCorpus(seed=7).articles(5), str(path))
+    assert written == 5
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        assert len(file.read().splitlines()) == 5
+
+
+def test_reader_filters_lazily(tmp_path):
+    articles = list(SyntheticCorpus(seed=7).articles(10))
+    path = tmp_path / "articles.ndjson"
+    write_articles_ndjson(articles, str(path))
+    wanted = {article.id for article in articles[::3]}
+    reader = iter_articles_ndjson(str(path), lambda article: article.id in wanted)
+    assert next(reader).id == articles[0].id
+    assert [article.id for article in reader] == [a.id for a in articles[3::3]]
+
+
+def test_json_round_trip(tmp_path):
+    collection = SyntheticCorpus(seed=7).collection(5)
+    path = tmp_path / "articles.json"
+    collection.save_to_json(str(path))
+    loaded = ArticleCollection()
+    loaded.load_from_json(str(path))
+    assert _records(loaded.articles) == _records(collection.articles)
@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from Articles import Article
+from NearDuplicates import NearDuplicateIndex, optimal_bands
+
+WORDS = [f"word{number}" for number in range(2000)]
+
+
+def _texts(count, length=120, seed=11):
+    generator = random.Random(seed)
+    return [
+        " ".join(generator.choice(WORDS) for _ in range(length)) for _ in range(count)
+    ]
+
+
+def _edited(text, seed):
+    # one word replaced near the middle, Jaccard of the shingle sets stays above 0.9
+    tokens = text.split()
+    tokens[len(tokens) // 2 + seed] = "edited"
+    return " ".join(tokens)
+
+
+def test_optimal_bands_divides_the_signature():
+    bands, rows = optimal_bands(128, 0.8)
+    assert bands * rows == 128
+    assert abs((1 / bands) ** (1 / rows) - 0.8) < 0.1
+
+
+def test_recall_of_edited_copies():
+    texts = _texts(50)
+    index = NearDuplicateIndex(threshold=0.8)
+    for number, text in enumerate(texts):
+        index.add(Article(id=f"a{number}", title="", text=text))
+    found = 0
+    for number, text in enumerate(texts):
+        copy = Article(id=f"copy{number}", title="", text=_edited(text, number % 5))
+        matches = index.query(copy)
+        found += bool(matches) and matches[0][0] == f"a{number}"
+        # random texts share no shingles, so nothing else comes back
+        assert all(key == f"a{number}" for key, _ in matches)
+    assert found >= 48
+
+
+def test_ingest_links_both_ways_and_discard_forgets():
+    original = _texts(1)[0]
+    index = NearDuplicateIndex()
+    first = Article(id="first", title="", text=original)
+    second = Article(id="second", title="", text=_edited(original, 0))
+    assert index.ingest(first) == []
+    similars = index.ingest(second)
+    assert [pill["id"] for pill in similars] == ["first"]
+    assert [pill["id"] for pill in first.similars] == ["second"]
+    index.discard(first)
+    assert index.query(second) == []
+    assert len(index) == 1
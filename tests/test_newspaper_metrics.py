@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+from Articles import ArticleProcessor
+from Metrics import METRICS, MetricsRegistry
+from NewsPapers import NewsPaper
+from benchmarks.synthetic import SyntheticCorpus
+
+
+def _counter(metrics, name):
+    return {
+        series["labels"].get("outlet"): series["value"]
+        for series in metrics.snapshot()["counters"].get(f"inkbytes_{name}", [])
+    }
+
+
+def test_bytes_downloaded_counts_encoded_pages_and_feeds():
+    metrics = MetricsRegistry(enabled=True)
+    pages = ["<p>café</p>", "Zürich — ok", "<rss>ü</rss>"]
+    paper = SimpleNamespace(
+        url="https://example.org",
+        html=pages[0],
+        categories=[SimpleNamespace(html=pages[1]), SimpleNamespace(html=None)],
+        feeds=[SimpleNamespace(rss=pages[2])],
+        articles=[],
+    )
+    NewsPaper(headers={}, metrics=metrics).record_paper(paper)
+    assert _counter(metrics, "bytes_downloaded_total") == {
+        "https://example.org": sum(len(page.encode()) for page in pages)
+    }
+
+
+def test_process_build_metrics_reach_the_parent():
+    pairs = [
+        (stub, "https://news.example.com")
+        for stub in SyntheticCorpus(seed=4).newspaper_articles(5)
+    ]
+    METRICS.reset()
+    METRICS.enable()
+    try:
+        processor = ArticleProcessor().build_stage(mode="process", workers=2)
+        assert len(processor.into_collection(pairs)) == 5
+        assert _counter(METRICS, "articles_built_total") == {
+            "https://news.example.com": 5
+        }
+        stages = {
+            series["labels"]["stage"]: series["count"]
+            for series in METRICS.snapshot()["histograms"]["inkbytes_stage_seconds"]
+        }
+        assert stages == {"extract": 5, "langdetect": 5}
+    finally:
+        METRICS.disable()
+        METRICS.reset()
@@ -0,0 +1,13 @@
+import pickle
+
+from Outlets import Attributes, OutletsHandler, OutletsSource
+
+
+def test_outlets_pickle_round_trip():
+    handler = OutletsHandler(
+        news_outlets=[{"name": "example", "url": "https://example.com"}]
+    )
+    assert OutletsSource.__module__ == "Outlets"
+    loaded = pickle.loads(pickle.dumps(handler))
+    assert loaded.get_outlet_url("example") == "https://example.com"
+    assert isinstance(loaded.get_outlet("example").attributes, Attributes)
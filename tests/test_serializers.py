@@ -0,0 +1,28 @@
+import json
+
+from Articles import Article
+from ArticleBodies import BODY_FIELDS, load_archive, save_archive
+from Serializers import BulkSerializer, _common_model
+from benchmarks.synthetic import SyntheticCorpus
+
+
+def test_mixed_lazy_and_plain_articles(tmp_path):
+    articles = list(SyntheticCorpus(seed=5).articles(3))
+    save_archive(articles[:2], str(tmp_path))
+    collection = load_archive(str(tmp_path))
+    mixed = collection.articles + [articles[2]]
+    assert _common_model(mixed) is Article
+    records = json.loads(BulkSerializer().dumps_many(mixed))
+    assert len(records) == 3
+    for original, record in zip(articles, records):
+        assert record["id"] == original.id
+        for field in BODY_FIELDS:
+            assert record[field] == getattr(original, field)
+
+
+def test_collection_matches_items():
+    articles = list(SyntheticCorpus(seed=5).articles(3))
+    serializer = BulkSerializer()
+    assert serializer.dumps_many(articles) == b"".join(
+        [b"[", b",".join(serializer.dumps(article) for article in articles), b"]"]
+    )
@@ -0,0 +1,70 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import Shards
+from benchmarks.synthetic import SyntheticCorpus
+from Shards import ShardedCorpus
+
+
+def test_outlets_sharing_a_host_are_not_pruned(tmp_path):
+    articles = list(SyntheticCorpus(seed=1).articles(10))
+    for position, article in enumerate(articles):
+        article.source_url = "https://news.example.com/" + "ab"[position % 2]
+        article.publish_date = "2024-03-01T10:00:00+00:00"
+    corpus = ShardedCorpus(str(tmp_path))
+    corpus.write(articles)
+    assert len(corpus.shards()) == 1
+    for source in ("https://news.example.com/a", "https://news.example.com/b"):
+        loaded = list(corpus.iter_articles(sources=[source], max_workers=1))
+        assert len(loaded) == 5
+        assert {article.source_url for article in loaded} == {source}
+    assert corpus.shards(sources=["https://other.example.com"]) == []
+
+
+def _daily(count):
+    articles = list(SyntheticCorpus(seed=2).articles(count))
+    for day, article in enumerate(articles):
+        article.publish_date = f"2024-01-{day % 28 + 1:02d}T10:00:00+00:00"
+    return articles
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_loads_keep_a_bounded_number_of_tasks_in_flight(tmp_path, monkeypatch, ordered):
+    monkeypatch.setattr(Shards, "TASK_BYTES", 1)
+    corpus = ShardedCorpus(str(tmp_path))
+    corpus.write(_daily(28))
+    assert len(corpus.shards()) == 28
+    with CountingExecutor(max_workers=2) as pool:
+        loaded = corpus.iter_articles(max_workers=2, executor=pool, ordered=ordered)
+        next(loaded)
+        assert pool.submitted <= 4
+        assert len(list(loaded)) == 27
+    assert pool.submitted == 28
+
+
+def test_version_1_manifest_is_upgraded(tmp_path):
+    corpus = ShardedCorpus(str(tmp_path))
+    corpus.write(_daily(3))
+    manifest = json.loads(open(corpus.manifest_path).read())
+    manifest["version"] = 1
+    for entry in manifest["shards"].values():
+        entry["source_url"] = entry.pop("source_urls")[0]
+    with open(corpus.manifest_path, "w") as file:
+        json.dump(manifest, file)
+
+    upgraded = ShardedCorpus(str(tmp_path))
+    assert upgraded.manifest["version"] == Shards.MANIFEST_VERSION
+    upgraded.write(_daily(3)[:1], append=True)
+    saved = json.loads(open(corpus.manifest_path).read())
+    assert saved["version"] == Shards.MANIFEST_VERSION
+    assert all("source_urls" in entry for entry in saved["shards"].values())
@@ -0,0 +1,89 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import TimeIndex as time_index_module
+from Articles import Article, ArticleCollection
+from TimeIndex import TimeIndex
+
+START = datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+
+def _article(number, hours):
+    published = None if hours is None else str(START + timedelta(hours=hours))
+    return Article(id=f"a{number}", publish_date=published)
+
+
+def test_times_are_parsed_at_ingest():
+    article = Article(id="a", publish_date="2024-03-01 12:00:00", fetched_on="None")
+    assert article.publish_date == "2024-03-01T12:00:00+00:00"
+    assert article.fetched_on is None
+    assert (
+        article.__pydantic_private__["_times"]["publish_date"]
+        == (START + timedelta(hours=12)).timestamp()
+    )
+    article.publish_date = "2024-03-02T00:00:00+01:00"
+    assert article.published_at == (START + timedelta(hours=23)).timestamp()
+    assert Article(id="b", publish_date=START).publish_date == START.isoformat()
+    assert Article(id="c", publish_date="someday").published_at is None
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    monkeypatch.setattr(time_index_module, "BLOCK_SIZE", 4)
+
+
+def test_queries_match_a_scan_through_adds_and_removals(small_blocks):
+    generator = random.Random(5)
+    articles = [
+        _article(number, generator.choice([None, generator.randrange(240)]))
+        for number in range(150)
+    ]
+    collection = ArticleCollection(articles=articles[:50])
+    index = collection.time_index()
+    for article in articles[50:]:
+        collection.add_article(article)
+    for article in generator.sample(articles, 60):
+        collection.remove_article(article)
+    remaining = [article for article in collection.articles]
+
+    def scan(low, high):
+        dated = [a for a in remaining if a.published_at is not None]
+        selected = [a for a in dated if low <= a.published_at < high]
+        return sorted(selected, key=lambda a: (a.published_at, id(a)))
+
+    for _ in range(30):
+        low, high = sorted(generator.randrange(-10, 250) for _ in range(2))
+        start, end = START + timedelta(hours=low), START + timedelta(hours=high)
+        expected = scan(start.timestamp(), end.timestamp())
+        assert index.between(start, end) == expected
+        assert index.count(start, end) == len(expected)
+    dated = scan(float("-inf"), float("inf"))
+    assert index.between() == dated
+    assert index.latest(7) == dated[::-1][:7]
+    assert len(index.undated()) == len(remaining) - len(dated)
+    assert len(index) == len(remaining)
+
+
+def test_windows_and_buckets():
+    articles = [
+        _article(number, hours) for number, hours in enumerate([0, 1, 5, 30, 49])
+    ]
+    index = TimeIndex()
+    index.rebuild(articles + [_article(9, None)])
+    windows = list(index.windows(24 * 3600))
+    assert [len(members) for _, members in windows] == [3, 1, 1]
+    assert windows[1][0] == (START + timedelta(hours=24)).timestamp()
+    assert list(index.windows(3600, START, START + timedelta(hours=3)))[2] == (
+        (START + timedelta(hours=2)).timestamp(),
+        [],
+    )
+    buckets = index.buckets("day")
+    assert {name: len(members) for name, members in buckets.items()} == {
+        "2024-03-01": 3,
+        "2024-03-02": 1,
+        "2024-03-03": 1,
+        None: 1,
+    }
+    assert index.since(20 * 3600) == articles[3:]
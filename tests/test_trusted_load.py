@@ -0,0 +1,56 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from Articles import Article, ArticleCollection, SamplingValidator, article_loader
+from benchmarks.synthetic import SyntheticCorpus
+
+
+def _records(count=5):
+    return [
+        json.loads(article.model_dump_json())
+        for article in SyntheticCorpus(seed=9).articles(count)
+    ]
+
+
+def test_trusted_matches_validated():
+    for record in _records():
+        trusted = article_loader(trusted=True)(record)
+        validated = article_loader()(record)
+        assert not trusted.is_dirty()
+        assert trusted.model_dump_json() == validated.model_dump_json()
+        assert trusted.timestamp() == validated.timestamp()
+
+
+def test_deferred_validate_coerces_in_place():
+    record = _records(1)[0]
+    record["doc_id"] = "3"
+    article = Article.from_trusted(record)
+    assert article.doc_id == "3"
+    assert article.validate() is article
+    assert article.doc_id == 3
+    assert article.model_dump_json() == Article.from_dict(record).model_dump_json()
+
+
+def test_sampling_catches_bad_records():
+    records = _records(4)
+    records[1]["doc_id"] = records[2]["doc_id"] = "not a number"
+    validator = SamplingValidator(every=2)
+    validator(records[0])
+    validator(records[1])  # not sampled
+    with pytest.raises(ValidationError):
+        validator(records[2])
+    assert validator.checked == 1
+    with pytest.raises(ValueError):
+        SamplingValidator(every=0)
+
+
+def test_trusted_collection_load(tmp_path):
+    collection = SyntheticCorpus(seed=9).collection(5)
+    path = str(tmp_path / "articles.json")
+    collection.save_to_json(path)
+    loaded = ArticleCollection()
+    loaded.load_from_json(path, trusted=True, validate_every=2)
+    assert [a.id for a in loaded.articles] == [a.id for a in collection.articles]
+    assert loaded.changed_articles() == []